@@ -6,10 +6,15 @@ from .planner import PlannerAgent
 from .researcher import ResearcherAgent
 from .writer import WriterAgent
 from .editor import EditorAgent
+from .outline import parse_outline
+from .llm import CachedLLM, create_llm
 
 __all__ = [
     'PlannerAgent',
     'ResearcherAgent',
     'WriterAgent',
-    'EditorAgent'
+    'EditorAgent',
+    'parse_outline',
+    'CachedLLM',
+    'create_llm'
 ]
\ No newline at end of file
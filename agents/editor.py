@@ -1,8 +1,8 @@
 from crewai import Agent
-import os
 from datetime import datetime
-import frontmatter
+from agents.llm import create_llm
 from config.logging_config import setup_logging
+from storage.blog_store import get_blog_store
 
 logger = setup_logging(__name__)
 
@@ -22,10 +22,7 @@ class EditorAgent:
             allow_delegation=False,
             memory=True,
             max_iter=2,
-            llm_config={
-                "temperature": 0.4,
-                "request_timeout": 120
-            }
+            llm=create_llm(temperature=0.4, timeout=120)
         )
         logger.info("EditorAgent created successfully")
         return agent
@@ -55,16 +52,11 @@ class EditorAgent:
         return prompt
 
     @staticmethod
-    def save_blog(content, title):
-        """Save the blog post with proper frontmatter"""
+    def save_blog(content, title, blogs_dir=None, artifacts=None, run_id=None):
+        """Save the blog post with proper frontmatter to the configured storage backend"""
         logger.info("Saving blog post with title: %s", title)
 
         try:
-            # Create blogs directory if it doesn't exist
-            blogs_dir = os.path.join('data', 'blogs')
-            os.makedirs(blogs_dir, exist_ok=True)
-            logger.debug("Created blogs directory: %s", blogs_dir)
-
             # Create metadata
             content_str = str(content)  # Convert CrewOutput to string
             metadata = {
@@ -73,23 +65,16 @@ class EditorAgent:
                 'tags': ['mongodb', 'databases', 'technical'],
                 'description': ' '.join(content_str.split('\n')[0:2])  # First two lines as description
             }
+            if run_id:
+                metadata['run_id'] = run_id
             logger.debug("Created metadata: %s", metadata)
 
-            # Create post with frontmatter
-            post = frontmatter.Post(content_str, **metadata)
-
-            # Generate filename from title
-            filename = title.lower().replace(' ', '-').replace('/', '-') + '.md'
-            filepath = os.path.join(blogs_dir, filename)
-            logger.debug("Generated filepath: %s", filepath)
-
-            # Save the file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(frontmatter.dumps(post))
+            store = get_blog_store(blogs_dir)
+            post_id = store.save(content_str, metadata, artifacts)
 
-            logger.info("Blog post saved successfully at: %s", filepath)
-            return filepath
+            logger.info("Blog post saved successfully to %s storage: %s", store.name, post_id)
+            return post_id
 
         except Exception as e:
             logger.error("Error saving blog post: %s", str(e))
-            raise
\ No newline at end of file
+            raise
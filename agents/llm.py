@@ -0,0 +1,255 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from hashlib import sha256
+from typing import Any, Callable, List, Optional, Tuple
+from crewai import LLM
+from crewai.llms.base_llm import BaseLLM
+from config.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join('data', 'cache', 'llm_cache.sqlite')
+DEFAULT_MODEL = 'gpt-4o-mini'
+# off: no cache; dedupe: reuse temperature-0 responses; record: store every
+# response; replay: serve only stored responses, never calling the provider
+CACHE_MODES = ('off', 'dedupe', 'record', 'replay')
+
+
+class LLMCacheMiss(RuntimeError):
+    """Raised in replay mode for a call that was never recorded"""
+
+
+def cache_mode() -> str:
+    mode = os.getenv('LLM_CACHE_MODE', 'dedupe').strip().lower()
+    if mode not in CACHE_MODES:
+        logger.warning("Unknown LLM_CACHE_MODE %s, caching disabled", mode)
+        return 'off'
+    return mode
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, list):
+        content = ' '.join(part.get('text', '') if isinstance(part, dict) else str(part) for part in content)
+    return re.sub(r'\s+', ' ', str(content or '')).strip()
+
+
+def normalize_messages(messages) -> List[Tuple[str, str]]:
+    """(role, text) pairs with whitespace collapsed, so prompt indentation doesn't change the key"""
+    if isinstance(messages, str):
+        return [('user', _text(messages))]
+    return [(message.get('role', 'user'), _text(message.get('content'))) for message in messages]
+
+
+def make_keys(model: str, temperature: Optional[float], messages, stop=None) -> Tuple[str, str, int]:
+    """Cache key of a call plus the key and turn of the conversation it belongs to.
+
+    The call key covers every message, including the tool outputs fed back to
+    the agent. The conversation key only covers the messages up to the task
+    prompt, which lets replay fall back to the n-th response of the same
+    task when a tool output differs from the recording.
+    """
+    normalized = normalize_messages(messages)
+    base = {'model': model, 'temperature': temperature, 'stop': sorted(stop or [])}
+    first_user = next((idx for idx, (role, _) in enumerate(normalized) if role == 'user'), len(normalized) - 1)
+    turn = sum(1 for role, _ in normalized if role == 'assistant')
+
+    def digest(items):
+        return sha256(json.dumps({**base, 'messages': items}, sort_keys=True).encode('utf-8')).hexdigest()
+
+    return digest(normalized), digest(normalized[:first_user + 1]), turn
+
+
+class LLMCache:
+    """Disk-backed store of LLM responses keyed on model, temperature and normalized prompt"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self.hits = 0
+        self.fallback_hits = 0
+        self.misses = 0
+        self.stored = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    conversation_key TEXT NOT NULL,
+                    turn INTEGER NOT NULL,
+                    model TEXT NOT NULL,
+                    temperature REAL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_conversation "
+                "ON responses (conversation_key, turn)"
+            )
+        logger.debug("LLM cache ready at %s", self.path)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str, conversation_key: Optional[str] = None, turn: int = 0) -> Optional[str]:
+        """Return the stored response of ``key``, or with a conversation key its ``turn``-th response"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            fallback = row is None and conversation_key is not None
+            if fallback:
+                row = conn.execute(
+                    "SELECT response FROM responses WHERE conversation_key = ? AND turn = ? "
+                    "ORDER BY created_at DESC LIMIT 1", (conversation_key, turn)
+                ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            elif fallback:
+                self.fallback_hits += 1
+            else:
+                self.hits += 1
+        return row[0] if row else None
+
+    def set(self, key: str, conversation_key: str, turn: int, model: str,
+            temperature: Optional[float], response: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, conversation_key, turn, model, temperature, response, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, conversation_key, turn, model, temperature, response, time.time())
+            )
+        with self._lock:
+            self.stored += 1
+
+    def stats(self) -> dict:
+        return {
+            'mode': cache_mode(),
+            'hits': self.hits,
+            'fallback_hits': self.fallback_hits,
+            'misses': self.misses,
+            'stored': self.stored,
+        }
+
+
+class CachedLLM(BaseLLM):
+    """crewai LLM that serves and records responses through the LLM cache.
+
+    Calls are delegated to a regular crewai ``LLM``, created on the first call
+    that actually needs the provider, so replay mode runs without network
+    access or API keys. When recording or replaying, native function calling
+    is turned off, so tools run through crewai's text protocol and their
+    outputs are part of the prompt and therefore of the cache key; otherwise
+    the provider's function calling support is used as is.
+    """
+
+    def __init__(self, model: str, temperature: Optional[float] = None, mode: str = 'dedupe',
+                 cache: Optional[LLMCache] = None, **params):
+        super().__init__(model=model, temperature=temperature)
+        self.mode = mode
+        self.cache = cache or get_llm_cache()
+        self.params = params
+        self._llm = None
+        self._llm_lock = threading.Lock()
+
+    def _provider(self) -> LLM:
+        with self._llm_lock:
+            if self._llm is None:
+                self._llm = LLM(model=self.model, temperature=self.temperature, **self.params)
+            return self._llm
+
+    def _caches(self) -> bool:
+        return self.mode in ('record', 'replay') or (self.mode == 'dedupe' and self.temperature == 0)
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        if not self._caches():
+            return self._call_provider(messages, tools, callbacks, available_functions, **kwargs)
+
+        stop = list(getattr(self, 'stop', None) or [])
+        key, conversation_key, turn = make_keys(self.model, self.temperature, messages, stop)
+        if self.mode != 'record':
+            cached = self.cache.get(key, conversation_key if self.mode == 'replay' else None, turn)
+            if cached is not None:
+                logger.debug("LLM cache hit for %s (turn %d)", self.model, turn)
+                return cached
+            if self.mode == 'replay':
+                raise LLMCacheMiss(f"No recorded {self.model} response for this prompt (turn {turn}); "
+                                   "record the run first with LLM_CACHE_MODE=record")
+
+        response = self._call_provider(messages, tools, callbacks, available_functions, **kwargs)
+        if isinstance(response, str):
+            self.cache.set(key, conversation_key, turn, self.model, self.temperature, response)
+        return response
+
+    def _call_provider(self, messages, tools, callbacks, available_functions, **kwargs):
+        provider = self._provider()
+        provider.stop = list(getattr(self, 'stop', None) or [])
+        return provider.call(messages, tools=tools, callbacks=callbacks,
+                             available_functions=available_functions, **kwargs)
+
+    def supports_function_calling(self) -> bool:
+        if self.mode in ('record', 'replay'):
+            return False
+        return self._provider().supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return True
+
+    def get_context_window_size(self) -> int:
+        if self._llm is not None:
+            return self._llm.get_context_window_size()
+        return super().get_context_window_size()
+
+    def get_token_usage_summary(self):
+        if self._llm is not None:
+            return self._llm.get_token_usage_summary()
+        return super().get_token_usage_summary()
+
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+_llm_factory = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Return the process-wide LLM cache, creating it on first use"""
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMCache(os.getenv('LLM_CACHE_PATH', DEFAULT_CACHE_PATH))
+        return _llm_cache
+
+
+def set_llm_factory(factory: Optional[Callable[[float, float], BaseLLM]]) -> None:
+    """Build every agent LLM with ``factory(temperature, timeout)``, e.g. a stub; None restores the default"""
+    global _llm_factory
+    _llm_factory = factory
+
+
+def create_llm(temperature: float, timeout: float) -> BaseLLM:
+    """LLM for an agent: the configured model, cached according to ``LLM_CACHE_MODE``.
+
+    In dedupe mode only temperature-0 agents are wrapped, since no other
+    responses are reused.
+    """
+    if _llm_factory is not None:
+        return _llm_factory(temperature, timeout)
+    model = os.getenv('OPENAI_MODEL_NAME') or os.getenv('MODEL') or DEFAULT_MODEL
+    mode = cache_mode()
+    if mode == 'off' or (mode == 'dedupe' and temperature != 0):
+        return LLM(model=model, temperature=temperature, timeout=timeout)
+    return CachedLLM(model, temperature, mode=mode, timeout=timeout)
@@ -0,0 +1,62 @@
+import re
+from typing import List, Optional
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+# "Target word count: 300-400", "(~350 words)", "Word count - 400 words"
+WORD_RANGE_PATTERN = re.compile(r'(\d[\d,]*)\s*(?:-|–|—|to)\s*(\d[\d,]*)(?=\s*words?\b|\s*$)', re.I)
+WORD_COUNT_PATTERN = re.compile(r'(\d[\d,]*)\+?\s*words?\b|word\s*(?:count|target)[^\d\n]*(\d[\d,]*)', re.I)
+TITLE_WORDS_PATTERN = re.compile(r'\s*[(\[][^()\[\]]*\d+[^()\[\]]*words?[)\]]', re.I)
+
+
+def parse_word_target(text: str) -> Optional[int]:
+    """Read a section's target word count from its outline text, the midpoint of a range"""
+    for line in text.splitlines():
+        if 'word' not in line.lower():
+            continue
+        words_range = WORD_RANGE_PATTERN.search(line)
+        if words_range:
+            low, high = (int(value.replace(',', '')) for value in words_range.groups())
+            return (low + high) // 2
+        count = WORD_COUNT_PATTERN.search(line)
+        if count:
+            return int((count.group(1) or count.group(2)).replace(',', ''))
+    return None
+
+
+def parse_outline(outline: str) -> List[dict]:
+    """Split a markdown outline into its main sections.
+
+    The main sections are the headings of the shallowest level below the
+    title (``#``) that occurs at least twice. Returns dicts with the section
+    ``title`` and the ``text`` under it; an outline without such headings is
+    returned as a single section.
+    """
+    lines = outline.splitlines()
+    headings = []
+    for idx, line in enumerate(lines):
+        match = HEADING_PATTERN.match(line.strip())
+        if match:
+            headings.append((idx, len(match.group(1)), match.group(2).strip('*_ ')))
+
+    levels = sorted({level for _, level, _ in headings if level > 1})
+    level = next((lvl for lvl in levels if sum(1 for _, l, _ in headings if l == lvl) >= 2), None)
+    if level is None:
+        return [{'title': 'Blog post', 'text': outline.strip(), 'words': None}]
+
+    sections = []
+    starts = [(idx, title) for idx, lvl, title in headings if lvl == level]
+    for pos, (idx, title) in enumerate(starts):
+        end = starts[pos + 1][0] if pos + 1 < len(starts) else len(lines)
+        # Stop at a heading above the section level, e.g. a closing "# Notes"
+        for next_idx, lvl, _ in headings:
+            if idx < next_idx < end and lvl < level:
+                end = next_idx
+                break
+        text = '\n'.join(lines[idx + 1:end]).strip()
+        # The target may be given in the heading, e.g. "## Indexing (~400 words)"
+        sections.append({
+            'title': TITLE_WORDS_PATTERN.sub('', title).strip() or title,
+            'text': text,
+            'words': parse_word_target(f"{title}\n{text}"),
+        })
+    return sections
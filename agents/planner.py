@@ -1,5 +1,6 @@
 from crewai import Agent
 from tools.web_tools import WebSearchTools
+from agents.llm import create_llm
 from config.logging_config import setup_logging
 
 logger = setup_logging(__name__)
@@ -19,16 +20,13 @@ class PlannerAgent:
             allow_delegation=False,
             memory=True,
             max_iter=3,
-            llm_config={
-                "temperature": 0.2,
-                "request_timeout": 120
-            }
+            llm=create_llm(temperature=0.2, timeout=120)
         )
         logger.info("PlannerAgent created successfully")
         return agent
 
     @staticmethod
-    def create_task_prompt(topic=None):
+    def create_task_prompt(topic=None, news=None):
         logger.info("Creating task prompt with topic: %s", topic if topic else "AI-chosen topic")
 
         if topic:
@@ -63,6 +61,17 @@ class PlannerAgent:
             Format the outline in markdown with clear hierarchical structure.
             Include relevant technical terms and concepts to be covered.
             """
+            if news:
+                news_digest = "\n".join(news)
+                prompt += f"""
+            Recent MongoDB news gathered from official and trusted sources:
+
+            {news_digest}
+
+            Start from these items when identifying candidate topics and only search
+            further if none of them is promising.
+            """
+                logger.debug("Included %d news items in prompt", len(news))
             logger.debug("Created AI-chosen topic prompt")
 
         logger.info("Task prompt created successfully")
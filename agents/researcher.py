@@ -1,5 +1,6 @@
 from crewai import Agent
 from tools.web_tools import WebSearchTools
+from agents.llm import create_llm
 from config.logging_config import setup_logging
 
 logger = setup_logging(__name__)
@@ -16,19 +17,20 @@ class ResearcherAgent:
             technical information from multiple sources. You understand MongoDB deeply
             and can evaluate the credibility of technical content.
             Be smart on using the tools and don't overuse the tools keeping maximum 3-4 requests in a minute.
+            Always check the KnowledgeBase Lookup first and only search the web for what it does not cover.
+            When you need to read several pages, scrape them together in one ScrapeWebBatch call.
             """,
             tools=[
+                WebSearchTools.knowledge_base_lookup(),
                 WebSearchTools.search_web(),
-                WebSearchTools.scrape_web()
+                WebSearchTools.scrape_web(),
+                WebSearchTools.scrape_web_batch()
             ],
             verbose=True,
             allow_delegation=False,
             memory=True,
             max_iter=10,
-            llm_config={
-                "temperature": 0.3,
-                "request_timeout": 300
-            }
+            llm=create_llm(temperature=0.3, timeout=300)
         )
         logger.info("ResearcherAgent created successfully with %d tools", len(agent.tools))
         return agent
@@ -1,4 +1,5 @@
 from crewai import Agent
+from agents.llm import create_llm
 from config.logging_config import setup_logging
 
 logger = setup_logging(__name__)
@@ -19,28 +20,41 @@ class WriterAgent:
             allow_delegation=False,
             memory=True,
             max_iter=3,
-            llm_config={
-                "temperature": 0,
-                "request_timeout": 180
-            }
+            llm=create_llm(temperature=0, timeout=180)
         )
         logger.info("WriterAgent created successfully")
         return agent
 
     @staticmethod
-    def create_task_prompt(outline, research):
+    def format_evidence(evidence):
+        """Format per-section research chunks for the writing prompt"""
+        blocks = []
+        for section in evidence:
+            chunks = "\n\n".join(section['chunks']) or "(no matching research; rely on the outline)"
+            blocks.append(f"### {section['title']}\n{chunks}")
+        return "\n\n".join(blocks)
+
+    @staticmethod
+    def create_task_prompt(outline, research, evidence=None):
+        """Build the writing prompt; with ``evidence`` only the research relevant to each section is included"""
         logger.info("Creating writing task prompt")
         logger.debug("Outline length: %d characters", len(outline))
         logger.debug("Research length: %d characters", len(research))
 
+        if evidence:
+            research_block = f"""RESEARCH BY SECTION (the research most relevant to each outline section):
+        {WriterAgent.format_evidence(evidence)}"""
+        else:
+            research_block = f"""RESEARCH:
+        {research}"""
+
         prompt = f"""Write a comprehensive technical blog post based on the following outline
         and research:
 
         OUTLINE:
         {outline}
 
-        RESEARCH:
-        {research}
+        {research_block}
 
         Requirements:
         1. Write in a professional but engaging tone
@@ -59,4 +73,69 @@ class WriterAgent:
         analogies and examples where appropriate."""
 
         logger.info("Writing task prompt created successfully")
-        return prompt
\ No newline at end of file
+        return prompt
+
+    @staticmethod
+    def create_section_prompt(title, section, position, section_titles, research, words=None):
+        """Build the prompt for writing one outline section on its own"""
+        logger.info("Creating section writing prompt for section %d: %s", position + 1, section['title'])
+        logger.debug("Section research length: %d characters", len(research))
+
+        plan = "\n        ".join(f"{idx + 1}. {name}" for idx, name in enumerate(section_titles))
+        prompt = f"""You are writing one section of the technical blog post "{title}".
+        Other writers are writing the remaining sections at the same time.
+
+        SECTIONS OF THE POST:
+        {plan}
+
+        Write only section {position + 1}, "{section['title']}", following its outline:
+        {section['text']}
+
+        RESEARCH FOR THIS SECTION:
+        {research or "(no matching research; rely on the outline)"}
+
+        Requirements:
+        1. Start with a level-two heading (##) for the section, with a relevant emoji
+        2. Write in a professional but engaging tone
+        3. Incorporate code examples with proper markdown formatting where they fit
+        4. Use technical terms accurately but explain them clearly
+        5. Length should be about {words or 300} words
+        6. Do not repeat the post title or cover the other sections
+        7. Format the section in markdown and return only the section"""
+
+        logger.info("Section writing prompt created successfully")
+        return prompt
+
+    @staticmethod
+    def create_stitch_prompt(title, boundaries):
+        """Build the prompt asking for transitions between independently written sections.
+
+        ``boundaries`` holds (ending of a section, heading and opening of the
+        next section) pairs.
+        """
+        logger.info("Creating stitching prompt for %d section boundaries", len(boundaries))
+
+        blocks = []
+        for idx, (ending, opening) in enumerate(boundaries, 1):
+            blocks.append(f"""BOUNDARY {idx}
+        End of previous section:
+        {ending}
+
+        Start of next section:
+        {opening}""")
+        joined = "\n\n        ".join(blocks)
+
+        prompt = f"""The sections of the technical blog post "{title}" were written
+        separately. Write a short transition for every boundary below that leads
+        the reader from the previous section into the next one.
+
+        {joined}
+
+        Requirements:
+        1. One or two sentences per transition, in the same engaging tone
+        2. Do not repeat content or headings of the sections
+        3. Answer with exactly one line per boundary, in the form
+           TRANSITION <number>: <transition text>"""
+
+        logger.info("Stitching prompt created successfully")
+        return prompt
@@ -1,22 +1,16 @@
 import streamlit as st
 import os
 from crew.blog_crew import BlogCrew
-import frontmatter
+from crew.jobs import JobQueueFull, get_job_runner
+from storage.blog_store import get_blog_store
 from datetime import datetime
 import time
-import logging
-import sys
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('blog_generator.log')
-    ]
-)
-logger = logging.getLogger(__name__)
+from config.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+BLOGS_PER_PAGE = 50
+JOB_REFRESH_SECONDS = 3
 
 # Streamlit configuration
 st.set_page_config(
@@ -31,11 +25,9 @@ st.markdown("""
 
 """, unsafe_allow_html=True)
 
-def load_blog_content(filepath):
-    """Load blog content with frontmatter"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        post = frontmatter.load(f)
-        return post.metadata, post.content
+def load_blog_content(post_id):
+    """Load blog metadata and content from the storage backend"""
+    return get_blog_store().load(post_id)
 
 def display_blog_preview(metadata, content):
     """Display blog preview with metadata"""
@@ -81,6 +73,12 @@ def create_blog():
         help="You can specify a particular MongoDB topic or let AI choose a trending one"
     )
 
+    resume_run_id = st.text_input(
+        "Resume a failed run (optional)",
+        placeholder="Run ID, e.g. 20250118-133635-a1b2c3",
+        help="Completed stages of that run are restored from their checkpoints instead of being regenerated"
+    )
+
     # Add some example topics as chips
     st.markdown("##### 💡 Example topics:")
     col1, col2, col3 = st.columns(3)
@@ -92,82 +90,117 @@ def create_blog():
         st.markdown("- MongoDB Time Series Collections")
 
     if st.button("🚀 Generate Blog", use_container_width=True):
-        logger.info("Starting blog generation process with topic: %s", topic if topic else "AI-chosen topic")
-
-        # Create containers for progress tracking
-        progress_container = st.container()
-        with progress_container:
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            details_expander = st.expander("View detailed progress", expanded=True)
-
-        def update_progress(message, progress=None):
-            """Update progress with more detailed logging"""
-            status_text.markdown(f"<div class='status-text'>{message}</div>", unsafe_allow_html=True)
-            if progress is not None:
-                progress_bar.progress(progress)
-            with details_expander:
-                st.write(f"{datetime.now().strftime('%H:%M:%S')} - {message}")
-            logger.info(message)
-
+        logger.info("Submitting blog generation job with topic: %s", topic if topic else "AI-chosen topic")
         try:
-            # Create and run crew with enhanced progress tracking
-            update_progress("🎯 Initializing blog generation process...", 0.1)
-            crew = BlogCrew(topic)
-            update_progress("🤔 Analyzing topic and planning blog structure...", 0.25)
-            update_progress("📚 Researching MongoDB documentation and best practices...", 0.40)
-            update_progress("✍️ Writing blog draft with technical insights...", 0.60)
-            update_progress("🔍 Reviewing technical accuracy and code examples...", 0.75)
-            update_progress("✨ Polishing content and formatting...", 0.90)
-            filepath = crew.run(callback=update_progress)
-            update_progress("✅ Blog generated successfully!", 1.0)
-            logger.info("Blog generation completed. File saved at: %s", filepath)
-
-            # Load and display the generated blog
-            try:
-                metadata, content = load_blog_content(filepath)
-                display_blog_preview(metadata, content)
-            except Exception as e:
-                logger.error("Error loading blog content: %s", str(e))
-                st.error("Blog was generated but there was an error displaying it. Please check the logs.")
-
+            job_id = get_job_runner().submit(topic or None, resume=resume_run_id.strip() or None)
+            st.success(f"🎯 Blog generation queued as job `{job_id}`. You can keep browsing while it runs.")
+        except JobQueueFull as e:
+            st.warning(f"⏳ {str(e)}. Please wait for a job to finish before submitting another.")
         except Exception as e:
-            error_msg = f"Error generating blog: {str(e)}"
+            error_msg = f"Error submitting blog generation: {str(e)}"
             logger.error(error_msg, exc_info=True)
             st.error(error_msg)
-            with details_expander:
-                st.error("Detailed error information has been logged. Check blog_generator.log for more details.")
-            progress_bar.empty()
-            status_text.empty()
+
+    render_jobs()
+    render_job_preview()
+
+JOB_STATUS_ICONS = {
+    'queued': '⏳',
+    'running': '⚙️',
+    'succeeded': '✅',
+    'failed': '❌',
+    'interrupted': '⚠️',
+}
+
+@st.fragment(run_every=JOB_REFRESH_SECONDS)
+def render_jobs():
+    """Show recent generation jobs, refreshing their progress in the background"""
+    jobs = get_job_runner().list(limit=10)
+    if not jobs:
+        return
+
+    st.markdown("### 🛠️ Generation Jobs")
+    for job in jobs:
+        icon = JOB_STATUS_ICONS.get(job['status'], '•')
+        topic = job['topic'] or 'AI-chosen topic'
+        with st.container():
+            st.markdown(f"{icon} **{topic}** · `{job['id']}` · {job['status']}")
+            st.progress(min(max(job['progress'] or 0.0, 0.0), 1.0), text=job['message'] or '')
+
+            with st.expander("View detailed progress", expanded=False):
+                for event in get_job_runner().events(job['id']):
+                    timestamp = datetime.fromtimestamp(event['created_at']).strftime('%H:%M:%S')
+                    if '\n' in event['message']:
+                        st.code(event['message'], language=None)
+                    else:
+                        st.write(f"{timestamp} - {event['message']}")
+                if job['error']:
+                    st.error(job['error'].splitlines()[0])
+
+            if job['status'] in ('failed', 'interrupted') and job['run_id']:
+                st.info(f"Completed stages were checkpointed. Resume with run ID `{job['run_id']}`.")
+
+            if job['status'] == 'succeeded' and job['filepath']:
+                if st.button("📖 Preview", key=f"preview-{job['id']}"):
+                    # The fragment reruns every few seconds, so the preview is shown outside it
+                    st.session_state['preview_post'] = job['filepath']
+                    st.rerun()
+
+def render_job_preview():
+    """Show the generated post picked with a job's Preview button"""
+    post_id = st.session_state.get('preview_post')
+    if not post_id:
+        return
+
+    try:
+        metadata, content = load_blog_content(post_id)
+        display_blog_preview(metadata, content)
+    except Exception as e:
+        logger.error("Error loading blog content: %s", str(e))
+        st.error("Blog was generated but there was an error displaying it. Please check the logs.")
+    if st.button("✖️ Close preview", key="close-preview"):
+        del st.session_state['preview_post']
+        st.rerun()
 
 def view_blogs():
     logger.info("Entering view_blogs function")
     st.markdown("### 📚 Existing Blogs")
 
     try:
-        # Get list of blogs
-        blogs = BlogCrew.list_blogs()
-        logger.info("Found %d existing blogs", len(blogs))
+        # Get one page of blogs from the storage backend
+        total = get_blog_store().count()
+        logger.info("Found %d existing blogs", total)
 
-        if not blogs:
+        if not total:
             st.info("🎉 No blogs generated yet. Create your first blog!")
             return
 
+        query = st.text_input("🔎 Search blogs", placeholder="e.g. vector search aggregation")
+        if query.strip():
+            blogs = get_blog_store().search(query, limit=BLOGS_PER_PAGE)
+            logger.info("Search for %r matched %d blogs", query, len(blogs))
+            if not blogs:
+                st.info("No blogs match your search.")
+                return
+        else:
+            page = 1
+            pages = (total + BLOGS_PER_PAGE - 1) // BLOGS_PER_PAGE
+            if pages > 1:
+                page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
+            blogs = BlogCrew.list_blogs(limit=BLOGS_PER_PAGE, offset=(page - 1) * BLOGS_PER_PAGE)
+
         # Create selection for blogs with better organization
         blog_titles = []
         blog_dict = {}
 
-        for blog_path in blogs:
-            try:
-                metadata, _ = load_blog_content(blog_path)
-                title = metadata.get('title', os.path.basename(blog_path))
-                date = metadata.get('date', 'No date')
-                display_title = f"{title} ({date})"
-                blog_titles.append(display_title)
-                blog_dict[display_title] = blog_path
-            except Exception as e:
-                logger.error("Error loading blog at %s: %s", blog_path, str(e))
-                continue
+        for blog in blogs:
+            date = blog['date'] or 'No date'
+            display_title = f"{blog['title']} ({date})"
+            if display_title in blog_dict:
+                # Posts can share a title; keep them apart in the selection
+                display_title = f"{display_title} #{len(blog_titles) + 1}"
+            blog_titles.append(display_title)
+            blog_dict[display_title] = blog['id']
 
         selected_blog = st.selectbox(
             "📖 Select a blog to view",
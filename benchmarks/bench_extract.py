@@ -0,0 +1,56 @@
+"""
+Compare the reference BeautifulSoup extractor with the lxml fast path on the
+saved HTML fixtures.
+
+    python -m benchmarks.bench_extract [--repeat N]
+"""
+
+import argparse
+import glob
+import os
+import time
+from tools import html_extract
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def load_fixtures():
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            fixtures[os.path.basename(path)] = f.read()
+    return fixtures
+
+
+def time_extractor(extract, html, url, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        text = extract(html, url)
+    return (time.perf_counter() - started) / repeat, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20, help='Extractions per fixture and engine')
+    args = parser.parse_args()
+
+    if html_extract.lxml is None:
+        raise SystemExit("lxml is not installed; nothing to compare against")
+
+    print(f"{'fixture':<36}{'KB':>8}{'soup ms':>10}{'lxml ms':>10}{'speedup':>9}  same output")
+    total_soup = total_lxml = 0.0
+    for name, html in load_fixtures().items():
+        url = f"https://www.mongodb.com/fixtures/{name}"
+        soup_seconds, soup_text = time_extractor(html_extract.extract_text_soup, html, url, args.repeat)
+        lxml_seconds, lxml_text = time_extractor(html_extract.extract_text_lxml, html, url, args.repeat)
+        total_soup += soup_seconds
+        total_lxml += lxml_seconds
+        print(f"{name:<36}{len(html.encode('utf-8')) / 1024:>8.1f}{soup_seconds * 1000:>10.2f}"
+              f"{lxml_seconds * 1000:>10.2f}{soup_seconds / lxml_seconds:>8.1f}x  {soup_text == lxml_text}")
+
+    print(f"{'total':<44}{total_soup * 1000:>10.2f}{total_lxml * 1000:>10.2f}"
+          f"{total_soup / total_lxml:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Offline end-to-end benchmarks of the blog pipeline against a local fake Serper
+endpoint, the saved HTML pages served over HTTP and a stub LLM.
+
+    python -m benchmarks.bench_pipeline [--latency-ms 20] [--llm-latency-ms 0]
+    python -m benchmarks.bench_pipeline --save-baseline   # store the results as the baseline
+
+Results are written as JSON and compared against the stored baseline.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+BASELINE_PATH = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+RESULTS_PATH = os.path.join(BENCHMARKS_DIR, 'results', 'latest.json')
+
+QUERIES = [
+    'MongoDB Atlas Vector Search', 'vector quantization MongoDB', 'RAG with MongoDB and Python',
+    'Atlas Search index definition', '$vectorSearch aggregation stage', 'MongoDB changelog 2025',
+    'hybrid search MongoDB', 'MongoDB time series collections', 'MongoDB schema design patterns',
+    'Atlas Stream Processing',
+]
+# Metrics compared against the baseline; everything else is informational
+HIGHER_IS_BETTER = ('_per_sec',)
+LOWER_IS_BETTER = ('_ms', '_seconds', '_mb')
+
+
+def isolate(workdir: str, search_url: str) -> None:
+    """Point every cache, store and output of the pipeline at ``workdir``.
+
+    Must run before the project modules are imported, since their caches and
+    log files are configured on first use.
+    """
+    os.environ.update({
+        'SERPER_API_URL': search_url,
+        'SERPER_API_KEY': 'benchmark',
+        'SEARCH_OFFLINE': 'false',
+        'SEARCH_CACHE_PATH': os.path.join(workdir, 'cache', 'search_cache.sqlite'),
+        'SCRAPE_CACHE_PATH': os.path.join(workdir, 'cache', 'scrape_cache.sqlite'),
+        # Measure real downloads and extraction rather than cache lookups
+        'SCRAPE_CACHE_ENABLED': 'false',
+        'KNOWLEDGE_BASE_ENABLED': 'false',
+        'KNOWLEDGE_BASE_PATH': os.path.join(workdir, 'knowledge', 'knowledge_base.sqlite'),
+        'LLM_CACHE_MODE': 'off',
+        'BLOG_STORAGE_BACKEND': 'file',
+        # crewai's telemetry would add network round trips to the measured runs
+        'OTEL_SDK_DISABLED': 'true',
+        'CREWAI_DISABLE_TELEMETRY': 'true',
+    })
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    os.chdir(workdir)
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def peak_memory_mb(func) -> float:
+    """Peak Python heap allocated while running ``func``"""
+    tracemalloc.start()
+    try:
+        func()
+        return round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+    finally:
+        tracemalloc.stop()
+
+
+def bench_search(queries) -> dict:
+    """Latency of the Web Search tool, first against the endpoint, then from the search cache"""
+    from tools.web_tools import WebSearchTools
+    search = WebSearchTools.search_web().func
+
+    def run_queries():
+        latencies = []
+        for query in queries:
+            started = time.perf_counter()
+            search(query)
+            latencies.append((time.perf_counter() - started) * 1000)
+        return latencies
+
+    cold = run_queries()
+    warm = run_queries()
+    return {
+        'queries': len(queries),
+        'cold_p50_ms': round(statistics.median(cold), 3),
+        'cold_p95_ms': round(percentile(cold, 95), 3),
+        'warm_p50_ms': round(statistics.median(warm), 3),
+        'warm_p95_ms': round(percentile(warm, 95), 3),
+        'peak_mb': peak_memory_mb(run_queries),
+    }
+
+
+def bench_scrape(services, rounds: int) -> dict:
+    """Throughput of concurrent page download plus text extraction"""
+    from tools.dedup import reset_dedup_tracker
+    from tools.web_tools import WebSearchTools
+
+    def scrape(tag):
+        urls = [services.page_url(name, f"{tag}-{idx}") for idx in range(rounds) for name in services.pages]
+        reset_dedup_tracker()
+        return WebSearchTools.scrape_many(urls)
+
+    bytes_before = services.bytes_served
+    started = time.perf_counter()
+    results = scrape('timed')
+    seconds = time.perf_counter() - started
+    megabytes = (services.bytes_served - bytes_before) / 1024 / 1024
+    ok = sum(1 for result in results if result['status'] == 'ok')
+    return {
+        'pages': len(results),
+        'pages_ok': ok,
+        'megabytes': round(megabytes, 3),
+        'wall_seconds': round(seconds, 3),
+        'pages_per_sec': round(len(results) / seconds, 2),
+        'mb_per_sec': round(megabytes / seconds, 2),
+        'peak_mb': peak_memory_mb(lambda: scrape('traced')),
+    }
+
+
+def bench_pipeline(workdir: str, llm_latency: float) -> dict:
+    """Wall time per stage of a full BlogCrew run with the stub LLM"""
+    from agents.llm import set_llm_factory
+    from benchmarks.fake_services import StubLLM
+    from crew.blog_crew import BlogCrew
+
+    set_llm_factory(lambda temperature, timeout: StubLLM(latency=llm_latency))
+    runs = []
+
+    def run():
+        crew = BlogCrew('Atlas Vector Search', blogs_dir=os.path.join(workdir, 'blogs'),
+                        runs_dir=os.path.join(workdir, 'runs'))
+        started = time.perf_counter()
+        crew.run()
+        runs.append((time.perf_counter() - started, crew.metrics))
+
+    try:
+        run()
+        peak = peak_memory_mb(run)
+    finally:
+        set_llm_factory(None)
+
+    seconds, metrics = runs[0]
+    return {
+        'wall_seconds': round(seconds, 3),
+        'stages': {name: {'wall_seconds': stage['seconds']} for name, stage in metrics.stages.items()},
+        'tools': {name: {'calls': tool['calls'], 'total_seconds': tool['seconds']}
+                  for name, tool in metrics.tools.items()},
+        'peak_mb': peak,
+    }
+
+
+def flatten(results: dict, prefix: str = '') -> dict:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """Rows of (metric, baseline, current, relative change, verdict) for the timed metrics"""
+    rows = []
+    base_flat = flatten(baseline.get('results', {}))
+    for metric, value in flatten(current['results']).items():
+        higher = metric.endswith(HIGHER_IS_BETTER)
+        if not (higher or metric.endswith(LOWER_IS_BETTER)) or not base_flat.get(metric):
+            continue
+        change = (value - base_flat[metric]) / base_flat[metric]
+        worse = -change if higher else change
+        verdict = 'regressed' if worse > tolerance else 'improved' if worse < -tolerance else 'ok'
+        rows.append((metric, base_flat[metric], value, change, verdict))
+    return rows
+
+
+def write_json(path: str, data: dict) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help='Added to every fake search and page response')
+    parser.add_argument('--llm-latency-ms', type=float, default=0.0, help='Added to every stub LLM call')
+    parser.add_argument('--rounds', type=int, default=5, help='Copies of every saved page scraped')
+    parser.add_argument('--skip-pipeline', action='store_true', help='Only benchmark search and scraping')
+    parser.add_argument('--output', default=RESULTS_PATH, help='Where to write the results JSON')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline results to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='Relative change reported as a regression or improvement')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit with status 1 on a regression')
+    args = parser.parse_args()
+
+    from benchmarks.fake_services import FakeServices
+
+    cwd = os.getcwd()
+    output, baseline_path = os.path.abspath(args.output), os.path.abspath(args.baseline)
+    workdir = tempfile.mkdtemp(prefix='blog-bench-')
+    services = FakeServices(latency=args.latency_ms / 1000).start()
+    try:
+        isolate(workdir, services.search_url)
+        results = {
+            'search': bench_search(QUERIES),
+            'scrape': bench_scrape(services, args.rounds),
+        }
+        if not args.skip_pipeline:
+            results['pipeline'] = bench_pipeline(workdir, args.llm_latency_ms / 1000)
+        results['services'] = services.stats()
+    finally:
+        services.stop()
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'latency_ms': args.latency_ms,
+            'llm_latency_ms': args.llm_latency_ms,
+            'rounds': args.rounds,
+        },
+        'results': results,
+    }
+    write_json(output, report)
+    print(f"Results written to {output}")
+    for metric, value in flatten(results).items():
+        print(f"  {metric:<45}{value:>12}")
+
+    if args.save_baseline:
+        write_json(baseline_path, report)
+        print(f"Baseline saved to {baseline_path}")
+        return
+    if not os.path.exists(baseline_path):
+        print("No baseline to compare against; store one with --save-baseline")
+        return
+
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        rows = compare(report, json.load(f), args.tolerance)
+    print(f"\n{'metric':<45}{'baseline':>12}{'current':>12}{'change':>9}  verdict")
+    for metric, base, current, change, verdict in rows:
+        print(f"{metric:<45}{base:>12}{current:>12}{change:>+8.0%}  {verdict}")
+    if args.fail_on_regression and any(row[4] == 'regressed' for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
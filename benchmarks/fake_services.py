@@ -0,0 +1,227 @@
+"""
+Local stand-ins for the external services of the pipeline: a Serper-compatible
+search endpoint and a web server for the saved HTML pages, plus a stub LLM
+that drives the agents through their tools without any provider.
+"""
+
+import glob
+import json
+import os
+import re
+import threading
+import time
+from hashlib import sha256
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, urlparse
+from crewai.llms.base_llm import BaseLLM
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z'-]+")
+
+
+def load_pages(fixtures_dir: str = FIXTURES_DIR) -> dict:
+    """Saved pages by file name, with their raw HTML, title and words for snippets"""
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, '*.html'))):
+        with open(path, 'rb') as f:
+            body = f.read()
+        html = body.decode('utf-8', errors='replace')
+        title = re.search(r'<title>(.*?)</title>', html, re.S | re.I)
+        text = re.sub(r'<(script|style)\b.*?</\1>|<[^>]+>', ' ', html, flags=re.S | re.I)
+        pages[os.path.basename(path)] = {
+            'body': body,
+            'etag': f'"{sha256(body).hexdigest()[:16]}"',
+            'title': title.group(1).strip() if title else os.path.basename(path),
+            'words': WORD_PATTERN.findall(text),
+        }
+    return pages
+
+
+class FakeServices:
+    """Serper-style search and saved pages served from a local HTTP server.
+
+    ``POST /search`` answers every query with ``results`` organic results that
+    link to ``GET /pages/<fixture>?...`` on the same server, each with its own
+    snippet and date. ``latency`` seconds are added to every response to stand
+    in for the network. Requests and bytes served are counted.
+    """
+
+    def __init__(self, results: int = 8, latency: float = 0.0, fixtures_dir: str = FIXTURES_DIR):
+        self.results = results
+        self.latency = latency
+        self.pages = load_pages(fixtures_dir)
+        self.searches = 0
+        self.page_requests = 0
+        self.bytes_served = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def search_url(self) -> str:
+        return f"{self.base_url}/search"
+
+    def page_url(self, name: str, variant: str = '') -> str:
+        return f"{self.base_url}/pages/{name}" + (f"?v={quote(variant)}" if variant else '')
+
+    def search(self, query: str) -> dict:
+        """Deterministic organic results for ``query``"""
+        seed = int(sha256(query.encode('utf-8')).hexdigest(), 16)
+        names = list(self.pages)
+        organic = []
+        for position in range(self.results):
+            name = names[(seed + position) % len(names)]
+            page = self.pages[name]
+            start = (seed // 7 + position * 40) % max(1, len(page['words']) - 30)
+            organic.append({
+                'position': position + 1,
+                'title': f"{page['title']} ({position + 1})",
+                'link': self.page_url(name, f"{seed % 10000}-{position}"),
+                'snippet': ' '.join(page['words'][start:start + 30]),
+                'date': f"{position * 5 + 1} days ago",
+            })
+        return {'searchParameters': {'q': query}, 'organic': organic}
+
+    def _handler(self):
+        services = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str, headers: dict = None):
+                if services.latency:
+                    time.sleep(services.latency)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+                with services._lock:
+                    services.bytes_served += len(body)
+
+            def do_POST(self):
+                if urlparse(self.path).path != '/search':
+                    self._send(404, b'{}', 'application/json')
+                    return
+                payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                with services._lock:
+                    services.searches += 1
+                body = json.dumps(services.search(payload.get('q', ''))).encode('utf-8')
+                self._send(200, body, 'application/json')
+
+            def do_GET(self):
+                name = urlparse(self.path).path.rsplit('/', 1)[-1]
+                page = services.pages.get(name)
+                if page is None:
+                    self._send(404, b'Not found', 'text/plain')
+                    return
+                with services._lock:
+                    services.page_requests += 1
+                if self.headers.get('If-None-Match') == page['etag']:
+                    self._send(304, b'', 'text/html; charset=utf-8', {'ETag': page['etag']})
+                    return
+                self._send(200, page['body'], 'text/html; charset=utf-8', {'ETag': page['etag']})
+
+        return Handler
+
+    def start(self) -> 'FakeServices':
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='fake-services', daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def stats(self) -> dict:
+        return {'searches': self.searches, 'page_requests': self.page_requests, 'bytes_served': self.bytes_served}
+
+    def __enter__(self) -> 'FakeServices':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class StubLLM(BaseLLM):
+    """Canned, deterministic LLM for the four agents.
+
+    The researcher searches, batch-scrapes the URLs it found and answers with
+    the scraped text, so tool latency is part of the measured pipeline; the
+    other agents answer immediately from their prompt. ``latency`` seconds
+    are added to every call to stand in for generation time.
+    """
+
+    def __init__(self, latency: float = 0.0, section_words: int = 300):
+        super().__init__(model='stub', temperature=0)
+        self.latency = latency
+        self.section_words = section_words
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return True
+
+    def get_context_window_size(self) -> int:
+        return 128000
+
+    def _prose(self, topic: str, words: int) -> str:
+        sentence = f"{topic} keeps MongoDB applications fast, flexible and easy to operate at scale."
+        repeats = max(1, words // len(sentence.split()))
+        paragraphs = [' '.join([sentence] * 4) for _ in range(max(1, repeats // 4))]
+        return '\n\n'.join(paragraphs)
+
+    def _answer(self, text: str) -> str:
+        return f"Thought: I now know the final answer\nFinal Answer: {text}"
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        if isinstance(messages, str):
+            messages = [{'role': 'user', 'content': messages}]
+        prompt = '\n'.join(str(message.get('content') or '') for message in messages)
+        turn = sum(1 for message in messages if message.get('role') == 'assistant')
+
+        if 'TRANSITION <number>' in prompt:
+            boundaries = len(re.findall(r'^\s*BOUNDARY \d+', prompt, re.M))
+            return self._answer('\n'.join(f"TRANSITION {idx}: Building on that, let's go one step further."
+                                          for idx in range(1, boundaries + 1)))
+        if 'Review and edit the following technical blog post' in prompt:
+            draft = prompt.split('Review and edit the following technical blog post:', 1)[1].split('Tasks:', 1)[0]
+            return self._answer(draft.strip())
+        if 'Write only section' in prompt:
+            title = re.search(r'Write only section \d+, "([^"]+)"', prompt).group(1)
+            return self._answer(f"## {title}\n\n{self._prose(title, self.section_words)}")
+        if 'Write a comprehensive technical blog post' in prompt:
+            headings = re.findall(r'^\s*##\s+(.+)$', prompt, re.M) or ['Overview']
+            body = '\n\n'.join(f"## {heading}\n\n{self._prose(heading, self.section_words)}"
+                               for heading in headings[:6])
+            return self._answer(f"# Atlas Vector Search in Practice\n\n{body}")
+        if 'Research and gather detailed information' in prompt:
+            topic = (re.findall(r'^\s*##\s+(.+)$', prompt, re.M) or ['MongoDB Atlas Vector Search'])[0]
+            if turn == 0:
+                return (f"Thought: I should search for sources first\nAction: Web Search\n"
+                        f"Action Input: {json.dumps({'query': f'MongoDB {topic}'})}")
+            urls = re.findall(r'URL: (\S+)', prompt)
+            if turn == 1 and urls:
+                return (f"Thought: I should read the most relevant pages\nAction: ScrapeWebBatch\n"
+                        f"Action Input: {json.dumps({'urls': ','.join(urls[:4])})}")
+            observation = prompt.rsplit('Observation:', 1)[-1]
+            return self._answer(f"## {topic}\n\n{observation.strip()[:6000]}")
+        if 'outline' in prompt.lower():
+            sections = ['Introduction', 'How Vector Search Works', 'Creating the Index',
+                        'Querying with $vectorSearch', 'Performance Tips', 'Conclusion']
+            outline = '\n\n'.join(f"## {section}\n- Key points about {section.lower()}\n"
+                                  f"- Target word count: {self.section_words}" for section in sections)
+            return self._answer(f"# Atlas Vector Search in Practice\n\n{outline}")
+        return self._answer("Done.")
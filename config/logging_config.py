@@ -1,43 +1,326 @@
+import atexit
 import logging
-import sys
+import multiprocessing
+import multiprocessing.util
 import os
+import queue
+import re
+import sys
+import threading
+import time
 from datetime import datetime
+from logging.handlers import QueueHandler
 
-def setup_logging(name):
+FILE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+CONSOLE_FORMAT = '%(levelname)s - %(message)s'
+# Period of a log file per LOG_ROTATE_WHEN, also used in the names of rotated files
+PERIOD_FORMATS = {'midnight': '%Y-%m-%d', 'hour': '%Y-%m-%d_%H', 'never': ''}
+
+# Arguments of these types are formatted on the writer thread; any other argument
+# could change before then, so such messages are formatted when they are logged
+IMMUTABLE_ARGS = (str, bytes, int, float, complex, type(None), datetime)
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def _level(value, default: int) -> int:
+    """Numeric level of a name such as ``INFO`` or a number, else ``default``"""
+    value = str(value or '').strip().upper()
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value) if value else None
+    return level if isinstance(level, int) else default
+
+
+def parse_levels(spec: str) -> dict:
+    """Parse ``LOG_LEVELS`` such as ``tools=WARNING,crew.blog_crew=DEBUG,root=INFO``"""
+    levels = {}
+    for item in (spec or '').split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = _level(level, logging.INFO)
+    return levels
+
+
+class RotatingLogFile(logging.FileHandler):
+    """Log file rotated when it exceeds ``max_bytes`` or its period (day or hour) ends.
+
+    Rotated files are renamed ``<name>.<period>`` (with a ``.N`` suffix for
+    several files of one period) and only the newest ``backup_count`` of
+    them are kept; other files in the directory are never touched. The file
+    is opened with the first record, and records are written without
+    flushing; the log writer flushes once per batch.
     """
-    Set up logging configuration for a module
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024, when: str = 'midnight',
+                 backup_count: int = 14):
+        self.max_bytes = max_bytes
+        self.period_format = PERIOD_FORMATS.get(when, PERIOD_FORMATS['midnight'])
+        self.backup_count = backup_count
+        self.period = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        super().__init__(path, encoding='utf-8', delay=True)
+        self.backup_pattern = re.compile(
+            re.escape(os.path.basename(self.baseFilename)) + r'\.\d{4}-\d{2}-\d{2}[\d_-]*(?:\.\d+)?$'
+        )
+
+    def _period(self, timestamp: float = None) -> str:
+        if not self.period_format:
+            return ''
+        return datetime.fromtimestamp(timestamp or time.time()).strftime(self.period_format)
+
+    def should_rotate(self) -> bool:
+        if self.period_format and self._period() != self.period:
+            return True
+        if self.max_bytes <= 0:
+            return False
+        if self.stream is not None:
+            return self.stream.tell() >= self.max_bytes
+        return os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) >= self.max_bytes
+
+    def backups(self) -> list:
+        """Rotated files of this log, newest first"""
+        directory = os.path.dirname(self.baseFilename)
+        paths = [os.path.join(directory, name) for name in os.listdir(directory) if self.backup_pattern.match(name)]
+        return sorted(paths, key=os.path.getmtime, reverse=True)
+
+    def rotate(self) -> None:
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        period = self.period or datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        target = f"{self.baseFilename}.{period}"
+        suffix = 1
+        while os.path.exists(target):
+            target = f"{self.baseFilename}.{period}.{suffix}"
+            suffix += 1
+        if os.path.exists(self.baseFilename):
+            os.replace(self.baseFilename, target)
+
+        for old in self.backups()[self.backup_count:]:
+            os.remove(old)
+        self.period = self._period()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.period is None:
+                # A file left over from an earlier period is rotated before the first record
+                exists = os.path.exists(self.baseFilename)
+                self.period = self._period(os.path.getmtime(self.baseFilename) if exists else None)
+            if self.should_rotate():
+                self.rotate()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """Stream handler whose writes are flushed by the log writer in batches"""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class EnqueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the log writer, so logging costs only an enqueue.
+
+    Messages with a mutable argument, such as a dict, are resolved right
+    away, so they show the argument as it was when it was logged.
     """
-    logger = logging.getLogger(name)
 
-    if not logger.handlers:  # Avoid adding handlers multiple times
-        logger.setLevel(logging.DEBUG)
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        # A lone dict argument becomes the args themselves, so dicts are always resolved
+        if args and (isinstance(args, dict) or not all(isinstance(arg, IMMUTABLE_ARGS) for arg in args)):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
 
-        # Create logs directory if it doesn't exist
-        logs_dir = "logs"
-        if not os.path.exists(logs_dir):
-            os.makedirs(logs_dir)
 
-        # Create formatters
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_formatter = logging.Formatter(
-            '%(levelname)s - %(message)s'
+class LogWriter(threading.Thread):
+    """Background thread writing queued records to the handlers in batches.
+
+    Handlers are flushed once ``batch_size`` records were written or
+    ``flush_interval`` seconds after the first unflushed record, whichever
+    comes first.
+    """
+
+    _STOP = object()
+
+    def __init__(self, records: queue.SimpleQueue, handlers, batch_size: int = 256,
+                 flush_interval: float = 0.5):
+        super().__init__(name='log-writer', daemon=True)
+        self.records = records
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+    def _flush(self) -> None:
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+
+    def _dispatch(self, record: logging.LogRecord) -> None:
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def run(self) -> None:
+        pending = 0
+        first_pending = 0.0
+        while True:
+            timeout = None if not pending else max(0.0, self.flush_interval - (time.monotonic() - first_pending))
+            try:
+                record = self.records.get(timeout=timeout)
+            except queue.Empty:
+                self._flush()
+                pending = 0
+                continue
+            if record is self._STOP:
+                break
+            self._dispatch(record)
+            if not pending:
+                first_pending = time.monotonic()
+            pending += 1
+            if pending >= self.batch_size or time.monotonic() - first_pending >= self.flush_interval:
+                self._flush()
+                pending = 0
+        self._flush()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self.records.put(self._STOP)
+        self.join(timeout)
+
+
+class LoggingPipeline:
+    """One queue and one background writer per process for all application loggers.
+
+    Configured from the environment when the first logger is set up:
+    ``LOG_LEVEL`` (default INFO) and ``LOG_LEVELS`` per subsystem, matched by
+    the longest logger name prefix; ``LOG_CONSOLE_LEVEL``; ``LOG_DIR``,
+    ``LOG_MAX_BYTES``, ``LOG_ROTATE_WHEN`` (midnight, hour or never) and
+    ``LOG_BACKUP_COUNT`` for the log file; ``LOG_BATCH_SIZE`` and
+    ``LOG_FLUSH_INTERVAL`` for the writer.
+    """
+
+    def __init__(self):
+        self.default_level = _level(os.getenv('LOG_LEVEL'), logging.INFO)
+        self.levels = parse_levels(os.getenv('LOG_LEVELS', ''))
+
+        file_handler = RotatingLogFile(
+            os.path.join(os.getenv('LOG_DIR', 'logs'), 'blog_generator.log'),
+            max_bytes=int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024)),
+            when=os.getenv('LOG_ROTATE_WHEN', 'midnight').strip().lower(),
+            backup_count=int(os.getenv('LOG_BACKUP_COUNT', 14)),
         )
+        file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+        console_handler = ConsoleHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        console_handler.setLevel(_level(os.getenv('LOG_CONSOLE_LEVEL'), logging.INFO))
 
-        # File handler - separate file for each day
-        today = datetime.now().strftime('%Y-%m-%d')
-        file_handler = logging.FileHandler(
-            f"{logs_dir}/blog_generator_{today}.log"
+        self.records = queue.SimpleQueue()
+        self.handler = EnqueueHandler(self.records)
+        self.file_handler = file_handler
+        self.writer = LogWriter(
+            self.records,
+            [file_handler, console_handler],
+            batch_size=int(os.getenv('LOG_BATCH_SIZE', 256)),
+            flush_interval=float(os.getenv('LOG_FLUSH_INTERVAL', 0.5)),
         )
-        file_handler.setFormatter(file_formatter)
+        self.writer.start()
+        self._worker_records = None
+        self._forwarder = None
+        self._lock = threading.Lock()
+
+        # Third-party libraries log through the root logger at WARNING unless configured
+        root = logging.getLogger()
+        root.addHandler(self.handler)
+        root.setLevel(self.levels.get('root', logging.WARNING))
+        atexit.register(self.close)
+
+    def level_for(self, name: str) -> int:
+        """Level of the longest ``LOG_LEVELS`` prefix of ``name``, else ``LOG_LEVEL``"""
+        parts = name.split('.')
+        for end in range(len(parts), 0, -1):
+            level = self.levels.get('.'.join(parts[:end]))
+            if level is not None:
+                return level
+        return self.default_level
+
+    def worker_queue(self):
+        """Queue on which worker processes send their records to this process's writer"""
+        with self._lock:
+            if self._worker_records is None:
+                self._worker_records = multiprocessing.get_context('spawn').Queue()
+                self._forwarder = threading.Thread(target=self._forward, name='log-forwarder', daemon=True)
+                self._forwarder.start()
+            return self._worker_records
 
-        # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(console_formatter)
+    def _forward(self) -> None:
+        while True:
+            record = self._worker_records.get()
+            if record is None:
+                break
+            self.records.put(record)
 
-        # Add handlers
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+    def forward_to(self, records) -> None:
+        """Send this process's records to another process's writer instead of the log file and console"""
+        self.writer.handlers = [QueueHandler(records)]
 
+    def close(self) -> None:
+        """Write out every queued record; later records are dropped"""
+        logging.getLogger().removeHandler(self.handler)
+        if self._forwarder is not None and self._forwarder.is_alive():
+            self._worker_records.put(None)
+            self._forwarder.join(5)
+        if self.writer.is_alive():
+            self.writer.stop()
+        self.file_handler.close()
+
+
+def shutdown_logging() -> None:
+    """Write out the queued records and stop the log writer; also runs at exit"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is not None:
+            _pipeline.close()
+            _pipeline = None
+
+
+def init_worker_logging(records) -> None:
+    """Process pool initializer sending a worker's records to the parent's ``worker_queue``.
+
+    Only the parent writes and rotates the log file, so workers never race
+    each other on it.
+    """
+    get_logging_pipeline().forward_to(records)
+    # Pool workers exit without running atexit handlers, but with multiprocessing finalizers
+    multiprocessing.util.Finalize(None, shutdown_logging, exitpriority=100)
+
+
+def get_logging_pipeline() -> LoggingPipeline:
+    """Return the process-wide logging pipeline, starting it on first use"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = LoggingPipeline()
+        return _pipeline
+
+
+def setup_logging(name):
+    """
+    Set up logging for a module: records go through the process-wide queue
+    to the log file and console, at the level configured for the module
+    """
+    pipeline = get_logging_pipeline()
+    logger = logging.getLogger(name)
+    logger.setLevel(pipeline.level_for(name))
     return logger
@@ -0,0 +1,178 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+from config.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+# Resolved at import so runs that change the working directory still share one file
+METRICS_FILE = os.path.abspath(os.path.join('logs', 'metrics.jsonl'))
+
+# Token counters reported by crewai's UsageMetrics
+TOKEN_FIELDS = ('total_tokens', 'prompt_tokens', 'cached_prompt_tokens',
+                'completion_tokens', 'successful_requests')
+
+
+class RunMetrics:
+    """Latency and token usage collected during one blog generation run.
+
+    Stage timings, tool invocations and LLM usage are aggregated in memory and
+    written as a single JSON line per run by ``emit``.
+    """
+
+    def __init__(self, run_id: Optional[str] = None, topic: Optional[str] = None):
+        self.run_id = run_id
+        self.topic = topic
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.stages = {}
+        self.tools = {}
+        self.llm = {}
+        self.extra = {}
+        self.outcome = None
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a pipeline stage; the stage is recorded even when it raises"""
+        started = time.monotonic()
+        status = 'ok'
+        try:
+            yield
+        except Exception:
+            status = 'error'
+            raise
+        finally:
+            with self._lock:
+                self.stages[name] = {
+                    'seconds': round(time.monotonic() - started, 3),
+                    'status': status
+                }
+
+    def record_stage(self, name: str, seconds: float, status: str = 'ok') -> None:
+        """Record a stage timed elsewhere, e.g. one whose steps ran interleaved with another stage"""
+        with self._lock:
+            self.stages[name] = {'seconds': round(seconds, 3), 'status': status}
+
+    def skip_stage(self, name: str) -> None:
+        with self._lock:
+            self.stages[name] = {'seconds': 0.0, 'status': 'restored'}
+
+    def record_tool(self, name: str, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            stats = self.tools.setdefault(name, {'calls': 0, 'errors': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+            stats['calls'] += 1
+            stats['errors'] += 0 if ok else 1
+            stats['seconds'] = round(stats['seconds'] + seconds, 4)
+            stats['max_seconds'] = round(max(stats['max_seconds'], seconds), 4)
+
+    def record_llm_usage(self, stage: str, usage) -> None:
+        """Record token usage of a stage from a crewai UsageMetrics object or dict"""
+        if usage is None:
+            return
+        if not isinstance(usage, dict):
+            usage = usage.model_dump() if hasattr(usage, 'model_dump') else vars(usage)
+        with self._lock:
+            stage_usage = self.llm.setdefault(stage, {field: 0 for field in TOKEN_FIELDS})
+            for field in TOKEN_FIELDS:
+                stage_usage[field] += int(usage.get(field) or 0)
+
+    def set(self, key: str, value) -> None:
+        """Attach an additional named measurement, e.g. cache statistics"""
+        with self._lock:
+            self.extra[key] = value
+
+    def totals(self) -> dict:
+        return {
+            field: sum(usage[field] for usage in self.llm.values())
+            for field in TOKEN_FIELDS
+        }
+
+    def to_record(self) -> dict:
+        return {
+            'run_id': self.run_id,
+            'topic': self.topic,
+            'started_at': self.started_at,
+            'wall_seconds': round(time.monotonic() - self._started, 3),
+            'outcome': self.outcome,
+            'stages': self.stages,
+            'tools': self.tools,
+            'llm': self.llm,
+            'llm_totals': self.totals(),
+            **self.extra
+        }
+
+    def summary(self) -> str:
+        record = self.to_record()
+        lines = [f"Run {self.run_id}: {record['outcome']} in {record['wall_seconds']:.1f}s"]
+        for name, stage in self.stages.items():
+            usage = self.llm.get(name, {})
+            lines.append(f"  {name:<10} {stage['seconds']:>8.1f}s  {stage['status']:<8}"
+                         f" llm calls={usage.get('successful_requests', 0)}"
+                         f" tokens={usage.get('total_tokens', 0)}")
+        for name, tool in self.tools.items():
+            lines.append(f"  tool {name:<15} calls={tool['calls']} errors={tool['errors']}"
+                         f" total={tool['seconds']:.2f}s max={tool['max_seconds']:.2f}s")
+        totals = record['llm_totals']
+        lines.append(f"  llm total calls={totals['successful_requests']} tokens={totals['total_tokens']}"
+                     f" (prompt={totals['prompt_tokens']}, completion={totals['completion_tokens']})")
+        return "\n".join(lines)
+
+    def emit(self, path: str = METRICS_FILE) -> dict:
+        """Append the run record to the JSON lines metrics file and log the summary"""
+        record = self.to_record()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, default=str) + '\n')
+        logger.info("Run metrics:\n%s", self.summary())
+        return record
+
+
+_active_run = None
+_active_run_lock = threading.Lock()
+
+
+def start_run(run_id: Optional[str] = None, topic: Optional[str] = None) -> RunMetrics:
+    """Make a new RunMetrics the target of tool measurements in this process"""
+    global _active_run
+    with _active_run_lock:
+        _active_run = RunMetrics(run_id, topic)
+        return _active_run
+
+
+def end_run(metrics: RunMetrics) -> None:
+    global _active_run
+    with _active_run_lock:
+        if _active_run is metrics:
+            _active_run = None
+
+
+def current_run() -> Optional[RunMetrics]:
+    return _active_run
+
+
+def timed_tool(name: str):
+    """Decorator recording the latency of a tool call in the active run, if any"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.monotonic()
+            ok = True
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                ok = False
+                raise
+            finally:
+                metrics = _active_run
+                if metrics is not None:
+                    metrics.record_tool(name, time.monotonic() - started, ok)
+        return wrapper
+    return decorator
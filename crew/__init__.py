@@ -3,5 +3,6 @@ Crew implementation for orchestrating the blog generation process
 """
 
 from .blog_crew import BlogCrew
+from .checkpoint import CheckpointStore
 
-__all__ = ['BlogCrew']
\ No newline at end of file
+__all__ = ['BlogCrew', 'CheckpointStore']
\ No newline at end of file
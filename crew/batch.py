@@ -0,0 +1,181 @@
+"""
+Generate blogs for many topics in parallel worker processes.
+
+    python -m crew.batch "Atlas Search" "Time Series Collections" --workers 2
+    python -m crew.batch --file topics.txt
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import List, Optional
+from config.logging_config import get_logging_pipeline, init_worker_logging, setup_logging
+
+logger = setup_logging(__name__)
+
+BATCHES_DIR = os.path.join('data', 'batches')
+
+
+def shared_store_env() -> dict:
+    """Absolute paths of the caches and knowledge base shared by all runs.
+
+    Worker processes change into their own working directory, so the stores'
+    relative default paths are resolved here, in the parent, and exported to
+    the workers' environment.
+    """
+    from agents.llm import DEFAULT_CACHE_PATH as LLM_CACHE_PATH
+    from tools.knowledge_base import DEFAULT_KB_PATH
+    from tools.scrape_cache import DEFAULT_CACHE_PATH as SCRAPE_CACHE_PATH
+    from tools.search_cache import DEFAULT_CACHE_PATH as SEARCH_CACHE_PATH
+
+    defaults = {
+        'SEARCH_CACHE_PATH': SEARCH_CACHE_PATH,
+        'SCRAPE_CACHE_PATH': SCRAPE_CACHE_PATH,
+        'KNOWLEDGE_BASE_PATH': DEFAULT_KB_PATH,
+        'LLM_CACHE_PATH': LLM_CACHE_PATH,
+    }
+    return {name: os.path.abspath(os.getenv(name) or default) for name, default in defaults.items()}
+
+
+def run_topic(topic: Optional[str], workdir: str, blogs_dir: str,
+              store_env: Optional[dict] = None) -> dict:
+    """Run one crew inside ``workdir`` so its artifacts don't collide with other runs.
+
+    Executed in a worker process; errors are reported in the result instead of
+    being raised so the batch summary always covers every topic. ``store_env``
+    points the worker at the shared caches before it changes directory.
+    """
+    from crew.blog_crew import BlogCrew
+
+    started = time.monotonic()
+    result = {'topic': topic, 'workdir': workdir, 'run_id': None, 'filepath': None, 'error': None}
+    crew = None
+    try:
+        os.environ.update(store_env or {})
+        os.makedirs(workdir, exist_ok=True)
+        os.chdir(workdir)
+        crew = BlogCrew(topic, blogs_dir=blogs_dir)
+        result['filepath'] = crew.run()
+        result['status'] = 'ok'
+    except Exception as e:
+        logger.error("Batch topic %s failed: %s", topic, str(e))
+        result['status'] = 'error'
+        result['error'] = f"{type(e).__name__}: {str(e)}"
+        result['traceback'] = traceback.format_exc()
+    finally:
+        if crew is not None:
+            result['run_id'] = crew.run_id
+        result['seconds'] = round(time.monotonic() - started, 2)
+    return result
+
+
+class BatchRunner:
+    """Runs independent BlogCrews for a list of topics with bounded process parallelism.
+
+    Every topic gets its own working directory under
+    ``data/batches/<batch_id>/`` for the per-stage artifacts and checkpoints,
+    while finished posts are saved to the shared blogs directory and the
+    search, scrape and LLM caches and the knowledge base are shared too.
+    """
+
+    def __init__(self, topics: List[Optional[str]], max_workers: int = 2,
+                 base_dir: str = BATCHES_DIR, blogs_dir: Optional[str] = None):
+        self.topics = topics
+        self.max_workers = max(1, max_workers)
+        self.batch_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+        self.batch_dir = os.path.abspath(os.path.join(base_dir, self.batch_id))
+        self.blogs_dir = os.path.abspath(blogs_dir or os.path.join('data', 'blogs'))
+
+    @staticmethod
+    def load_topics(path: str) -> List[str]:
+        """Read one topic per line, skipping blank lines and ``#`` comments"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+    @staticmethod
+    def slugify(topic: Optional[str]) -> str:
+        slug = re.sub(r'[^a-z0-9]+', '-', (topic or 'ai-chosen-topic').lower()).strip('-')
+        return slug[:60] or 'topic'
+
+    def run(self) -> dict:
+        logger.info("Starting batch %s: %d topics, %d workers",
+                    self.batch_id, len(self.topics), self.max_workers)
+        os.makedirs(self.batch_dir, exist_ok=True)
+        started = time.monotonic()
+
+        results = []
+        store_env = shared_store_env()
+        # spawn gives every worker a clean interpreter, independent of the parent's threads
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context,
+                                 initializer=init_worker_logging,
+                                 initargs=(get_logging_pipeline().worker_queue(),)) as executor:
+            futures = {}
+            for idx, topic in enumerate(self.topics, 1):
+                workdir = os.path.join(self.batch_dir, f"{idx:02d}-{self.slugify(topic)}")
+                futures[executor.submit(run_topic, topic, workdir, self.blogs_dir, store_env)] = (idx, topic)
+
+            for future in as_completed(futures):
+                idx, topic = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker process itself died
+                    result = {'topic': topic, 'status': 'error', 'error': str(e), 'seconds': None}
+                logger.info("Batch topic %s finished: %s", topic, result['status'])
+                results.append((idx, result))
+
+        results = [result for _, result in sorted(results, key=lambda item: item[0])]
+        summary = {
+            'batch_id': self.batch_id,
+            'workers': self.max_workers,
+            'wall_seconds': round(time.monotonic() - started, 2),
+            'succeeded': sum(1 for r in results if r['status'] == 'ok'),
+            'failed': sum(1 for r in results if r['status'] != 'ok'),
+            'results': results,
+        }
+        with open(os.path.join(self.batch_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+        logger.info("Batch %s finished in %.1fs: %d succeeded, %d failed",
+                    self.batch_id, summary['wall_seconds'], summary['succeeded'], summary['failed'])
+        return summary
+
+    @staticmethod
+    def format_summary(summary: dict) -> str:
+        lines = [f"Batch {summary['batch_id']} ({summary['workers']} workers, "
+                 f"{summary['wall_seconds']}s wall time)", ""]
+        for result in summary['results']:
+            seconds = f"{result['seconds']:.1f}s" if result.get('seconds') is not None else "-"
+            outcome = result.get('filepath') if result['status'] == 'ok' else result.get('error')
+            lines.append(f"  [{result['status']:>5}] {seconds:>8}  {result['topic'] or 'AI-chosen topic'}: {outcome}")
+        lines.append("")
+        lines.append(f"{summary['succeeded']} succeeded, {summary['failed']} failed")
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate blogs for several topics in parallel")
+    parser.add_argument('topics', nargs='*', help='Topics to write about')
+    parser.add_argument('--file', help='File with one topic per line')
+    parser.add_argument('--workers', type=int, default=2, help='Number of crews to run at once')
+    args = parser.parse_args()
+
+    topics = list(args.topics)
+    if args.file:
+        topics.extend(BatchRunner.load_topics(args.file))
+    if not topics:
+        parser.error("no topics given")
+
+    summary = BatchRunner(topics, max_workers=args.workers).run()
+    print(BatchRunner.format_summary(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,18 @@ from agents.planner import PlannerAgent
 from agents.researcher import ResearcherAgent
 from agents.writer import WriterAgent
 from agents.editor import EditorAgent
+from agents.outline import parse_outline
+from agents.llm import get_llm_cache
+from tools.web_tools import WebSearchTools
+from tools.dedup import reset_dedup_tracker
+from tools.vector_index import retrieve_for_sections
+from crew.checkpoint import CheckpointStore, RUNS_DIR
+from crew.compaction import ContextCompactor, count_tokens, strip_boilerplate
+from crew.sections import SectionWriter
+from crew.scheduler import DagScheduler
+from storage.blog_store import get_blog_store
+from config import metrics
+from config.env import env_flag
 from config.logging_config import setup_logging
 import os
 import traceback
@@ -11,9 +23,33 @@ import traceback
 logger = setup_logging(__name__)
 
 class BlogCrew:
-    def __init__(self, topic=None):
+    # Pipeline stages in execution order with the progress reported when each starts
+    STAGES = [
+        ('plan', "🤔 Planning blog structure...", 0.30),
+        ('research', "📚 Researching MongoDB documentation and best practices...", 0.45),
+        ('write', "✍️ Writing blog draft...", 0.65),
+        ('edit', "🔍 Reviewing and polishing the draft...", 0.80),
+    ]
+
+    # Markdown artifact each stage's task writes to the working directory
+    ARTIFACTS = {
+        'plan': "blog_outline.md",
+        'research': "research_content.md",
+        'write': "blog_draft.md",
+        'edit': "final_blog.md",
+    }
+
+    # Research shorter than this is passed to the writer whole
+    RETRIEVAL_MIN_CHARS = 4000
+
+    def __init__(self, topic=None, blogs_dir=None, runs_dir=None):
         logger.info("Initializing BlogCrew with topic: %s", topic if topic else "AI-chosen topic")
         self.topic = topic
+        self.blogs_dir = blogs_dir
+        self.runs_dir = runs_dir
+        self.run_id = None
+        self.metrics = None
+        self.compactor = ContextCompactor.from_env()
 
         logger.debug("Creating agents...")
         self.planner = PlannerAgent.create()
@@ -22,97 +58,349 @@ class BlogCrew:
         self.editor = EditorAgent.create()
         logger.info("All agents created successfully")
 
-    def create_tasks(self):
-        logger.info("Creating blog generation tasks")
-
-        # Task 1: Planning
-        logger.debug("Creating planning task")
-        planning_task = Task(
-            description=PlannerAgent.create_task_prompt(self.topic),
-            agent=self.planner,
-            expected_output="Detailed blog outline in markdown format",
-            output_file="blog_outline.md",
-            context=None
-        )
-        logger.info("Planning task created successfully")
-        logger.debug("Planning task output: %s", planning_task.output_file)
-
-        # Task 2: Research
-        logger.debug("Creating research task")
-        research_task = Task(
-            description=ResearcherAgent.create_task_prompt(planning_task.output_file),
-            agent=self.researcher,
-            expected_output="Comprehensive research content in markdown format",
-            output_file="research_content.md",
-            context=[planning_task]
-        )
+    def create_task(self, stage, outputs):
+        """Create the task for ``stage`` from the outputs of the stages before it"""
+        logger.debug("Creating %s task", stage)
 
-        # Task 3: Writing
-        logger.debug("Creating writing task")
-        writing_task = Task(
-            description=WriterAgent.create_task_prompt(
-                planning_task.output_file,
-                research_task.output_file
-            ),
-            agent=self.writer,
-            expected_output="Draft of the blog post in markdown format",
-            output_file="blog_draft.md",
-            context=[planning_task, research_task]
-        )
+        if stage == 'plan':
+            # Gather recent news up front so the planner doesn't spend iterations discovering it
+            news = None
+            if not self.topic:
+                logger.debug("Gathering recent news for AI-chosen topic")
+                news = WebSearchTools.get_latest_mongodb_news()
+
+            return Task(
+                description=PlannerAgent.create_task_prompt(self.topic, news),
+                agent=self.planner,
+                expected_output="Detailed blog outline in markdown format",
+                output_file=self.ARTIFACTS['plan']
+            )
+
+        if stage == 'research':
+            return Task(
+                description=ResearcherAgent.create_task_prompt(
+                    # The outline is agent text, so only duplicate citations are removed
+                    self.compactor.compact('research', outputs['plan'], boilerplate=False)
+                ),
+                agent=self.researcher,
+                expected_output="Comprehensive research content in markdown format",
+                output_file=self.ARTIFACTS['research']
+            )
+
+        if stage == 'write':
+            outline = outputs['plan']
+            research = outputs['research']
+            evidence = self.select_evidence(outline, strip_boilerplate(research))
+            if evidence:
+                evidence = self.compactor.compact_evidence('write', evidence, research,
+                                                           reserved=count_tokens(outline))
+            else:
+                research = self.compactor.compact('write', research, reserved=count_tokens(outline))
+            return Task(
+                description=WriterAgent.create_task_prompt(outline, research, evidence),
+                agent=self.writer,
+                expected_output="Draft of the blog post in markdown format",
+                output_file=self.ARTIFACTS['write']
+            )
+
+        if stage == 'edit':
+            return Task(
+                description=EditorAgent.create_task_prompt(
+                    # The editor returns the whole draft, so only duplicate citations are removed
+                    self.compactor.compact('edit', outputs['write'], truncate=False, boilerplate=False),
+                    self.extract_title(outputs['plan'])
+                ),
+                agent=self.editor,
+                expected_output="Finalized blog post in markdown format",
+                output_file=self.ARTIFACTS['edit']
+            )
+
+        raise ValueError(f"Unknown pipeline stage: {stage}")
+
+    def select_evidence(self, outline, research):
+        """Retrieve the research chunks relevant to each outline section.
+
+        Returns None when the whole research should be passed instead: when
+        retrieval is disabled, the research is short, or retrieval would not
+        shrink it.
+        """
+        if not env_flag('WRITER_RETRIEVAL', True) or len(research) < self.RETRIEVAL_MIN_CHARS:
+            return None
+        try:
+            sections = parse_outline(outline)
+            evidence = retrieve_for_sections(
+                sections,
+                research,
+                k=int(os.getenv('WRITER_RETRIEVAL_TOP_K', 4)),
+                quantize=env_flag('VECTOR_INDEX_QUANTIZE')
+            )
+        except Exception as e:
+            logger.warning("Evidence retrieval failed, passing the whole research: %s", str(e))
+            return None
+
+        evidence_chars = sum(len(chunk) for section in evidence for chunk in section['chunks'])
+        logger.info("Selected %d characters of evidence for %d sections from %d characters of research",
+                    evidence_chars, len(sections), len(research))
+        if self.metrics is not None:
+            self.metrics.set('retrieval', {
+                'sections': len(sections),
+                'research_chars': len(research),
+                'evidence_chars': evidence_chars,
+            })
+        return evidence if evidence_chars < len(research) else None
+
+    def write_sections(self, outputs):
+        """Write the outline's sections concurrently and stitch them into the draft.
+
+        Returns None when the outline has fewer than two sections, so the
+        draft is written in a single pass instead.
+        """
+        outline = outputs['plan']
+        sections = parse_outline(outline)
+        if len(sections) < 2:
+            logger.info("Outline has no sections to write in parallel, writing in a single pass")
+            return None
+
+        research = outputs['research']
+        evidence = self.select_evidence(outline, strip_boilerplate(research))
+        if evidence:
+            evidence = self.compactor.compact_evidence('write', evidence, research)
+            slices = ["\n\n".join(section['chunks']) for section in evidence]
+        else:
+            research = self.compactor.compact('write', research)
+            slices = [research] * len(sections)
+
+        writer = SectionWriter(metrics=self.metrics)
+        draft = writer.write(self.extract_title(outline), sections, slices, agent=self.writer)
+        with open(self.ARTIFACTS['write'], 'w', encoding='utf-8') as f:
+            f.write(draft)
+        return draft
+
+    def kickoff(self, task, stage):
+        """Run ``task`` as its own crew, recording its LLM usage under ``stage``"""
+        crew = Crew(agents=[task.agent], tasks=[task])
+        result = crew.kickoff()
+        if self.metrics is not None:
+            self.metrics.record_llm_usage(
+                stage, getattr(result, 'token_usage', None) or getattr(crew, 'usage_metrics', None)
+            )
+        return str(result)  # Convert CrewOutput to string
 
-        # Task 4: Editing
-        logger.debug("Creating editing task")
-        editing_task = Task(
-            description=EditorAgent.create_task_prompt(
-                writing_task.output_file,
-                self.extract_title(planning_task.output_file)
+    def run_stage(self, stage, outputs):
+        """Run a single stage as its own crew and return its output text"""
+        if stage == 'write' and os.getenv('WRITER_MODE', 'single').lower() == 'sections':
+            draft = self.write_sections(outputs)
+            if draft is not None:
+                return draft
+
+        task = self.create_task(stage, outputs)
+        logger.info("Kicking off %s stage", stage)
+        return self.kickoff(task, stage)
+
+    def restore_or_run(self, stage, outputs, checkpoints, callback=None):
+        """Return the checkpointed output of ``stage`` or run and checkpoint it"""
+        message, progress = next((msg, prog) for name, msg, prog in self.STAGES if name == stage)
+        saved = checkpoints.load(stage)
+        if saved is not None:
+            logger.info("Skipping %s stage, restored from checkpoint", stage)
+            if callback:
+                callback(f"⏭️ Restored {stage} stage from checkpoint", progress)
+            self.metrics.skip_stage(stage)
+            return saved
+
+        if callback:
+            callback(message, progress)
+        with self.metrics.stage(stage):
+            output = self.run_stage(stage, outputs)
+        checkpoints.save(stage, output, self.ARTIFACTS[stage])
+        return output
+
+    def research_section(self, title, section):
+        """Research a single outline section with its own researcher"""
+        outline = f"# {title}\n\n## {section['title']}\n{section['text']}"
+        task = Task(
+            description=ResearcherAgent.create_task_prompt(
+                self.compactor.compact('research', outline, boilerplate=False)
             ),
-            agent=self.editor,
-            expected_output="Finalized blog post in markdown format",
-            output_file="final_blog.md",
-            context=[writing_task]
+            agent=ResearcherAgent.create(),
+            expected_output=f"Research for the \"{section['title']}\" section in markdown format"
         )
+        logger.info("Researching section: %s", section['title'])
+        return self.kickoff(task, 'research')
+
+    def run_dag(self, checkpoints, callback=None):
+        """Run the pipeline as a graph of section-level steps.
+
+        Once the outline is known, every section gets a research step and a
+        writing step that starts as soon as that section's research lands, so
+        research of later sections overlaps writing of earlier ones. The
+        section outputs are joined into the research and draft checkpoints
+        and the draft is edited as usual. Outlines with fewer than two
+        sections, and runs resumed after research, use whole-stage steps.
+        Returns the stage outputs; the trace is saved as ``trace.json`` in the
+        run's checkpoint directory.
+        """
+        scheduler = DagScheduler(max_workers=int(os.getenv('PIPELINE_MAX_WORKERS', 4)))
 
-        tasks = [planning_task, research_task, writing_task, editing_task]
-        logger.info("Created %d tasks successfully", len(tasks))
-        return tasks
+        def stage_step(stage):
+            return lambda results: self.restore_or_run(stage, results, checkpoints, callback)
 
-    def run(self, callback=None):
+        def plan_step(results):
+            outline = self.restore_or_run('plan', results, checkpoints, callback)
+            sections = parse_outline(outline)
+            if len(sections) < 2 or checkpoints.completed_stages() != ['plan']:
+                scheduler.add('research', stage_step('research'), ['plan'])
+                scheduler.add('write', stage_step('write'), ['research'])
+            else:
+                self.add_section_steps(scheduler, outline, sections, checkpoints, callback)
+            scheduler.add('edit', stage_step('edit'), ['write'])
+            return outline
+
+        scheduler.add('plan', plan_step)
         try:
-            if callback:
-                callback("Creating blog generation tasks...", 0.15)
-            tasks = self.create_tasks()
+            results = scheduler.run()
+        finally:
+            report = scheduler.report()
+            logger.info("Pipeline trace (parallelism %.2f):\n%s",
+                        report['parallelism'], scheduler.format_trace())
+            self.metrics.set('schedule', {key: report[key] for key in
+                                          ('mode', 'wall_seconds', 'busy_seconds', 'parallelism', 'overlaps')})
+            try:
+                scheduler.save_trace(os.path.join(checkpoints.run_dir, 'trace.json'))
+            except OSError as e:
+                logger.warning("Could not write pipeline trace: %s", str(e))
+
+        for group in ('research', 'write'):
+            span = report['groups'].get(group)
+            if span and span['steps'] > 1:
+                self.metrics.record_stage(group, span['seconds'])
+        return {stage: results[stage] for stage, _, _ in self.STAGES}
+
+    def add_section_steps(self, scheduler, outline, sections, checkpoints, callback=None):
+        """Add per-section research and writing steps plus the steps joining them"""
+        title = self.extract_title(outline)
+        writer = SectionWriter(metrics=self.metrics)
+        words = writer.section_words(sections)
+        if callback:
+            callback(f"📚 Researching and writing {len(sections)} sections...", 0.45)
 
-            crew = Crew(
-                agents=[self.planner, self.researcher, self.writer, self.editor],
-                tasks=tasks,
+        def write_step(idx):
+            def step(results):
+                research = self.compactor.compact('write', results[f"research:{idx}"])
+                return writer.write_section(title, sections, idx, research, words[idx])
+            return step
+
+        for idx, section in enumerate(sections):
+            scheduler.add(f"research:{idx}", lambda results, section=section: self.research_section(title, section),
+                          ['plan'], group='research')
+            scheduler.add(f"write:{idx}", write_step(idx), [f"research:{idx}"], group='write')
+
+        def join_research(results):
+            research = "\n\n".join(
+                f"## {section['title']}\n\n{results[f'research:{idx}']}" for idx, section in enumerate(sections)
             )
+            with open(self.ARTIFACTS['research'], 'w', encoding='utf-8') as f:
+                f.write(research)
+            checkpoints.save('research', research, self.ARTIFACTS['research'])
+            return research
 
+        def stitch(results):
             if callback:
-                callback("Starting crew tasks execution...", 0.30)
-            logger.info("Kicking off crew tasks")
-            result = crew.kickoff()
+                callback("✍️ Stitching the sections together...", 0.75)
+            draft = writer.stitch(title, [results[f"write:{idx}"] for idx in range(len(sections))], self.writer)
+            writer.record(sections, scheduler.max_workers)
+            with open(self.ARTIFACTS['write'], 'w', encoding='utf-8') as f:
+                f.write(draft)
+            checkpoints.save('write', draft, self.ARTIFACTS['write'])
+            return draft
+
+        research_steps = [f"research:{idx}" for idx in range(len(sections))]
+        write_steps = [f"write:{idx}" for idx in range(len(sections))]
+        scheduler.add('research', join_research, research_steps, group='research')
+        scheduler.add('write', stitch, ['research'] + write_steps, group='write')
+
+    def run(self, callback=None, resume=None):
+        """Generate a blog post, checkpointing every stage.
+
+        Pass the run ID of a failed run as ``resume`` to skip the stages that
+        already completed. Returns the ID of the saved post. The run ID of the
+        current run is available as ``self.run_id``; per-stage latency, tool
+        and token metrics of the run are appended to ``logs/metrics.jsonl``
+        and kept in ``self.metrics``.
+        """
+        try:
+            checkpoints = CheckpointStore(resume, base_dir=self.runs_dir or RUNS_DIR)
+            if resume:
+                if not checkpoints.exists():
+                    raise ValueError(f"No checkpoints found for run {resume}")
+                self.topic = self.topic or checkpoints.topic()
+                logger.info("Resuming run %s, completed stages: %s",
+                            resume, checkpoints.completed_stages())
+            checkpoints.start(self.topic)
+            self.run_id = checkpoints.run_id
+            self.metrics = metrics.start_run(self.run_id, self.topic)
+            self.compactor.metrics = self.metrics
+            reset_dedup_tracker()
+
+            if callback:
+                callback(f"Starting run {self.run_id}...", 0.15)
+
+            outputs = {}
+            if os.getenv('PIPELINE_MODE', 'sequential').lower() == 'dag':
+                outputs = self.run_dag(checkpoints, callback)
+            else:
+                for stage, _, _ in self.STAGES:
+                    outputs[stage] = self.restore_or_run(stage, outputs, checkpoints, callback)
+
+            post_id = checkpoints.saved_blog()
+            if post_id and get_blog_store(self.blogs_dir).exists(post_id):
+                logger.info("Run %s was already saved as: %s", self.run_id, post_id)
+                self.finish_metrics('ok')
+                return post_id
 
             # Save the final blog
             if callback:
                 callback("Finalizing and saving blog...", 0.95)
                 logger.debug("Callback executed: Saving final blog")
 
-            title = self.extract_title(str(result))  # Convert CrewOutput to string
+            result = outputs['edit']
+            title = self.extract_title(result)
             logger.info("Extracted blog title: %s", title)
 
-            filepath = EditorAgent.save_blog(result, title)
-            logger.info("Blog saved successfully at: %s", filepath)
+            artifacts = {
+                'outline': outputs['plan'],
+                'research': outputs['research'],
+                'draft': outputs['write'],
+            }
+            post_id = EditorAgent.save_blog(result, title, self.blogs_dir, artifacts, self.run_id)
+            checkpoints.mark_saved(post_id)
+            logger.info("Blog saved successfully as: %s", post_id)
+            self.finish_metrics('ok')
 
-            return filepath
+            return post_id
 
         except Exception as e:
             logger.error("Error in blog creation process: %s", str(e))
+            self.finish_metrics('error')
             if callback:
                 callback(f"Error occurred: {str(e)}", 1.0)
             traceback.print_exc()
             raise
 
+    def finish_metrics(self, outcome):
+        """Emit the metrics record of the current run"""
+        if self.metrics is None or self.metrics.outcome is not None:
+            return
+        self.metrics.outcome = outcome
+        self.metrics.set('cache', WebSearchTools.cache_stats())
+        self.metrics.set('llm_cache', get_llm_cache().stats())
+        try:
+            self.metrics.emit()
+        except OSError as e:
+            logger.warning("Could not write run metrics: %s", str(e))
+        finally:
+            metrics.end_run(self.metrics)
+
     @staticmethod
     def extract_title(content):
         """Extract the blog title from the content"""
@@ -139,24 +427,19 @@ class BlogCrew:
             return "MongoDB Technical Blog"
 
     @staticmethod
-    def list_blogs():
-        """List all generated blogs"""
-        logger.info("Listing all generated blogs")
+    def list_blogs(limit=None, offset=0):
+        """List generated blogs from the storage backend, newest first.
 
-        blogs_dir = os.path.join('data', 'blogs')
-        if not os.path.exists(blogs_dir):
-            logger.debug("Blogs directory does not exist: %s", blogs_dir)
-            return []
+        Returns dicts with ``id``, ``title``, ``date``, ``tags`` and
+        ``description``.
+        """
+        logger.info("Listing all generated blogs")
 
         try:
-            blog_files = [
-                os.path.join(blogs_dir, f)
-                for f in os.listdir(blogs_dir)
-                if f.endswith('.md')
-            ]
-            logger.info("Found %d blog files", len(blog_files))
-            return blog_files
+            blogs = get_blog_store().list(limit=limit, offset=offset)
+            logger.info("Found %d blog files", len(blogs))
+            return blogs
 
         except Exception as e:
             logger.error("Error listing blogs: %s", str(e))
-            return []
\ No newline at end of file
+            return []
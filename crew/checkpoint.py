@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import List, Optional
+from config.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+RUNS_DIR = os.path.join('data', 'runs')
+
+
+class CheckpointStore:
+    """Stage outputs of one blog generation run, persisted under ``data/runs/<run_id>``.
+
+    Every completed stage is written to ``<stage>.md`` and recorded in
+    ``manifest.json`` together with the task artifact it produced, so a failed
+    run can be resumed from the first stage that did not finish. Manifest
+    updates are serialized, since pipeline steps may finish concurrently.
+    """
+
+    def __init__(self, run_id: Optional[str] = None, base_dir: str = RUNS_DIR):
+        self.run_id = run_id or self.new_run_id()
+        self.run_dir = os.path.join(base_dir, self.run_id)
+        self.manifest_path = os.path.join(self.run_dir, 'manifest.json')
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_run_id() -> str:
+        return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+    def exists(self) -> bool:
+        return os.path.exists(self.manifest_path)
+
+    def _write(self, path: str, content: str) -> None:
+        """Write atomically so a crash never leaves a half-written checkpoint"""
+        os.makedirs(self.run_dir, exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def load_manifest(self) -> dict:
+        if not self.exists():
+            return {'run_id': self.run_id, 'stages': {}}
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: dict) -> None:
+        manifest['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        self._write(self.manifest_path, json.dumps(manifest, indent=2))
+
+    def start(self, topic: Optional[str]) -> None:
+        """Record the run parameters, keeping those of an existing run"""
+        with self._lock:
+            manifest = self.load_manifest()
+            manifest.setdefault('topic', topic)
+            manifest.setdefault('created_at', datetime.now().isoformat(timespec='seconds'))
+            self._save_manifest(manifest)
+        logger.info("Checkpointing run %s in %s", self.run_id, self.run_dir)
+
+    def topic(self) -> Optional[str]:
+        return self.load_manifest().get('topic')
+
+    def completed_stages(self) -> List[str]:
+        return list(self.load_manifest()['stages'])
+
+    def load(self, stage: str) -> Optional[str]:
+        """Return the saved output of ``stage`` or None if it has not completed"""
+        if stage not in self.load_manifest()['stages']:
+            return None
+        with open(os.path.join(self.run_dir, f"{stage}.md"), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def save(self, stage: str, output: str, artifact: Optional[str] = None) -> None:
+        """Persist the output of a completed stage"""
+        self._write(os.path.join(self.run_dir, f"{stage}.md"), output)
+        with self._lock:
+            manifest = self.load_manifest()
+            manifest['stages'][stage] = {
+                'completed_at': datetime.now().isoformat(timespec='seconds'),
+                'artifact': artifact,
+                'chars': len(output)
+            }
+            self._save_manifest(manifest)
+        logger.debug("Checkpointed stage %s of run %s", stage, self.run_id)
+
+    def saved_blog(self) -> Optional[str]:
+        return self.load_manifest().get('blog_path')
+
+    def mark_saved(self, filepath: str) -> None:
+        with self._lock:
+            manifest = self.load_manifest()
+            manifest['blog_path'] = filepath
+            self._save_manifest(manifest)
@@ -0,0 +1,197 @@
+import os
+import re
+import threading
+from collections import Counter
+from typing import List, Optional
+from config.logging_config import setup_logging
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = setup_logging(__name__)
+
+# Token budgets of the upstream context passed into each stage's prompt
+DEFAULT_BUDGETS = {
+    'research': 2000,
+    'write': 6000,
+    'edit': 8000,
+}
+
+SOURCE_LINE = re.compile(r'^\s*(?:\*\*)?Source:?(?:\*\*)?:?\s*<?(https?://\S+?)>?\s*$', re.I)
+NAV_LINE = re.compile(
+    r'^\s*(?:skip to (?:main )?content|sign in|sign up|log ?in|menu|search|home|share(?: this)?|'
+    r'subscribe.*|accept (?:all )?cookies.*|.*cookie (?:policy|settings).*|all rights reserved.*|'
+    r'©.*|copyright.*|back to top|table of contents|on this page|was this page helpful\??|'
+    r'previous|next|related (?:articles|posts)|follow us.*)\s*$',
+    re.I
+)
+# Short lines repeated this often are navigation or page chrome
+REPEATED_LINE_MIN = 3
+REPEATED_LINE_MAX_CHARS = 60
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Token count with tiktoken when installed, otherwise estimated at four characters per token"""
+    global _encoding
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding('cl100k_base')
+        return len(_encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def strip_boilerplate(text: str, sources_only: bool = False) -> str:
+    """Remove repeated ``Source:`` headers, navigation lines and page chrome.
+
+    The first ``Source:`` line of every URL is kept as a citation. Fenced
+    code blocks are left untouched. With ``sources_only`` only the repeated
+    ``Source:`` lines are removed, for text written by the agents, where
+    short repeated lines such as "**Output:**" are content.
+    """
+    lines = text.splitlines()
+    counts = Counter(line.strip() for line in lines
+                     if line.strip() and len(line.strip()) <= REPEATED_LINE_MAX_CHARS)
+
+    kept = []
+    seen_sources = set()
+    in_code = False
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith('```'):
+            in_code = not in_code
+        if in_code or stripped.startswith('```'):
+            kept.append(line)
+            continue
+
+        source = SOURCE_LINE.match(stripped)
+        if source:
+            if source.group(1) in seen_sources:
+                continue
+            seen_sources.add(source.group(1))
+        elif sources_only:
+            pass
+        elif NAV_LINE.match(stripped):
+            continue
+        elif (counts[stripped] >= REPEATED_LINE_MIN and not stripped.startswith('#')
+              and not re.fullmatch(r'[-*_=|: ]+', stripped)):
+            continue
+
+        # Collapse runs of blank lines
+        if not stripped and kept and not kept[-1].strip():
+            continue
+        kept.append(line)
+    return '\n'.join(kept).strip()
+
+
+def truncate_to_budget(text: str, max_tokens: int) -> str:
+    """Keep whole paragraphs from the start of ``text`` until ``max_tokens`` is reached"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    kept = []
+    used = 0
+    for paragraph in re.split(r'\n\s*\n', text):
+        tokens = count_tokens(paragraph)
+        if used + tokens > max_tokens:
+            if not kept:
+                # A single oversized paragraph is cut at the estimated character budget
+                kept.append(paragraph[:max_tokens * 4])
+            break
+        kept.append(paragraph)
+        used += tokens
+    return '\n\n'.join(kept)
+
+
+class ContextCompactor:
+    """Enforces a token budget on the upstream context of every pipeline stage.
+
+    Boilerplate is stripped from the research inputs; research that still
+    exceeds the writing budget is cut per outline section (keeping each
+    section's best evidence) or by whole paragraphs. The draft given to the
+    editor only loses repeated ``Source:`` lines and is never truncated,
+    since the editor returns it in full. Tokens before and after compaction are reported per stage.
+    """
+
+    def __init__(self, budgets: Optional[dict] = None, metrics=None):
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.metrics = metrics
+        self.report = {}
+        # Section steps of the DAG pipeline compact concurrently
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, metrics=None) -> 'ContextCompactor':
+        """Read ``CONTEXT_BUDGET_<STAGE>`` token budgets from the environment"""
+        budgets = {
+            stage: int(os.getenv(f"CONTEXT_BUDGET_{stage.upper()}", default))
+            for stage, default in DEFAULT_BUDGETS.items()
+        }
+        return cls(budgets, metrics)
+
+    def _record(self, stage: str, before: int, after: int) -> None:
+        with self._lock:
+            entry = self.report.setdefault(stage, {'tokens_before': 0, 'tokens_after': 0, 'tokens_saved': 0})
+            entry['tokens_before'] += before
+            entry['tokens_after'] += after
+            entry['tokens_saved'] += before - after
+            if self.metrics is not None:
+                self.metrics.set('compaction', self.report)
+        logger.info("Compacted %s context from %d to %d tokens", stage, before, after)
+
+    def compact(self, stage: str, text: str, truncate: bool = True, reserved: int = 0,
+                boilerplate: bool = True) -> str:
+        """Strip boilerplate from ``text`` and, if ``truncate``, cut it to the stage budget.
+
+        ``reserved`` tokens of the budget are kept for the rest of the prompt
+        (e.g. the outline). Without ``boilerplate`` only repeated ``Source:``
+        lines are removed.
+        """
+        before = count_tokens(text)
+        compacted = strip_boilerplate(text, sources_only=not boilerplate)
+        budget = max(0, self.budgets.get(stage, 0) - reserved)
+        if budget and count_tokens(compacted) > budget:
+            if truncate:
+                compacted = truncate_to_budget(compacted, budget)
+            else:
+                logger.warning("%s context is %d tokens, over its budget of %d",
+                               stage, count_tokens(compacted), budget)
+        self._record(stage, before, count_tokens(compacted))
+        return compacted
+
+    def compact_evidence(self, stage: str, evidence: List[dict], research: str, reserved: int = 0) -> List[dict]:
+        """Cut per-section evidence, best chunks first, to an equal share of the stage budget.
+
+        ``research`` is the full text the evidence was retrieved from, so the
+        report covers both retrieval and trimming. ``reserved`` tokens of the
+        budget are kept for the rest of the prompt (e.g. the outline).
+        """
+        budget = self.budgets.get(stage)
+        before = count_tokens(research)
+        if not budget or not evidence:
+            self._record(stage, before, sum(count_tokens(chunk) for section in evidence
+                                            for chunk in section['chunks']))
+            return evidence
+
+        share = max(0, budget - reserved) // len(evidence)
+        compacted = []
+        for section in evidence:
+            chunks = []
+            used = 0
+            for chunk in section['chunks']:
+                tokens = count_tokens(chunk)
+                if used + tokens > share and chunks:
+                    break
+                chunk = chunk if used + tokens <= share else chunk[:share * 4]
+                if not chunk:
+                    # No budget left; the writer prompt falls back to the outline
+                    break
+                chunks.append(chunk)
+                used += min(tokens, share)
+            compacted.append({**section, 'chunks': chunks})
+
+        after = sum(count_tokens(chunk) for section in compacted for chunk in section['chunks'])
+        self._record(stage, before, after)
+        return compacted
@@ -0,0 +1,254 @@
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import List, Optional
+from crew.batch import shared_store_env
+from crew.checkpoint import RUNS_DIR
+from config.logging_config import get_logging_pipeline, init_worker_logging, setup_logging
+
+logger = setup_logging(__name__)
+
+JOBS_DIR = os.path.join('data', 'jobs')
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+class JobQueueFull(Exception):
+    """Raised when too many generation jobs are already queued or running"""
+
+
+class JobStore:
+    """SQLite-backed record of generation jobs and their progress events.
+
+    Shared by the UI process and the worker processes, so progress reported by
+    ``BlogCrew.run`` in a worker is visible to every Streamlit session.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.abspath(os.path.join(JOBS_DIR, 'jobs.sqlite'))
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    topic TEXT,
+                    resume TEXT,
+                    status TEXT NOT NULL,
+                    progress REAL NOT NULL DEFAULT 0,
+                    message TEXT,
+                    run_id TEXT,
+                    filepath TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS job_events (
+                    job_id TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    message TEXT NOT NULL,
+                    progress REAL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs (created_at DESC)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_job_events_job ON job_events (job_id, created_at)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create(self, topic: Optional[str], resume: Optional[str] = None) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, topic, resume, status, message, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, topic, resume, 'queued', 'Waiting for a free worker...', time.time())
+            )
+        return job_id
+
+    def update(self, job_id: str, **fields) -> None:
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def add_event(self, job_id: str, message: str, progress: Optional[float] = None) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO job_events (job_id, created_at, message, progress) VALUES (?, ?, ?, ?)",
+                (job_id, time.time(), message, progress)
+            )
+            if progress is None:
+                conn.execute("UPDATE jobs SET message = ? WHERE id = ?", (message, job_id))
+            else:
+                conn.execute("UPDATE jobs SET message = ?, progress = ? WHERE id = ?",
+                             (message, progress, job_id))
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list(self, limit: int = 20) -> List[dict]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def events(self, job_id: str) -> List[dict]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT created_at, message, progress FROM job_events WHERE job_id = ? ORDER BY created_at",
+                (job_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count_active(self) -> int:
+        with self._connect() as conn:
+            (count,) = conn.execute(
+                f"SELECT COUNT(*) FROM jobs WHERE status IN ({', '.join('?' * len(ACTIVE_STATUSES))})",
+                ACTIVE_STATUSES
+            ).fetchone()
+        return count
+
+    def interrupt_active(self) -> int:
+        """Mark jobs left active by a previous process as interrupted"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET status = 'interrupted', finished_at = ?, "
+                f"message = 'Interrupted by a restart; resume it with its run ID' "
+                f"WHERE status IN ({', '.join('?' * len(ACTIVE_STATUSES))})",
+                (time.time(), *ACTIVE_STATUSES)
+            )
+        return cursor.rowcount
+
+
+def run_job(job_id: str, store_path: str, topic: Optional[str], resume: Optional[str],
+            workdir: str, blogs_dir: str, runs_dir: str, store_env: Optional[dict] = None) -> None:
+    """Run one generation job in a worker process, reporting progress to the job store"""
+    from crew.blog_crew import BlogCrew
+
+    store = JobStore(store_path)
+    store.update(job_id, status='running', started_at=time.time())
+    crew = None
+    try:
+        # Each job gets its own working directory for the per-stage artifacts,
+        # the caches and knowledge base stay shared
+        os.environ.update(store_env or {})
+        os.makedirs(workdir, exist_ok=True)
+        os.chdir(workdir)
+        crew = BlogCrew(topic, blogs_dir=blogs_dir, runs_dir=runs_dir)
+
+        def report(message, progress=None):
+            store.add_event(job_id, message, progress)
+            if crew.run_id:
+                store.update(job_id, run_id=crew.run_id)
+
+        filepath = crew.run(callback=report, resume=resume)
+        store.add_event(job_id, "✅ Blog generated successfully!", 1.0)
+        if crew.metrics is not None:
+            store.add_event(job_id, crew.metrics.summary())
+        store.update(job_id, status='succeeded', filepath=filepath, finished_at=time.time())
+    except Exception as e:
+        logger.error("Job %s failed: %s", job_id, str(e))
+        store.update(
+            job_id,
+            status='failed',
+            error=f"{type(e).__name__}: {str(e)}\n{traceback.format_exc()}",
+            run_id=crew.run_id if crew is not None else None,
+            finished_at=time.time()
+        )
+
+
+class JobRunner:
+    """Runs blog generation jobs in background worker processes.
+
+    ``submit`` returns immediately with a job ID; progress events from
+    ``BlogCrew.run`` are persisted in the JobStore, so they can be polled from
+    any Streamlit rerun or session. At most ``max_workers`` jobs run at once
+    and at most ``max_pending`` may be queued or running.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8, store: Optional[JobStore] = None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.store = store or JobStore()
+        self.jobs_dir = os.path.dirname(self.store.path)
+        self.blogs_dir = os.path.abspath(os.path.join('data', 'blogs'))
+        self.runs_dir = os.path.abspath(RUNS_DIR)
+        self.store_env = shared_store_env()
+        self._lock = threading.Lock()
+
+        interrupted = self.store.interrupt_active()
+        if interrupted:
+            logger.warning("Marked %d jobs from a previous process as interrupted", interrupted)
+
+        # spawn starts workers without the parent's threads and locks. Workers are reused
+        # across jobs: every run resets its duplicate tracker and metrics, while the
+        # caches, knowledge base and LLM cache stay shared on purpose
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_worker_logging,
+            initargs=(get_logging_pipeline().worker_queue(),)
+        )
+        logger.info("Job runner started with %d workers", max_workers)
+
+    def submit(self, topic: Optional[str] = None, resume: Optional[str] = None) -> str:
+        with self._lock:
+            if self.store.count_active() >= self.max_pending:
+                raise JobQueueFull(f"{self.max_pending} jobs are already queued or running")
+            job_id = self.store.create(topic, resume)
+
+        workdir = os.path.join(self.jobs_dir, job_id)
+        future = self.executor.submit(run_job, job_id, self.store.path, topic, resume,
+                                      workdir, self.blogs_dir, self.runs_dir, self.store_env)
+        future.add_done_callback(lambda f: self._check_worker(job_id, f))
+        logger.info("Submitted job %s for topic: %s", job_id, topic if topic else "AI-chosen topic")
+        return job_id
+
+    def _check_worker(self, job_id: str, future) -> None:
+        """Record jobs whose worker process died before it could report an outcome"""
+        error = future.exception()
+        if error is not None:
+            logger.error("Worker for job %s crashed: %s", job_id, str(error))
+            self.store.update(job_id, status='failed', error=str(error), finished_at=time.time())
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.store.get(job_id)
+
+    def list(self, limit: int = 20) -> List[dict]:
+        return self.store.list(limit)
+
+    def events(self, job_id: str) -> List[dict]:
+        return self.store.events(job_id)
+
+
+_job_runner = None
+_job_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """Return the process-wide job runner, creating it on first use"""
+    global _job_runner
+    with _job_runner_lock:
+        if _job_runner is None:
+            _job_runner = JobRunner(
+                max_workers=int(os.getenv('JOB_MAX_WORKERS', 2)),
+                max_pending=int(os.getenv('JOB_MAX_PENDING', 8))
+            )
+        return _job_runner
@@ -0,0 +1,179 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence
+from config.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+
+def _union(intervals: List[tuple]) -> List[tuple]:
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _overlap(first: List[tuple], second: List[tuple]) -> float:
+    """Time covered by both of two interval unions"""
+    return sum(max(0.0, min(a_end, b_end) - max(a_start, b_start))
+               for a_start, a_end in first for b_start, b_end in second)
+
+
+class DagScheduler:
+    """Runs pipeline steps as soon as the steps they depend on have finished.
+
+    Steps are named functions receiving the dict of finished results. A
+    running step may ``add`` further steps, e.g. one research and one writing
+    step per outline section once the outline is known, so the graph can grow
+    at section granularity while it runs. With ``sequential`` the ready steps
+    run one at a time in the order they were added, which is the fallback
+    when no concurrency is wanted.
+
+    Every step's start and end are traced; ``report`` summarizes how much the
+    step groups (e.g. ``research`` and ``write``) overlapped.
+    """
+
+    def __init__(self, max_workers: int = 4, sequential: bool = False):
+        self.max_workers = max(1, max_workers)
+        self.sequential = sequential or self.max_workers == 1
+        self.results = {}
+        self.trace = []
+        self._steps: Dict[str, dict] = {}
+        self._started = set()
+        self._lock = threading.Lock()
+        self._clock = None
+
+    def add(self, name: str, func: Callable[[dict], object], deps: Sequence[str] = (),
+            group: Optional[str] = None) -> None:
+        """Add a step; it runs once every step named in ``deps`` has a result"""
+        with self._lock:
+            if name in self._steps:
+                raise ValueError(f"Duplicate pipeline step: {name}")
+            self._steps[name] = {'func': func, 'deps': list(deps), 'group': group or name}
+
+    def _ready(self) -> List[str]:
+        with self._lock:
+            return [
+                name for name, step in self._steps.items()
+                if name not in self._started and all(dep in self.results for dep in step['deps'])
+            ]
+
+    def _execute(self, name: str) -> None:
+        step = self._steps[name]
+        started = time.monotonic()
+        status = 'ok'
+        try:
+            value = step['func'](self.results)
+            with self._lock:
+                self.results[name] = value
+        except Exception:
+            status = 'error'
+            raise
+        finally:
+            with self._lock:
+                self.trace.append({
+                    'step': name,
+                    'group': step['group'],
+                    'start': round(started - self._clock, 3),
+                    'end': round(time.monotonic() - self._clock, 3),
+                    'status': status,
+                    'thread': threading.current_thread().name,
+                })
+
+    def run(self) -> dict:
+        """Run every step and return the results by step name; the first failure is raised"""
+        self._clock = time.monotonic()
+        if self.sequential:
+            while True:
+                ready = self._ready()
+                if not ready:
+                    break
+                self._started.add(ready[0])
+                self._execute(ready[0])
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pipeline') as pool:
+                running = {}
+                while True:
+                    for name in self._ready():
+                        self._started.add(name)
+                        running[pool.submit(self._execute, name)] = name
+                    if not running:
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        del running[future]
+                        error = future.exception()
+                        if error is not None:
+                            # Let running steps finish but start no new ones
+                            for pending in running:
+                                pending.cancel()
+                            raise error
+
+        missing = [name for name in self._steps if name not in self.results]
+        if missing:
+            raise RuntimeError(f"Pipeline steps with unmet dependencies: {', '.join(missing)}")
+        return self.results
+
+    def report(self) -> dict:
+        """Wall time, busy time, achieved parallelism and overlap between step groups"""
+        wall = max((entry['end'] for entry in self.trace), default=0.0)
+        busy = sum(entry['end'] - entry['start'] for entry in self.trace)
+        groups = {}
+        for entry in sorted(self.trace, key=lambda item: item['start']):
+            span = groups.setdefault(entry['group'], {'start': entry['start'], 'end': entry['end'], 'steps': 0})
+            span['start'] = min(span['start'], entry['start'])
+            span['end'] = max(span['end'], entry['end'])
+            span['steps'] += 1
+        for span in groups.values():
+            span['seconds'] = round(span['end'] - span['start'], 3)
+
+        # Time during which steps of both groups were actually running
+        busy_spans = {
+            group: _union([(entry['start'], entry['end']) for entry in self.trace if entry['group'] == group])
+            for group in groups
+        }
+        overlaps = {}
+        # Pairs are named in the order the groups were added, so the keys don't depend on timing
+        added = dict.fromkeys(step['group'] for step in self._steps.values())
+        names = [group for group in added if group in groups]
+        for idx, first in enumerate(names):
+            for second in names[idx + 1:]:
+                seconds = _overlap(busy_spans[first], busy_spans[second])
+                if seconds > 0:
+                    overlaps[f"{first}/{second}"] = round(seconds, 3)
+
+        return {
+            'mode': 'sequential' if self.sequential else 'parallel',
+            'wall_seconds': round(wall, 3),
+            'busy_seconds': round(busy, 3),
+            'parallelism': round(busy / wall, 2) if wall else 0.0,
+            'groups': groups,
+            'overlaps': overlaps,
+        }
+
+    def format_trace(self, width: int = 50) -> str:
+        """Render the trace as a text timeline, one row per step"""
+        if not self.trace:
+            return "(no steps ran)"
+        wall = max(entry['end'] for entry in self.trace) or 1.0
+        label = max(len(entry['step']) for entry in self.trace)
+        rows = []
+        for entry in sorted(self.trace, key=lambda item: item['start']):
+            begin = int(entry['start'] / wall * width)
+            length = max(1, int(entry['end'] / wall * width) - begin)
+            bar = (' ' * begin + '#' * length).ljust(width)
+            rows.append(f"{entry['step']:<{label}} |{bar}| {entry['start']:7.1f}s - {entry['end']:7.1f}s")
+        return "\n".join(rows)
+
+    def save_trace(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'report': self.report(), 'trace': self.trace}, f, indent=2)
@@ -0,0 +1,153 @@
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from crewai import Crew, Task
+from agents.writer import WriterAgent
+from config.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+# Overall length of a post, spread over sections the outline gives no target for
+DEFAULT_POST_WORDS = 1750
+TRANSITION_PATTERN = re.compile(r'^\s*\**TRANSITION\s*(\d+)\**\s*[:.-]\s*(.+?)\s*$', re.I | re.M)
+
+
+def _paragraphs(text: str) -> List[str]:
+    return [paragraph.strip() for paragraph in re.split(r'\n\s*\n', text) if paragraph.strip()]
+
+
+def normalize_section(text: str) -> str:
+    """Demote a top-level heading a section writer used for its section to ``##``"""
+    text = text.strip()
+    if text.startswith('# '):
+        text = '#' + text
+    return text
+
+
+def parse_transitions(text: str) -> dict:
+    """Read ``TRANSITION <n>: ...`` lines into a {boundary number: text} dict"""
+    return {int(number): transition for number, transition in TRANSITION_PATTERN.findall(text)}
+
+
+def assemble_draft(title: str, texts: List[str], transitions: Optional[dict] = None) -> str:
+    """Join section texts under the post title, opening each later section with its transition"""
+    transitions = transitions or {}
+    parts = [f"# {title}"]
+    for idx, text in enumerate(texts):
+        transition = transitions.get(idx)
+        if transition:
+            lines = text.split('\n', 1)
+            if lines[0].startswith('#'):
+                text = f"{lines[0]}\n\n{transition}\n\n{lines[1].strip() if len(lines) > 1 else ''}".rstrip()
+            else:
+                text = f"{transition}\n\n{text}"
+        parts.append(text)
+    return '\n\n'.join(parts) + '\n'
+
+
+class SectionWriter:
+    """Writes the sections of an outline concurrently, then stitches them together.
+
+    Every section is written by its own writer agent and crew with only its
+    slice of the research, so the writing latency approaches that of the
+    slowest section instead of one long generation of the whole post. A
+    short stitching pass then asks for one transition per section boundary;
+    if it fails the sections are joined without transitions.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, metrics=None, stage: str = 'write'):
+        self.max_workers = max_workers or int(os.getenv('WRITER_SECTION_WORKERS', 6))
+        self.metrics = metrics
+        self.stage = stage
+        self.timings = {}
+
+    def _kickoff(self, task: Task) -> str:
+        crew = Crew(agents=[task.agent], tasks=[task])
+        result = crew.kickoff()
+        if self.metrics is not None:
+            self.metrics.record_llm_usage(
+                self.stage, getattr(result, 'token_usage', None) or getattr(crew, 'usage_metrics', None)
+            )
+        return str(result)
+
+    def section_words(self, sections: List[dict]) -> List[int]:
+        """Target words per section, spreading the remaining post length over sections without one"""
+        given = sum(section['words'] for section in sections if section.get('words'))
+        missing = sum(1 for section in sections if not section.get('words'))
+        fallback = max(150, (DEFAULT_POST_WORDS - given) // missing) if missing else 0
+        return [section.get('words') or fallback for section in sections]
+
+    def write_section(self, title: str, sections: List[dict], position: int, research: str,
+                      words: Optional[int] = None) -> str:
+        """Write the section at ``position`` of ``sections`` with its research slice"""
+        started = time.monotonic()
+        section = sections[position]
+        task = Task(
+            description=WriterAgent.create_section_prompt(
+                title, section, position, [item['title'] for item in sections], research, words
+            ),
+            agent=WriterAgent.create(),
+            expected_output=f"The \"{section['title']}\" section of the blog post in markdown format"
+        )
+        text = normalize_section(self._kickoff(task))
+        self.timings[position] = round(time.monotonic() - started, 3)
+        logger.info("Wrote section %d (%s) in %.1fs", position + 1, section['title'], self.timings[position])
+        return text
+
+    def stitch(self, title: str, texts: List[str], agent=None) -> str:
+        """Ask for transitions between the sections and assemble the draft"""
+        if len(texts) < 2:
+            return assemble_draft(title, texts)
+        started = time.monotonic()
+        boundaries = []
+        for previous, following in zip(texts, texts[1:]):
+            ending = _paragraphs(previous)[-1:] or ['']
+            opening = _paragraphs(following)[:2]
+            boundaries.append((ending[0], '\n\n'.join(opening)))
+
+        transitions = {}
+        try:
+            task = Task(
+                description=WriterAgent.create_stitch_prompt(title, boundaries),
+                agent=agent or WriterAgent.create(),
+                expected_output="One TRANSITION line per section boundary"
+            )
+            # Boundary n leads into section n (0-based)
+            transitions = parse_transitions(self._kickoff(task))
+        except Exception as e:
+            logger.warning("Stitching pass failed, joining sections without transitions: %s", str(e))
+        self.timings['stitch'] = round(time.monotonic() - started, 3)
+        logger.info("Stitched %d sections with %d transitions", len(texts), len(transitions))
+        return assemble_draft(title, texts, transitions)
+
+    def write(self, title: str, sections: List[dict], research: List[str], agent=None) -> str:
+        """Write all ``sections`` concurrently, each with its entry of ``research``, and stitch them"""
+        words = self.section_words(sections)
+        workers = max(1, min(self.max_workers, len(sections)))
+        logger.info("Writing %d sections with %d workers", len(sections), workers)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='section-writer') as pool:
+            futures = [
+                pool.submit(self.write_section, title, sections, idx, research[idx], words[idx])
+                for idx in range(len(sections))
+            ]
+            texts = [future.result() for future in futures]
+
+        draft = self.stitch(title, texts, agent)
+        self.record(sections, workers)
+        return draft
+
+    def record(self, sections: List[dict], workers: int) -> None:
+        """Attach per-section latencies to the run metrics"""
+        if self.metrics is None:
+            return
+        section_seconds = [self.timings.get(idx, 0.0) for idx in range(len(sections))]
+        self.metrics.set('sections', {
+            'count': len(sections),
+            'workers': workers,
+            'section_seconds': section_seconds,
+            'slowest_seconds': max(section_seconds, default=0.0),
+            'sum_seconds': round(sum(section_seconds), 3),
+            'stitch_seconds': self.timings.get('stitch', 0.0),
+        })
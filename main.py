@@ -3,22 +3,14 @@ from mesop.events import Event
 from mesop.components.text_field import TextFieldChangeEvent
 from mesop.components.button import ButtonClickEvent
 from crew.blog_crew import BlogCrew
-import frontmatter
+from storage.blog_store import get_blog_store
 from datetime import datetime
-import logging
-import sys
+from config.logging_config import setup_logging
 import os
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('blog_generator.log')
-    ]
-)
-logger = logging.getLogger(__name__)
+logger = setup_logging(__name__)
+
+BLOGS_PER_PAGE = 50
 
 # State management
 class State:
@@ -28,13 +20,12 @@ class State:
         self.blogs = []
         self.current_blog = None
         self.generating = False
+        self.page = 0
 
 state = State()
 
-def load_blog_content(filepath):
-    with open(filepath, 'r', encoding='utf-8') as file:
-        post = frontmatter.load(file)
-        return post.metadata, post.content
+def load_blog_content(post_id):
+    return get_blog_store().load(post_id)
 
 def handle_topic_change(event: TextFieldChangeEvent):
     state.topic = event.value
@@ -42,6 +33,12 @@ def handle_topic_change(event: TextFieldChangeEvent):
 def handle_keywords_change(event: TextFieldChangeEvent):
     state.keywords = event.value
 
+def handle_previous_page(event: ButtonClickEvent):
+    state.page = max(0, state.page - 1)
+
+def handle_next_page(event: ButtonClickEvent):
+    state.page += 1
+
 def create_blog():
     if not state.topic or not state.keywords:
         return c.text("Please enter both topic and keywords")
@@ -67,16 +64,17 @@ def create_blog():
         return c.text(f"Error: {str(e)}")
 
 def view_blogs():
-    blogs_dir = "data/blogs"
-    if not os.path.exists(blogs_dir):
+    total = get_blog_store().count()
+    if not total:
         return c.text("No blogs found")
-        
-    blog_files = [f for f in os.listdir(blogs_dir) if f.endswith('.md')]
+
+    pages = (total + BLOGS_PER_PAGE - 1) // BLOGS_PER_PAGE
+    state.page = min(state.page, pages - 1)
+    blogs = BlogCrew.list_blogs(limit=BLOGS_PER_PAGE, offset=state.page * BLOGS_PER_PAGE)
     blog_contents = []
-    
-    for file in blog_files:
-        filepath = os.path.join(blogs_dir, file)
-        metadata, content = load_blog_content(filepath)
+
+    for blog in blogs:
+        metadata, content = load_blog_content(blog['id'])
         blog_contents.append(
             c.card(
                 c.column([
@@ -89,7 +87,16 @@ def view_blogs():
                 ])
             )
         )
-    
+
+    if pages > 1:
+        blog_contents.append(
+            c.column([
+                c.text(f"Page {state.page + 1} of {pages}"),
+                c.button("Previous", on_click=handle_previous_page, disabled=state.page == 0),
+                c.button("Next", on_click=handle_next_page, disabled=state.page >= pages - 1),
+            ])
+        )
+
     return c.column(blog_contents)
 
 def app():
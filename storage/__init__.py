@@ -0,0 +1,6 @@
+"""
+Storage and indexing of generated blog posts
+
+Modules are imported directly (e.g. ``from storage.catalog import BlogCatalog``)
+so that they can also be run as command line tools with ``python -m``.
+"""
@@ -0,0 +1,174 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+import frontmatter
+from config.logging_config import setup_logging
+from storage.catalog import ARTIFACTS_DIR, BLOGS_DIR, BlogCatalog
+from storage.content_cache import get_content_cache
+from storage.search_index import BlogSearchIndex
+
+logger = setup_logging(__name__)
+
+
+def slugify_title(title: str) -> str:
+    """Slug used for post filenames and MongoDB post slugs"""
+    return title.lower().replace(' ', '-').replace('/', '-')
+
+
+class BlogStore(ABC):
+    """Interface of the storage backends for generated posts and their run artifacts.
+
+    Posts are addressed by the ID returned from ``save``: the file path for the
+    file backend, the document ID for the MongoDB backend. Listings return
+    dicts with ``id``, ``title``, ``date``, ``tags`` and ``description``.
+    """
+
+    name = None
+
+    @abstractmethod
+    def save(self, content: str, metadata: dict, artifacts: Optional[Dict[str, str]] = None) -> str:
+        """Store a post and the artifacts (outline, research, draft) it was built from"""
+
+    @abstractmethod
+    def load(self, post_id: str) -> Tuple[dict, str]:
+        """Return the metadata and body of a post"""
+
+    @abstractmethod
+    def exists(self, post_id: str) -> bool:
+        """Whether a post with this ID is stored"""
+
+    @abstractmethod
+    def list(self, limit: Optional[int] = None, offset: int = 0) -> List[dict]:
+        """Return posts, newest first"""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Return the number of stored posts"""
+
+    @abstractmethod
+    def search(self, query: str, limit: int = 20) -> List[dict]:
+        """Return posts matching ``query``, best match first"""
+
+    @abstractmethod
+    def artifacts(self, post_id: str) -> Dict[str, str]:
+        """Return the stored artifacts of a post keyed by name"""
+
+
+class FileBlogStore(BlogStore):
+    """Markdown files with YAML frontmatter in ``data/blogs``.
+
+    Listings come from the BlogCatalog and searches from the BM25
+    BlogSearchIndex, both updated on every save. Artifacts are written to
+    ``<blogs_dir>/.artifacts/<post name>/``. A title that is already taken
+    gets a numeric suffix instead of overwriting the existing post.
+    """
+
+    name = 'file'
+
+    def __init__(self, blogs_dir: Optional[str] = None):
+        self.blogs_dir = blogs_dir or BLOGS_DIR
+        os.makedirs(self.blogs_dir, exist_ok=True)
+        self.catalog = BlogCatalog(self.blogs_dir)
+        self._index = None
+
+    @property
+    def index(self) -> BlogSearchIndex:
+        # Created on first use: most store instances only list or load posts
+        if self._index is None:
+            self._index = BlogSearchIndex(self.blogs_dir)
+        return self._index
+
+    def _reserve_path(self, title: str) -> str:
+        """Create an empty file under an unused name derived from the title"""
+        slug = slugify_title(title)
+        suffix = 1
+        while True:
+            name = f"{slug}.md" if suffix == 1 else f"{slug}-{suffix}.md"
+            filepath = os.path.join(self.blogs_dir, name)
+            try:
+                # 'x' fails if the file exists, so concurrent runs never pick the same name
+                with open(filepath, 'x', encoding='utf-8'):
+                    return filepath
+            except FileExistsError:
+                suffix += 1
+
+    def _artifacts_dir(self, filepath: str) -> str:
+        stem = os.path.splitext(os.path.basename(filepath))[0]
+        return os.path.join(self.blogs_dir, ARTIFACTS_DIR, stem)
+
+    def save(self, content: str, metadata: dict, artifacts: Optional[Dict[str, str]] = None) -> str:
+        filepath = self._reserve_path(metadata['title'])
+        logger.debug("Generated filepath: %s", filepath)
+
+        post = frontmatter.Post(content, **metadata)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(frontmatter.dumps(post))
+
+        if artifacts:
+            artifacts_dir = self._artifacts_dir(filepath)
+            os.makedirs(artifacts_dir, exist_ok=True)
+            for name, text in artifacts.items():
+                with open(os.path.join(artifacts_dir, f"{name}.md"), 'w', encoding='utf-8') as f:
+                    f.write(text)
+
+        # Keep the catalog and search index in sync so listings and searches don't re-read every file
+        self.catalog.upsert(filepath, metadata)
+        self.index.add_post(filepath, metadata, content, (artifacts or {}).get('research', ''))
+        return filepath
+
+    def load(self, post_id: str) -> Tuple[dict, str]:
+        return get_content_cache().load(post_id)
+
+    def exists(self, post_id: str) -> bool:
+        return os.path.exists(post_id)
+
+    @staticmethod
+    def _entry(entry: dict) -> dict:
+        entry['id'] = entry['path']
+        return entry
+
+    def list(self, limit: Optional[int] = None, offset: int = 0) -> List[dict]:
+        return [self._entry(entry) for entry in self.catalog.list(limit=limit, offset=offset)]
+
+    def count(self) -> int:
+        return self.catalog.count()
+
+    def search(self, query: str, limit: int = 20) -> List[dict]:
+        entries = []
+        for doc_id, score in self.index.search(query, limit=limit):
+            entry = self.catalog.get(doc_id)
+            if entry is not None:
+                entries.append({**self._entry(entry), 'score': score})
+        return entries
+
+    def artifacts(self, post_id: str) -> Dict[str, str]:
+        artifacts_dir = self._artifacts_dir(post_id)
+        if not os.path.isdir(artifacts_dir):
+            return {}
+        artifacts = {}
+        for name in sorted(os.listdir(artifacts_dir)):
+            with open(os.path.join(artifacts_dir, name), 'r', encoding='utf-8') as f:
+                artifacts[os.path.splitext(name)[0]] = f.read()
+        return artifacts
+
+
+_mongo_store = None
+_mongo_store_lock = threading.Lock()
+
+
+def get_blog_store(blogs_dir: Optional[str] = None) -> BlogStore:
+    """Return the storage backend selected by ``BLOG_STORAGE_BACKEND`` (file or mongodb)"""
+    backend = os.getenv('BLOG_STORAGE_BACKEND', 'file').lower()
+    if backend == 'file':
+        return FileBlogStore(blogs_dir)
+    if backend != 'mongodb':
+        raise ValueError(f"Unknown blog storage backend: {backend}")
+
+    global _mongo_store
+    with _mongo_store_lock:
+        # One client per process: MongoClient keeps its own connection pool
+        if _mongo_store is None:
+            from storage.mongo_store import MongoBlogStore
+            _mongo_store = MongoBlogStore.from_env()
+        return _mongo_store
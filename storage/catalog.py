@@ -0,0 +1,194 @@
+"""
+Indexed catalog of generated blog posts.
+
+    python -m storage.catalog rebuild     # reconcile the index with data/blogs
+    python -m storage.catalog list        # print the indexed posts
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import List, Optional
+from config.logging_config import setup_logging
+from storage.content_cache import read_frontmatter
+
+logger = setup_logging(__name__)
+
+BLOGS_DIR = os.path.join('data', 'blogs')
+CATALOG_FILE = '.catalog.sqlite'
+# Per-post run artifacts (outline, research, draft) live in <blogs_dir>/.artifacts/<post name>/
+ARTIFACTS_DIR = '.artifacts'
+
+
+class BlogCatalog:
+    """SQLite index of post metadata stored next to the markdown files.
+
+    ``EditorAgent.save_blog`` upserts every post it writes, so listing posts is
+    a single indexed query instead of parsing the frontmatter of every file.
+    ``rebuild`` reconciles the index with the directory using file mtimes and
+    sizes, re-reading only files that changed. Posts are keyed on their path
+    relative to the blogs directory, so absolute and relative paths to the
+    same post share one entry; listings return paths under ``blogs_dir``.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, blogs_dir: Optional[str] = None):
+        self.blogs_dir = blogs_dir or BLOGS_DIR
+        self.path = os.path.join(self.blogs_dir, CATALOG_FILE)
+        os.makedirs(self.blogs_dir, exist_ok=True)
+
+        is_new = not os.path.exists(self.path)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS posts (
+                    path TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    date TEXT,
+                    tags TEXT NOT NULL,
+                    description TEXT,
+                    mtime REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_date ON posts (date DESC, title)")
+            self._migrate(conn)
+
+        if is_new:
+            logger.info("Creating blog catalog at %s", self.path)
+            self.rebuild()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _key(self, filepath: str) -> str:
+        """Path of a post relative to the blogs directory"""
+        return os.path.relpath(os.path.realpath(filepath), os.path.realpath(self.blogs_dir))
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Re-key entries of older catalogs, which stored the path as it was passed in"""
+        rows = conn.execute("SELECT * FROM posts WHERE path LIKE ?", (f"%{os.sep}%",)).fetchall()
+        if not rows:
+            return
+        conn.executemany("DELETE FROM posts WHERE path = ?", [(row['path'],) for row in rows])
+        conn.executemany(
+            "INSERT OR REPLACE INTO posts VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(os.path.basename(row['path']), *tuple(row)[1:]) for row in rows]
+        )
+        logger.info("Re-keyed %d blog catalog entries on their file name", len(rows))
+
+    def _row(self, filepath: str, metadata: dict, stat: os.stat_result) -> tuple:
+        return (
+            self._key(filepath),
+            str(metadata.get('title') or os.path.basename(filepath)),
+            str(metadata.get('date') or ''),
+            json.dumps(list(metadata.get('tags') or [])),
+            str(metadata.get('description') or ''),
+            stat.st_mtime,
+            stat.st_size
+        )
+
+    def _entry(self, row: sqlite3.Row) -> dict:
+        entry = dict(row)
+        entry['path'] = os.path.join(self.blogs_dir, entry['path'])
+        entry['tags'] = json.loads(entry['tags'])
+        return entry
+
+    def upsert(self, filepath: str, metadata: dict) -> None:
+        """Index (or re-index) a post that was just written"""
+        row = self._row(filepath, metadata, os.stat(filepath))
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO posts VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+        logger.debug("Indexed blog post %s", filepath)
+
+    def remove(self, filepath: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM posts WHERE path = ?", (self._key(filepath),))
+
+    def list(self, limit: Optional[int] = None, offset: int = 0) -> List[dict]:
+        """Return indexed posts, newest first"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM posts ORDER BY date DESC, title LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset)
+            ).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def get(self, filepath: str) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM posts WHERE path = ?", (self._key(filepath),)
+            ).fetchone()
+        return self._entry(row) if row else None
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            (count,) = conn.execute("SELECT COUNT(*) FROM posts").fetchone()
+        return count
+
+    def rebuild(self) -> dict:
+        """Reconcile the index with the markdown files on disk"""
+        logger.info("Reconciling blog catalog with %s", self.blogs_dir)
+        with self._connect() as conn:
+            indexed = {
+                row['path']: (row['mtime'], row['size'])
+                for row in conn.execute("SELECT path, mtime, size FROM posts")
+            }
+
+        stats = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0, 'failed': 0}
+        rows = []
+        on_disk = set()
+        for name in os.listdir(self.blogs_dir):
+            if not name.endswith('.md'):
+                continue
+            filepath = os.path.join(self.blogs_dir, name)
+            on_disk.add(name)
+            stat = os.stat(filepath)
+            if indexed.get(name) == (stat.st_mtime, stat.st_size):
+                stats['unchanged'] += 1
+                continue
+            try:
+                metadata = read_frontmatter(filepath)
+            except Exception as e:
+                logger.error("Error indexing blog at %s: %s", filepath, str(e))
+                stats['failed'] += 1
+                continue
+            rows.append(self._row(filepath, metadata, stat))
+            stats['updated' if name in indexed else 'added'] += 1
+
+        removed = [path for path in indexed if path not in on_disk]
+        stats['removed'] = len(removed)
+        with self._lock, self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO posts VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.executemany("DELETE FROM posts WHERE path = ?", [(path,) for path in removed])
+
+        logger.info("Blog catalog reconciled: %s", stats)
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the blog catalog index")
+    parser.add_argument('command', choices=['rebuild', 'list'])
+    parser.add_argument('--blogs-dir', default=BLOGS_DIR, help='Directory holding the markdown posts')
+    args = parser.parse_args()
+
+    catalog = BlogCatalog(args.blogs_dir)
+    if args.command == 'rebuild':
+        print(catalog.rebuild())
+    else:
+        for entry in catalog.list():
+            print(f"{entry['date'] or 'No date':<12} {entry['title']}  ({entry['path']})")
+
+
+if __name__ == "__main__":
+    main()
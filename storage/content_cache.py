@@ -0,0 +1,120 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Tuple
+import frontmatter
+import yaml
+from config.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+FRONTMATTER_DELIMITER = '---'
+
+
+def read_frontmatter(filepath: str) -> dict:
+    """Parse only the YAML frontmatter block of a post, without reading its body"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        if f.readline().strip() != FRONTMATTER_DELIMITER:
+            return {}
+        lines = []
+        for line in f:
+            if line.strip() == FRONTMATTER_DELIMITER:
+                break
+            lines.append(line)
+    metadata = yaml.safe_load(''.join(lines))
+    return metadata if isinstance(metadata, dict) else {}
+
+
+class BlogContentCache:
+    """Process-wide LRU cache of post metadata and bodies.
+
+    Entries are keyed on (path, mtime, size), so an edited file is re-read on
+    the next access, and the least recently used entries are evicted once the
+    cached text exceeds ``max_bytes``. Metadata and bodies are cached
+    separately: listings only ever parse the frontmatter block.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(filepath: str, kind: str) -> tuple:
+        stat = os.stat(filepath)
+        return (os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size, kind)
+
+    @staticmethod
+    def _cost(metadata: dict, content: str) -> int:
+        return len(content) + sum(len(str(k)) + len(str(v)) for k, v in metadata.items())
+
+    def _get(self, key: tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def _put(self, key: tuple, value, cost: int) -> None:
+        with self._lock:
+            # Drop stale versions of the same file
+            for stale in [k for k in self._entries if k[0] == key[0] and k[3] == key[3] and k != key]:
+                self.size -= self._entries.pop(stale)[1]
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = (value, cost)
+            self.size += cost
+            while self.size > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_cost) = self._entries.popitem(last=False)
+                self.size -= evicted_cost
+
+    def load_metadata(self, filepath: str) -> dict:
+        """Return the frontmatter of a post, parsing only the frontmatter block"""
+        key = self._key(filepath, 'metadata')
+        metadata = self._get(key)
+        if metadata is None:
+            metadata = read_frontmatter(filepath)
+            self._put(key, metadata, self._cost(metadata, ''))
+        return metadata
+
+    def load(self, filepath: str) -> Tuple[dict, str]:
+        """Return the metadata and body of a post"""
+        key = self._key(filepath, 'post')
+        post = self._get(key)
+        if post is None:
+            logger.debug("Loading blog content from %s", filepath)
+            with open(filepath, 'r', encoding='utf-8') as f:
+                loaded = frontmatter.load(f)
+            post = (loaded.metadata, loaded.content)
+            self._put(key, post, self._cost(*post))
+        return post
+
+    def stats(self) -> dict:
+        return {
+            'entries': len(self._entries),
+            'bytes': self.size,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+_content_cache = None
+_content_cache_lock = threading.Lock()
+
+
+def get_content_cache() -> BlogContentCache:
+    """Return the process-wide content cache, creating it on first use"""
+    global _content_cache
+    with _content_cache_lock:
+        if _content_cache is None:
+            _content_cache = BlogContentCache(
+                int(os.getenv('BLOG_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+            )
+        return _content_cache
@@ -0,0 +1,220 @@
+"""
+MongoDB storage backend for generated posts and run artifacts.
+
+    BLOG_STORAGE_BACKEND=mongodb MONGODB_URI=mongodb://localhost:27017 streamlit run app.py
+    python -m storage.mongo_store import-files    # bulk import the markdown posts in data/blogs
+"""
+
+import argparse
+import datetime as dt
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from config.logging_config import setup_logging
+from storage.blog_store import BlogStore, slugify_title
+from storage.catalog import BLOGS_DIR
+from storage.content_cache import get_content_cache
+
+try:
+    import pymongo
+    from bson import ObjectId
+    from bson.errors import InvalidId
+    from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel, ReplaceOne, UpdateOne
+    from pymongo.errors import DuplicateKeyError
+except ImportError:
+    pymongo = None
+
+logger = setup_logging(__name__)
+
+DEFAULT_URI = 'mongodb://localhost:27017'
+DEFAULT_DATABASE = 'mongodb_blog_writer'
+
+
+class MongoBlogStore(BlogStore):
+    """Posts and their artifacts in the ``posts`` and ``artifacts`` collections.
+
+    Posts are indexed for the listing sort (date, title), tag and title
+    lookups, a unique slug, and a weighted text index over title, description
+    and content used by ``search``. Artifacts of a post are written in one
+    unordered bulk write.
+    """
+
+    name = 'mongodb'
+
+    def __init__(self, uri: str = DEFAULT_URI, database: str = DEFAULT_DATABASE, client=None):
+        if client is None:
+            if pymongo is None:
+                raise ImportError("pymongo is required for the MongoDB storage backend: pip install pymongo")
+            client = pymongo.MongoClient(uri, appname='mongodb-blog-writer')
+        self.client = client
+        self.db = client[database]
+        self.posts = self.db['posts']
+        self.artifact_docs = self.db['artifacts']
+        self.ensure_indexes()
+
+    @classmethod
+    def from_env(cls) -> 'MongoBlogStore':
+        return cls(
+            uri=os.getenv('MONGODB_URI', DEFAULT_URI),
+            database=os.getenv('MONGODB_DATABASE', DEFAULT_DATABASE)
+        )
+
+    def ensure_indexes(self) -> None:
+        self.posts.create_indexes([
+            IndexModel([('date', DESCENDING), ('title', ASCENDING)], name='date_title'),
+            IndexModel([('tags', ASCENDING)], name='tags'),
+            IndexModel([('title', ASCENDING)], name='title'),
+            IndexModel([('slug', ASCENDING)], name='slug', unique=True),
+            IndexModel(
+                [('title', TEXT), ('description', TEXT), ('content', TEXT)],
+                name='post_text',
+                weights={'title': 10, 'description': 5, 'content': 1}
+            ),
+        ])
+        self.artifact_docs.create_indexes([
+            IndexModel([('post_id', ASCENDING), ('name', ASCENDING)], name='post_name', unique=True),
+            IndexModel([('run_id', ASCENDING)], name='run_id'),
+        ])
+
+    @staticmethod
+    def _object_id(post_id: str):
+        try:
+            return ObjectId(post_id)
+        except (InvalidId, TypeError):
+            raise KeyError(f"Invalid post ID: {post_id}")
+
+    @staticmethod
+    def _document(content: str, metadata: dict, slug: str) -> dict:
+        # BSON only stores datetimes; frontmatter dates may be strings or dates
+        date = metadata.get('date')
+        if isinstance(date, str):
+            try:
+                date = datetime.strptime(date, '%Y-%m-%d')
+            except ValueError:
+                date = None
+        elif isinstance(date, dt.date) and not isinstance(date, datetime):
+            date = datetime.combine(date, dt.time())
+        return {
+            **metadata,
+            'slug': slug,
+            'date': date or datetime.now(),
+            'tags': list(metadata.get('tags') or []),
+            'content': content,
+            'created_at': datetime.now(timezone.utc),
+        }
+
+    @staticmethod
+    def _entry(doc: dict) -> dict:
+        date = doc.get('date')
+        return {
+            'id': str(doc['_id']),
+            'title': doc.get('title', 'Untitled'),
+            'date': date.strftime('%Y-%m-%d') if isinstance(date, datetime) else (date or ''),
+            'tags': doc.get('tags', []),
+            'description': doc.get('description', ''),
+        }
+
+    def save(self, content: str, metadata: dict, artifacts: Optional[Dict[str, str]] = None) -> str:
+        slug = slugify_title(metadata['title'])
+        suffix = 1
+        while True:
+            doc = self._document(content, metadata, slug if suffix == 1 else f"{slug}-{suffix}")
+            try:
+                post_id = self.posts.insert_one(doc).inserted_id
+                break
+            except DuplicateKeyError:
+                # A post with this title exists; keep it and take the next free slug
+                suffix += 1
+
+        if artifacts:
+            self.artifact_docs.bulk_write([
+                ReplaceOne(
+                    {'post_id': post_id, 'name': name},
+                    {'post_id': post_id, 'name': name, 'run_id': metadata.get('run_id'), 'content': text},
+                    upsert=True
+                )
+                for name, text in artifacts.items()
+            ], ordered=False)
+
+        logger.debug("Stored post %s with slug %s", post_id, doc['slug'])
+        return str(post_id)
+
+    def load(self, post_id: str) -> Tuple[dict, str]:
+        doc = self.posts.find_one({'_id': self._object_id(post_id)}, {'_id': 0, 'created_at': 0})
+        if doc is None:
+            raise KeyError(f"No post with ID {post_id}")
+        content = doc.pop('content', '')
+        if isinstance(doc.get('date'), datetime):
+            doc['date'] = doc['date'].strftime('%Y-%m-%d')
+        return doc, content
+
+    def exists(self, post_id: str) -> bool:
+        try:
+            return self.posts.count_documents({'_id': self._object_id(post_id)}, limit=1) > 0
+        except KeyError:
+            return False
+
+    def list(self, limit: Optional[int] = None, offset: int = 0) -> List[dict]:
+        cursor = self.posts.find(
+            {}, {'title': 1, 'date': 1, 'tags': 1, 'description': 1}
+        ).sort([('date', DESCENDING), ('title', ASCENDING)]).skip(offset)
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        return [self._entry(doc) for doc in cursor]
+
+    def count(self) -> int:
+        return self.posts.estimated_document_count()
+
+    def search(self, query: str, limit: int = 20) -> List[dict]:
+        cursor = self.posts.find(
+            {'$text': {'$search': query}},
+            {'title': 1, 'date': 1, 'tags': 1, 'description': 1, 'score': {'$meta': 'textScore'}}
+        ).sort([('score', {'$meta': 'textScore'})]).limit(limit)
+        return [self._entry(doc) for doc in cursor]
+
+    def artifacts(self, post_id: str) -> Dict[str, str]:
+        cursor = self.artifact_docs.find({'post_id': self._object_id(post_id)}, {'name': 1, 'content': 1})
+        return {doc['name']: doc['content'] for doc in cursor}
+
+    def import_files(self, blogs_dir: str = BLOGS_DIR) -> dict:
+        """Bulk insert the markdown posts of the file backend whose slug (filename) is not taken yet"""
+        requests = []
+        for name in sorted(os.listdir(blogs_dir)):
+            if not name.endswith('.md'):
+                continue
+            filepath = os.path.join(blogs_dir, name)
+            try:
+                metadata, content = get_content_cache().load(filepath)
+            except Exception as e:
+                logger.error("Error reading blog at %s: %s", filepath, str(e))
+                continue
+            metadata = {**metadata, 'title': str(metadata.get('title') or os.path.splitext(name)[0])}
+            slug = os.path.splitext(name)[0]
+            # $setOnInsert keeps re-imports idempotent and never replaces a stored post
+            requests.append(UpdateOne({'slug': slug}, {'$setOnInsert': self._document(content, metadata, slug)},
+                                      upsert=True))
+
+        if not requests:
+            return {'imported': 0, 'skipped': 0}
+        result = self.posts.bulk_write(requests, ordered=False)
+        stats = {'imported': result.upserted_count, 'skipped': len(requests) - result.upserted_count}
+        logger.info("Imported blog files from %s: %s", blogs_dir, stats)
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the MongoDB blog store")
+    parser.add_argument('command', choices=['import-files', 'list'])
+    parser.add_argument('--blogs-dir', default=BLOGS_DIR, help='Directory holding the markdown posts')
+    args = parser.parse_args()
+
+    store = MongoBlogStore.from_env()
+    if args.command == 'import-files':
+        print(store.import_files(args.blogs_dir))
+    else:
+        for entry in store.list():
+            print(f"{entry['date'] or 'No date':<12} {entry['title']}  ({entry['id']})")
+
+
+if __name__ == "__main__":
+    main()
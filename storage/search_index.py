@@ -0,0 +1,288 @@
+"""
+Full-text BM25 search over generated blog posts and their research notes.
+
+    python -m storage.search_index query "atlas vector search"
+    python -m storage.search_index rebuild
+"""
+
+import argparse
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+from config.logging_config import setup_logging
+from storage.catalog import ARTIFACTS_DIR, BLOGS_DIR
+from storage.content_cache import get_content_cache
+
+logger = setup_logging(__name__)
+
+INDEX_FILE = '.search.sqlite'
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOPWORDS = frozenset("""
+a an and are as at be but by can do for from has have how i if in into is it its
+of on or our so that the their then there these this to was we what when which
+will with you your
+""".split())
+
+# Field weights: a term in the title counts as much as three in the body
+BLOG_FIELD_WEIGHTS = {'title': 3.0, 'tags': 2.0, 'description': 2.0, 'content': 1.0, 'research': 0.5}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords and single characters"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower())
+            if len(token) > 1 and token not in STOPWORDS]
+
+
+class SearchIndex:
+    """Inverted index with BM25 ranking persisted in SQLite.
+
+    Documents are made of named fields whose term frequencies are scaled by a
+    per-field weight. Postings are keyed on (term, doc_id), so a query reads
+    only the postings of its own terms and never the documents themselves.
+    Each document carries a ``version`` (e.g. mtime and size) used to re-index
+    only what changed.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, path: str, k1: float = 1.2, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS docs (
+                    doc_id TEXT PRIMARY KEY,
+                    length REAL NOT NULL,
+                    version TEXT
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS postings (
+                    term TEXT NOT NULL,
+                    doc_id TEXT NOT NULL,
+                    tf REAL NOT NULL,
+                    PRIMARY KEY (term, doc_id)
+                ) WITHOUT ROWID"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings (doc_id)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _term_frequencies(fields: Dict[str, str], weights: Optional[Dict[str, float]]) -> Counter:
+        frequencies = Counter()
+        for name, text in fields.items():
+            weight = (weights or {}).get(name, 1.0)
+            for token in tokenize(text or ''):
+                frequencies[token] += weight
+        return frequencies
+
+    def _insert(self, conn: sqlite3.Connection, doc_id: str, fields: Dict[str, str],
+                weights: Optional[Dict[str, float]], version: Optional[str]) -> None:
+        frequencies = self._term_frequencies(fields, weights)
+        self._delete(conn, doc_id)
+        conn.execute("INSERT INTO docs VALUES (?, ?, ?)",
+                     (doc_id, sum(frequencies.values()), version))
+        conn.executemany("INSERT INTO postings VALUES (?, ?, ?)",
+                         [(term, doc_id, tf) for term, tf in frequencies.items()])
+
+    def add(self, doc_id: str, fields: Dict[str, str], weights: Optional[Dict[str, float]] = None,
+            version: Optional[str] = None) -> None:
+        """Index (or re-index) a document"""
+        with self._lock, self._connect() as conn:
+            self._insert(conn, doc_id, fields, weights, version)
+
+    def add_many(self, docs: Iterable[Tuple[str, Dict[str, str]]], weights: Optional[Dict[str, float]] = None,
+                 remove: Iterable[str] = (), conn: Optional[sqlite3.Connection] = None) -> None:
+        """Remove the ``remove`` documents and index ``docs`` in a single transaction.
+
+        With ``conn`` the writes join the caller's transaction on the same
+        database file.
+        """
+        if conn is None:
+            with self._lock, self._connect() as own_conn:
+                self.add_many(docs, weights, remove, own_conn)
+            return
+        for doc_id in remove:
+            self._delete(conn, doc_id)
+        for doc_id, fields in docs:
+            self._insert(conn, doc_id, fields, weights, None)
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, doc_id: str) -> None:
+        conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        conn.execute("DELETE FROM docs WHERE doc_id = ?", (doc_id,))
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock, self._connect() as conn:
+            self._delete(conn, doc_id)
+
+    def versions(self) -> Dict[str, Optional[str]]:
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT doc_id, version FROM docs"))
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            (count,) = conn.execute("SELECT COUNT(*) FROM docs").fetchone()
+        return count
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[str, float]]:
+        """Return (doc_id, score) pairs of the best matching documents"""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        scores = Counter()
+        with self._connect() as conn:
+            total, avg_length = conn.execute("SELECT COUNT(*), AVG(length) FROM docs").fetchone()
+            if not total:
+                return []
+            avg_length = avg_length or 1.0
+            for term in terms:
+                postings = conn.execute(
+                    "SELECT p.doc_id, p.tf, d.length FROM postings p JOIN docs d ON d.doc_id = p.doc_id "
+                    "WHERE p.term = ?", (term,)
+                ).fetchall()
+                if not postings:
+                    continue
+                idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf, length in postings:
+                    norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                    scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return scores.most_common(limit)
+
+
+class BlogSearchIndex(SearchIndex):
+    """BM25 index over the posts in ``data/blogs`` and their research notes.
+
+    ``FileBlogStore.save`` adds every post it writes; ``rebuild`` reconciles
+    the index with the directory using file mtimes and sizes. Posts are keyed
+    on their path relative to the blogs directory, like in the BlogCatalog,
+    and searches return paths under ``blogs_dir``.
+    """
+
+    def __init__(self, blogs_dir: Optional[str] = None):
+        self.blogs_dir = blogs_dir or BLOGS_DIR
+        path = os.path.join(self.blogs_dir, INDEX_FILE)
+        is_new = not os.path.exists(path)
+        super().__init__(path)
+        if is_new:
+            logger.info("Creating blog search index at %s", path)
+            self.rebuild()
+        elif any(os.sep in doc_id for doc_id in self.versions()):
+            # Older indexes stored the path as it was passed in
+            self.rebuild()
+
+    def _key(self, filepath: str) -> str:
+        return os.path.relpath(os.path.realpath(filepath), os.path.realpath(self.blogs_dir))
+
+    @staticmethod
+    def _version(filepath: str) -> str:
+        stat = os.stat(filepath)
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _research_notes(self, filepath: str) -> str:
+        stem = os.path.splitext(os.path.basename(filepath))[0]
+        research_path = os.path.join(self.blogs_dir, ARTIFACTS_DIR, stem, 'research.md')
+        if not os.path.exists(research_path):
+            return ''
+        with open(research_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def add_post(self, filepath: str, metadata: dict, content: str, research: Optional[str] = None) -> None:
+        fields = {
+            'title': str(metadata.get('title') or ''),
+            'tags': ' '.join(str(tag) for tag in metadata.get('tags') or []),
+            'description': str(metadata.get('description') or ''),
+            'content': content,
+            'research': research if research is not None else self._research_notes(filepath),
+        }
+        self.add(self._key(filepath), fields, BLOG_FIELD_WEIGHTS, self._version(filepath))
+        logger.debug("Indexed blog post %s for search", filepath)
+
+    def _post_names(self) -> Iterable[str]:
+        for name in os.listdir(self.blogs_dir):
+            if name.endswith('.md'):
+                yield name
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[str, float]]:
+        """Return (path, score) pairs of the best matching posts"""
+        return [(os.path.join(self.blogs_dir, doc_id), score) for doc_id, score in super().search(query, limit)]
+
+    def rebuild(self) -> dict:
+        """Reconcile the index with the markdown files on disk"""
+        logger.info("Reconciling blog search index with %s", self.blogs_dir)
+        indexed = self.versions()
+        stats = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0, 'failed': 0}
+
+        on_disk = set()
+        for name in self._post_names():
+            filepath = os.path.join(self.blogs_dir, name)
+            on_disk.add(name)
+            if indexed.get(name) == self._version(filepath):
+                stats['unchanged'] += 1
+                continue
+            try:
+                metadata, content = get_content_cache().load(filepath)
+                self.add_post(filepath, metadata, content)
+            except Exception as e:
+                logger.error("Error indexing blog at %s: %s", filepath, str(e))
+                stats['failed'] += 1
+                continue
+            stats['updated' if name in indexed else 'added'] += 1
+
+        removed = [doc_id for doc_id in indexed if doc_id not in on_disk]
+        stats['removed'] = len(removed)
+        with self._lock, self._connect() as conn:
+            for doc_id in removed:
+                self._delete(conn, doc_id)
+
+        logger.info("Blog search index reconciled: %s", stats)
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the generated blog posts")
+    parser.add_argument('command', choices=['query', 'rebuild'])
+    parser.add_argument('query', nargs='?', default='', help='Search terms')
+    parser.add_argument('--limit', type=int, default=10, help='Number of results to show')
+    parser.add_argument('--blogs-dir', default=BLOGS_DIR, help='Directory holding the markdown posts')
+    args = parser.parse_args()
+
+    index = BlogSearchIndex(args.blogs_dir)
+    if args.command == 'rebuild':
+        print(index.rebuild())
+        return
+
+    if not args.query:
+        parser.error("query requires search terms")
+    started = time.perf_counter()
+    results = index.search(args.query, limit=args.limit)
+    elapsed = (time.perf_counter() - started) * 1000
+    for doc_id, score in results:
+        metadata = get_content_cache().load_metadata(doc_id)
+        print(f"{score:7.2f}  {metadata.get('title', os.path.basename(doc_id))}  ({doc_id})")
+    print(f"{len(results)} results in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
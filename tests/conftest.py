@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Keep the test run's log file out of the working tree; set before any project module logs
+os.environ.setdefault('LOG_DIR', tempfile.mkdtemp(prefix='blog-tests-logs-'))
+os.environ.setdefault('LOG_CONSOLE_LEVEL', 'ERROR')
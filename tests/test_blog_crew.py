@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+from agents.llm import set_llm_factory
+from benchmarks.fake_services import StubLLM
+from config import metrics
+from crew.blog_crew import BlogCrew
+from crew.checkpoint import CheckpointStore
+from tools.dedup import reset_dedup_tracker
+from tools.web_tools import WebSearchTools
+
+URL = 'https://www.mongodb.com/docs/manual/core/timeseries-collections/'
+PAGE = "Time series collections store sequences of measurements with automatic bucketing."
+
+
+@pytest.fixture
+def crew(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('WRITER_RETRIEVAL', 'false')
+    set_llm_factory(lambda temperature, timeout: StubLLM())
+    reset_dedup_tracker()
+    crew = BlogCrew('Time series collections', blogs_dir=str(tmp_path / 'blogs'), runs_dir=str(tmp_path / 'runs'))
+    crew.metrics = metrics.start_run()
+    yield crew
+    metrics.end_run(crew.metrics)
+    set_llm_factory(None)
+    reset_dedup_tracker()
+
+
+def test_dag_sections_citing_the_same_page_all_get_its_text(crew, monkeypatch):
+    fetches = []
+
+    def fetch_page(url):
+        fetches.append(url)
+        time.sleep(0.2)
+        return f"Source: {url}\n\n{PAGE}"
+
+    scrape = WebSearchTools.scrape_web().func
+    kickoff = BlogCrew.kickoff
+
+    def research_kickoff(self, task, stage):
+        # Every section's researcher scrapes the same documentation page
+        if stage == 'research':
+            return scrape(URL)
+        return kickoff(self, task, stage)
+
+    monkeypatch.setattr(WebSearchTools, 'fetch_page', staticmethod(fetch_page))
+    monkeypatch.setattr(BlogCrew, 'kickoff', research_kickoff)
+    checkpoints = CheckpointStore(base_dir=crew.runs_dir)
+    checkpoints.start(crew.topic)
+    outputs = crew.run_dag(checkpoints)
+
+    sections = [part for part in outputs['research'].split('\n## ') if part.strip()]
+    assert len(sections) == 6
+    assert all(PAGE in section for section in sections)
+    assert fetches == [URL]
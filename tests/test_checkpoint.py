@@ -0,0 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from crew.checkpoint import CheckpointStore
+
+
+def test_saved_stages_are_restored_by_a_new_store(tmp_path):
+    store = CheckpointStore(base_dir=str(tmp_path))
+    assert not store.exists()
+    store.start('Atlas Search')
+    store.save('plan', '# Outline', 'outline.md')
+    store.save('research', 'Notes', 'research.md')
+
+    resumed = CheckpointStore(store.run_id, base_dir=str(tmp_path))
+    assert resumed.exists()
+    assert resumed.topic() == 'Atlas Search'
+    assert resumed.completed_stages() == ['plan', 'research']
+    assert resumed.load('plan') == '# Outline'
+    assert resumed.load('write') is None
+
+
+def test_start_keeps_the_parameters_of_an_existing_run(tmp_path):
+    store = CheckpointStore(base_dir=str(tmp_path))
+    store.start('Atlas Search')
+    store.start(None)
+    assert store.topic() == 'Atlas Search'
+
+
+def test_mark_saved_records_the_post(tmp_path):
+    store = CheckpointStore(base_dir=str(tmp_path))
+    store.start(None)
+    assert store.saved_blog() is None
+    store.mark_saved('data/blogs/post.md')
+    assert CheckpointStore(store.run_id, base_dir=str(tmp_path)).saved_blog() == 'data/blogs/post.md'
+
+
+def test_concurrent_saves_keep_every_stage(tmp_path):
+    store = CheckpointStore(base_dir=str(tmp_path))
+    store.start(None)
+    stages = [f"stage-{idx}" for idx in range(40)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda stage: store.save(stage, stage * 100), stages))
+    assert sorted(store.completed_stages()) == sorted(stages)
+    assert not [path for path in (tmp_path / store.run_id).iterdir() if path.name.endswith('.tmp')]
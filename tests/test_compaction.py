@@ -0,0 +1,121 @@
+import threading
+
+from crew.compaction import ContextCompactor, count_tokens, strip_boilerplate, truncate_to_budget
+
+SCRAPED = """Source: https://example.com/post
+Skip to content
+Sign in
+Menu
+
+# Vector search
+
+Atlas Vector Search indexes embeddings next to your data.
+
+Share this
+Subscribe to our newsletter
+Source: https://example.com/post
+
+```python
+Menu
+Menu
+Menu
+```
+
+Follow us on Twitter
+Follow us on Twitter
+Follow us on Twitter
+© 2026 Example Inc.
+Next"""
+
+DRAFT = """# Getting started
+
+Run this:
+
+```bash
+pip install pymongo
+```
+
+**Output:**
+
+Connected.
+
+Run this:
+
+```bash
+python seed.py
+```
+
+**Output:**
+
+Seeded.
+
+Run this:
+
+**Output:**
+
+Done.
+
+Source: https://example.com/docs
+Source: https://example.com/docs
+
+Next"""
+
+
+def test_strip_boilerplate_removes_page_chrome():
+    text = strip_boilerplate(SCRAPED)
+    assert text.count('Source: https://example.com/post') == 1
+    for chrome in ('Skip to content', 'Sign in', 'Share this', 'Subscribe', 'Follow us', '©', 'Next'):
+        assert chrome not in text
+    assert 'Atlas Vector Search indexes embeddings next to your data.' in text
+    assert '# Vector search' in text
+
+
+def test_strip_boilerplate_leaves_code_blocks_alone():
+    assert '```python\nMenu\nMenu\nMenu\n```' in strip_boilerplate(SCRAPED)
+
+
+def test_strip_boilerplate_collapses_blank_lines():
+    assert '\n\n\n' not in strip_boilerplate('a line of text\n\n\n\nanother line of text')
+
+
+def test_sources_only_keeps_repeated_content_lines():
+    text = strip_boilerplate(DRAFT, sources_only=True)
+    assert text.count('Run this:') == 3
+    assert text.count('**Output:**') == 3
+    assert text.endswith('Next')
+    assert text.count('Source: https://example.com/docs') == 1
+
+
+def test_edit_stage_is_cleaned_but_never_truncated():
+    compactor = ContextCompactor({'edit': 10})
+    text = compactor.compact('edit', DRAFT, truncate=False, boilerplate=False)
+    assert text.count('Run this:') == 3
+    assert compactor.report['edit']['tokens_before'] > compactor.report['edit']['tokens_after']
+
+
+def test_truncate_to_budget_keeps_whole_paragraphs():
+    text = '\n\n'.join(f"Paragraph {idx} " + 'word ' * 30 for idx in range(10))
+    truncated = truncate_to_budget(text, 100)
+    assert truncated.startswith('Paragraph 0')
+    assert all(paragraph.startswith('Paragraph') for paragraph in truncated.split('\n\n'))
+    assert len(truncated) < len(text)
+    assert truncate_to_budget('short', 100) == 'short'
+
+
+def test_evidence_without_budget_left_falls_back_to_no_chunks():
+    compactor = ContextCompactor({'write': 100})
+    evidence = [{'title': 'Intro', 'chunks': ['a ' * 50]}, {'title': 'Usage', 'chunks': ['b ' * 50]}]
+    compacted = compactor.compact_evidence('write', evidence, 'a ' * 50 + 'b ' * 50, reserved=100)
+    assert [section['chunks'] for section in compacted] == [[], []]
+
+
+def test_concurrent_compaction_counts_every_call():
+    compactor = ContextCompactor({'write': 1000})
+    text = 'Indexes speed up queries on large collections.'
+    threads = [threading.Thread(target=lambda: [compactor.compact('write', text) for _ in range(50)])
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert compactor.report['write']['tokens_before'] == 400 * count_tokens(text)
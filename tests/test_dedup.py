@@ -0,0 +1,68 @@
+from tools.dedup import DuplicateTracker, canonical_url, hamming_distance, simhash
+
+ARTICLE = (
+    "MongoDB Atlas Vector Search lets you store embeddings next to your operational data "
+    "and query them with the $vectorSearch aggregation stage. Indexes support cosine, "
+    "euclidean and dot product similarity and can be quantized to save memory."
+)
+
+
+def test_canonical_url_drops_trivial_differences():
+    assert canonical_url('https://www.mongodb.com/docs/atlas/') == 'mongodb.com/docs/atlas'
+    assert canonical_url('http://mongodb.com/docs/atlas/index.html#intro') == 'mongodb.com/docs/atlas'
+    assert canonical_url('https://m.example.com:443/post/amp') == 'example.com/post'
+    assert canonical_url('https://example.com:8080/') == 'example.com:8080/'
+
+
+def test_canonical_url_drops_tracking_parameters_and_sorts_the_rest():
+    url = 'https://example.com/a?utm_source=x&b=2&gclid=1&a=1&UTM_Campaign=y&fbclid=z'
+    assert canonical_url(url) == 'example.com/a?a=1&b=2'
+
+
+def test_canonical_url_keeps_meaningful_parameters():
+    assert canonical_url('https://github.com/a/b/blob/x?ref=main') == 'github.com/a/b/blob/x?ref=main'
+    assert canonical_url('https://x.com/p?source=docs&src=a&reference=1&cmpid=2') == \
+        'x.com/p?cmpid=2&reference=1&source=docs&src=a'
+    assert canonical_url('https://x.com/p?ref=main') != canonical_url('https://x.com/p?ref=dev')
+
+
+def test_simhash_is_stable_and_tolerates_small_edits():
+    assert simhash(ARTICLE) == simhash(ARTICLE)
+    assert hamming_distance(simhash(ARTICLE), simhash(ARTICLE.upper())) == 0
+    edited = ARTICLE.replace('save memory', 'save a lot of memory')
+    assert hamming_distance(simhash(ARTICLE), simhash(edited)) <= 10
+
+
+def test_simhash_separates_unrelated_text():
+    other = ("Time series collections store sequences of measurements efficiently, with automatic "
+             "bucketing by time and metadata fields and secondary indexes on the measurements.")
+    assert hamming_distance(simhash(ARTICLE), simhash(other)) > 3
+
+
+def test_tracker_drops_mirrored_results_and_avoids_their_fetch():
+    tracker = DuplicateTracker()
+    results = [
+        {'link': 'https://www.mongodb.com/docs/atlas/', 'title': 'Atlas', 'snippet': ARTICLE},
+        {'link': 'https://mongodb.com/docs/atlas?utm_source=feed', 'title': 'Atlas', 'snippet': 'other'},
+        {'link': 'https://mirror.example.org/atlas', 'title': 'Atlas', 'snippet': ARTICLE},
+    ]
+    kept = tracker.filter_results(results)
+    assert [result['link'] for result in kept] == ['https://www.mongodb.com/docs/atlas/']
+    assert tracker.claim_page('https://www.mongodb.com/docs/atlas/') is None
+    tracker.add_page('https://www.mongodb.com/docs/atlas/', ARTICLE)
+    assert tracker.claim_page('https://mirror.example.org/atlas') == ('https://www.mongodb.com/docs/atlas/', ARTICLE)
+    assert tracker.stats() == {'results_dropped': 2, 'fetches_avoided': 1, 'pages_duplicate': 0}
+
+
+def test_tracker_reports_near_duplicate_pages():
+    tracker = DuplicateTracker()
+    assert tracker.add_page('https://a.example/post', ARTICLE) is None
+    assert tracker.add_page('https://b.example/copy', ARTICLE + ' ') == 'https://a.example/post'
+
+
+def test_tracker_hands_a_failed_claim_to_the_next_caller():
+    tracker = DuplicateTracker()
+    assert tracker.claim_page('https://a.example/post') is None
+    tracker.release_page('https://a.example/post')
+    assert tracker.claim_page('https://www.a.example/post/') is None
+    assert tracker.stats()['fetches_avoided'] == 0
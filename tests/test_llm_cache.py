@@ -0,0 +1,93 @@
+import pytest
+
+from agents.llm import CachedLLM, LLMCache, LLMCacheMiss, create_llm, make_keys
+
+PROMPT = [
+    {'role': 'system', 'content': 'You are a writer.'},
+    {'role': 'user', 'content': 'Write   about\n   Atlas Search.'},
+]
+
+
+class FakeProvider:
+    def __init__(self, function_calling=True):
+        self.calls = 0
+        self.stop = []
+        self.function_calling = function_calling
+
+    def call(self, messages, **kwargs):
+        self.calls += 1
+        return f"response {self.calls}"
+
+    def supports_function_calling(self):
+        return self.function_calling
+
+
+def make_llm(tmp_path, mode, temperature=0, provider=None):
+    llm = CachedLLM('gpt-4o-mini', temperature, mode=mode, cache=LLMCache(str(tmp_path / 'llm.sqlite')))
+    llm._llm = provider or FakeProvider()
+    return llm
+
+
+def test_keys_ignore_whitespace_but_not_content():
+    reformatted = [{'role': 'system', 'content': ' You are a writer. '},
+                   {'role': 'user', 'content': 'Write about Atlas Search.'}]
+    assert make_keys('m', 0, PROMPT) == make_keys('m', 0, reformatted)
+    assert make_keys('m', 0, PROMPT)[0] != make_keys('m', 0.2, PROMPT)[0]
+    assert make_keys('m', 0, PROMPT)[0] != make_keys('m', 0, PROMPT, stop=['Observation:'])[0]
+
+
+def test_conversation_key_covers_the_task_prompt_only():
+    follow_up = PROMPT + [{'role': 'assistant', 'content': 'Action: Web Search'},
+                          {'role': 'user', 'content': 'Observation: results'}]
+    key, conversation_key, turn = make_keys('m', 0, follow_up)
+    assert key != make_keys('m', 0, PROMPT)[0]
+    assert conversation_key == make_keys('m', 0, PROMPT)[1]
+    assert turn == 1
+
+
+def test_dedupe_reuses_temperature_zero_responses(tmp_path):
+    llm = make_llm(tmp_path, 'dedupe')
+    assert llm.call(PROMPT) == 'response 1'
+    assert llm.call(PROMPT) == 'response 1'
+    assert llm._llm.calls == 1
+    assert llm.cache.stats()['hits'] == 1
+
+
+def test_dedupe_never_caches_sampled_responses(tmp_path):
+    llm = make_llm(tmp_path, 'dedupe', temperature=0.7)
+    assert llm.call(PROMPT) == 'response 1'
+    assert llm.call(PROMPT) == 'response 2'
+
+
+def test_replay_serves_recordings_and_falls_back_by_turn(tmp_path):
+    recorder = make_llm(tmp_path, 'record', temperature=0.3)
+    recorder.call(PROMPT)
+    recorder.call(PROMPT + [{'role': 'assistant', 'content': 'a'}, {'role': 'user', 'content': 'Observation: x'}])
+
+    replayer = make_llm(tmp_path, 'replay', temperature=0.3, provider=FakeProvider())
+    replayer.cache = recorder.cache
+    assert replayer.call(PROMPT) == 'response 1'
+    # A different tool output falls back to the response recorded for the same turn
+    changed = PROMPT + [{'role': 'assistant', 'content': 'a'}, {'role': 'user', 'content': 'Observation: y'}]
+    assert replayer.call(changed) == 'response 2'
+    assert replayer._llm.calls == 0
+    with pytest.raises(LLMCacheMiss):
+        replayer.call([{'role': 'user', 'content': 'never recorded'}])
+
+
+def test_function_calling_is_only_disabled_when_recording_or_replaying(tmp_path):
+    assert make_llm(tmp_path, 'dedupe').supports_function_calling()
+    assert not make_llm(tmp_path, 'dedupe', provider=FakeProvider(False)).supports_function_calling()
+    assert not make_llm(tmp_path, 'record').supports_function_calling()
+    assert not make_llm(tmp_path, 'replay').supports_function_calling()
+
+
+def test_create_llm_wraps_only_the_agents_that_are_cached(tmp_path, monkeypatch):
+    monkeypatch.setenv('LLM_CACHE_PATH', str(tmp_path / 'llm.sqlite'))
+    monkeypatch.setenv('LLM_CACHE_MODE', 'dedupe')
+    assert isinstance(create_llm(0, 10), CachedLLM)
+    assert not isinstance(create_llm(0.4, 10), CachedLLM)
+    monkeypatch.setenv('LLM_CACHE_MODE', 'record')
+    assert isinstance(create_llm(0.4, 10), CachedLLM)
+    monkeypatch.setenv('LLM_CACHE_MODE', 'off')
+    assert not isinstance(create_llm(0, 10), CachedLLM)
@@ -0,0 +1,117 @@
+import logging
+import os
+import queue
+import time
+
+from config.logging_config import EnqueueHandler, LogWriter, RotatingLogFile, parse_levels
+
+
+def make_record(message: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord('tests', level, __file__, 1, message, None, None)
+
+
+def write(handler: RotatingLogFile, count: int, size: int = 100) -> None:
+    for idx in range(count):
+        handler.emit(make_record(f"{idx:05d} " + 'x' * size))
+    handler.flush()
+
+
+def test_size_rotation_prunes_only_its_own_backups(tmp_path):
+    legacy = [tmp_path / 'blog_generator_2025-01-16.log', tmp_path / 'blog_generator_2025-01-18.log',
+              tmp_path / 'other.log']
+    for path in legacy:
+        path.write_text('kept\n')
+
+    handler = RotatingLogFile(str(tmp_path / 'blog_generator.log'), max_bytes=1000, backup_count=2)
+    write(handler, 100)
+    handler.close()
+
+    assert all(path.read_text() == 'kept\n' for path in legacy)
+    backups = handler.backups()
+    assert len(backups) == 2
+    assert all(os.path.basename(path).startswith('blog_generator.log.') for path in backups)
+    assert os.path.getsize(tmp_path / 'blog_generator.log') < 1000 + 200
+
+
+def test_backups_of_one_period_get_numbered_suffixes(tmp_path):
+    handler = RotatingLogFile(str(tmp_path / 'app.log'), max_bytes=500, backup_count=10)
+    write(handler, 20)
+    handler.close()
+    names = sorted(os.path.basename(path) for path in handler.backups())
+    period = handler.period
+    assert names[0] == f"app.log.{period}"
+    assert f"app.log.{period}.1" in names
+
+
+def test_a_new_period_rotates_the_file(tmp_path):
+    handler = RotatingLogFile(str(tmp_path / 'app.log'), max_bytes=0, when='midnight')
+    write(handler, 1)
+    handler.period = '2020-01-01'
+    write(handler, 1)
+    handler.close()
+    assert (tmp_path / 'app.log.2020-01-01').exists()
+    assert len((tmp_path / 'app.log').read_text().splitlines()) == 1
+
+
+def test_a_file_left_from_an_earlier_period_is_rotated_on_first_record(tmp_path):
+    path = tmp_path / 'app.log'
+    path.write_text('old\n')
+    old = time.mktime((2020, 1, 1, 12, 0, 0, 0, 0, -1))
+    os.utime(path, (old, old))
+
+    handler = RotatingLogFile(str(path), when='midnight')
+    assert (tmp_path / 'app.log').read_text() == 'old\n'  # Nothing happens before the first record
+    write(handler, 1)
+    handler.close()
+    assert (tmp_path / 'app.log.2020-01-01').read_text() == 'old\n'
+
+
+def test_the_file_is_only_created_with_the_first_record(tmp_path):
+    handler = RotatingLogFile(str(tmp_path / 'app.log'))
+    handler.close()
+    assert not (tmp_path / 'app.log').exists()
+
+
+def test_parse_levels():
+    assert parse_levels('tools=WARNING, crew.blog_crew=debug,root=10,bad,x=') == {
+        'tools': logging.WARNING, 'crew.blog_crew': logging.DEBUG, 'root': 10,
+    }
+
+
+def test_writer_dispatches_by_handler_level_and_flushes_at_stop():
+    class Collect(logging.Handler):
+        def __init__(self, level):
+            super().__init__(level)
+            self.messages = []
+            self.flushes = 0
+
+        def emit(self, record):
+            self.messages.append(record.getMessage())
+
+        def flush(self):
+            self.flushes += 1
+
+    records = queue.SimpleQueue()
+    everything, errors = Collect(logging.DEBUG), Collect(logging.ERROR)
+    writer = LogWriter(records, [everything, errors], batch_size=1000, flush_interval=60)
+    writer.start()
+    records.put(make_record('info'))
+    records.put(make_record('error', logging.ERROR))
+    writer.stop()
+    assert everything.messages == ['info', 'error']
+    assert errors.messages == ['error']
+    assert everything.flushes >= 1
+
+
+def test_messages_with_mutable_arguments_are_formatted_when_logged():
+    records = queue.SimpleQueue()
+    handler = EnqueueHandler(records)
+    metadata = {'title': 'Draft'}
+    handler.handle(logging.LogRecord('tests', logging.INFO, __file__, 1, "Created metadata: %s", (metadata,), None))
+    handler.handle(logging.LogRecord('tests', logging.INFO, __file__, 1, "Saved %s in %.1fs", ('post.md', 1.5), None))
+    metadata['title'] = 'Final'
+
+    mutable, immutable = records.get(), records.get()
+    assert (mutable.msg, mutable.args) == ("Created metadata: {'title': 'Draft'}", None)
+    assert immutable.args == ('post.md', 1.5)
+    assert immutable.getMessage() == "Saved post.md in 1.5s"
@@ -0,0 +1,143 @@
+import os
+
+import pytest
+
+mongomock = pytest.importorskip('mongomock')
+
+from storage.mongo_store import MongoBlogStore
+
+POST = """---
+date: '{date}'
+description: {title} in practice
+tags:
+- mongodb
+title: {title}
+---
+
+# {title}
+
+Body of the post about {title}.
+"""
+
+
+@pytest.fixture
+def store():
+    return MongoBlogStore(client=mongomock.MongoClient())
+
+
+def write_post(directory, name, title, date):
+    with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+        f.write(POST.format(title=title, date=date))
+
+
+def test_save_keeps_posts_with_the_same_title_under_new_slugs(store):
+    first = store.save("First body", {'title': 'Atlas Vector Search', 'date': '2025-01-02'})
+    second = store.save("Second body", {'title': 'Atlas Vector Search', 'date': '2025-01-03'})
+
+    assert first != second
+    assert store.load(first) == ({'title': 'Atlas Vector Search', 'date': '2025-01-02',
+                                  'slug': 'atlas-vector-search', 'tags': []}, "First body")
+    assert store.load(second)[0]['slug'] == 'atlas-vector-search-2'
+    assert store.count() == 2
+
+
+def test_save_stores_artifacts_per_post(store):
+    post_id = store.save("Body", {'title': 'Time Series', 'run_id': 'run-1'},
+                         {'outline': '# Outline', 'research': 'Notes', 'draft': 'Draft'})
+    other_id = store.save("Body", {'title': 'Change Streams'}, {'outline': '# Other outline'})
+
+    assert store.artifacts(post_id) == {'outline': '# Outline', 'research': 'Notes', 'draft': 'Draft'}
+    assert store.artifacts(other_id) == {'outline': '# Other outline'}
+    assert store.artifact_docs.count_documents({'run_id': 'run-1'}) == 3
+
+
+def test_load_and_exists_reject_unknown_ids(store):
+    assert not store.exists('not-an-object-id')
+    assert not store.exists('6ad4777c82fb57406b253418')
+    with pytest.raises(KeyError):
+        store.load('6ad4777c82fb57406b253418')
+
+
+def test_list_is_newest_first_then_by_title_and_paginates(store):
+    for title, date in [('Bravo', '2025-01-02'), ('Alpha', '2025-01-02'), ('Charlie', '2025-01-05'),
+                        ('Delta', '2025-01-01')]:
+        store.save(f"About {title}", {'title': title, 'date': date, 'tags': ['mongodb']})
+
+    listing = store.list()
+    assert [entry['title'] for entry in listing] == ['Charlie', 'Alpha', 'Bravo', 'Delta']
+    assert listing[0] == {'id': listing[0]['id'], 'title': 'Charlie', 'date': '2025-01-05',
+                          'tags': ['mongodb'], 'description': ''}
+    assert [entry['title'] for entry in store.list(limit=2)] == ['Charlie', 'Alpha']
+    assert [entry['title'] for entry in store.list(limit=2, offset=2)] == ['Bravo', 'Delta']
+    assert store.list(limit=2, offset=4) == []
+
+
+class RecordingCursor:
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = []
+
+    def sort(self, *args):
+        self.calls.append(('sort', args))
+        return self
+
+    def limit(self, limit):
+        self.calls.append(('limit', limit))
+        return self
+
+    def __iter__(self):
+        return iter(self.docs)
+
+
+def test_search_ranks_by_the_text_index(store, monkeypatch):
+    # mongomock does not evaluate $text, so the query sent to the text index is checked
+    index = store.posts.index_information()['post_text']
+    assert [field for field, kind in index['key']] == ['title', 'description', 'content']
+    assert {kind for field, kind in index['key']} == {'text'}
+
+    post_id = store.save("Vector search body", {'title': 'Vector Search', 'date': '2025-01-02'})
+    doc = store.posts.find_one({})
+    cursor = RecordingCursor([{**doc, 'score': 2.5}])
+    queries = []
+
+    def find(query, projection):
+        queries.append((query, projection))
+        return cursor
+
+    monkeypatch.setattr(store.posts, 'find', find)
+    results = store.search('vector search', limit=5)
+
+    assert [result['id'] for result in results] == [post_id]
+    assert queries[0][0] == {'$text': {'$search': 'vector search'}}
+    assert queries[0][1]['score'] == {'$meta': 'textScore'}
+    assert cursor.calls == [('sort', ([('score', {'$meta': 'textScore'})],)), ('limit', 5)]
+
+
+@pytest.mark.skipif(not os.getenv('MONGODB_TEST_URI'), reason="set MONGODB_TEST_URI to test against a mongod")
+def test_search_against_mongod():
+    store = MongoBlogStore(uri=os.environ['MONGODB_TEST_URI'], database='mongodb_blog_writer_test')
+    store.client.drop_database('mongodb_blog_writer_test')
+    store.ensure_indexes()
+    try:
+        store.save("Sharding spreads data across shards.", {'title': 'Sharding Basics'})
+        store.save("Build a vector search index on embeddings.", {'title': 'Vector Search'})
+        assert [result['title'] for result in store.search('vector')] == ['Vector Search']
+    finally:
+        store.client.drop_database('mongodb_blog_writer_test')
+
+
+def test_import_files_bulk_inserts_new_posts_only(store, tmp_path):
+    write_post(tmp_path, 'atlas-search.md', 'Atlas Search', '2025-01-10')
+    write_post(tmp_path, 'time-series.md', 'Time Series', '2025-01-11')
+    (tmp_path / 'notes.txt').write_text('not a post')
+
+    assert store.import_files(str(tmp_path)) == {'imported': 2, 'skipped': 0}
+    assert [entry['title'] for entry in store.list()] == ['Time Series', 'Atlas Search']
+    metadata, content = store.load(store.list()[0]['id'])
+    assert metadata['slug'] == 'time-series'
+    assert metadata['description'] == 'Time Series in practice'
+    assert 'Body of the post about Time Series.' in content
+
+    write_post(tmp_path, 'change-streams.md', 'Change Streams', '2025-01-12')
+    assert store.import_files(str(tmp_path)) == {'imported': 1, 'skipped': 2}
+    assert store.count() == 3
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from tools.ranking import SourceRanker, parse_result_date
+
+NOW = datetime(2026, 1, 31)
+
+
+def make_ranker():
+    return SourceRanker(tiers=[
+        (0.6, ['medium.com/tag/mongodb', 'dev.to/t/mongodb']),
+        (1.0, ['mongodb.com/docs', 'www.mongodb.com/blog', 'github.com/mongodb']),
+        (1.2, ['mongodb.com/docs/atlas']),
+        (-1.0, ['spam.example']),
+    ])
+
+
+def test_source_weight_uses_the_longest_matching_prefix():
+    ranker = make_ranker()
+    assert ranker.source_weight('https://www.mongodb.com/docs/manual/indexes/') == 1.0
+    assert ranker.source_weight('https://www.mongodb.com/docs/atlas/atlas-vector-search/') == 1.2
+    assert ranker.source_weight('https://mongodb.com/blog/post/x') == 1.0
+
+
+def test_source_weight_matches_whole_path_segments_only():
+    ranker = make_ranker()
+    assert ranker.source_weight('https://www.mongodb.com/docsearch') == 0.0
+    assert ranker.source_weight('https://github.com/mongodb-labs/tool') == 0.0
+    assert ranker.source_weight('https://medium.com/tag/mongodb/latest') == 0.6
+
+
+def test_source_weight_matches_subdomains_but_not_lookalike_hosts():
+    ranker = make_ranker()
+    assert ranker.source_weight('https://blog.spam.example/post') == -1.0
+    assert ranker.source_weight('https://notspam.example/post') == 0.0
+    assert ranker.source_weight('https://example.com/') == 0.0
+    assert ranker.source_weight('not a url') == 0.0
+
+
+def test_rank_prefers_trusted_and_recent_sources():
+    ranker = make_ranker()
+    results = [
+        {'link': 'https://spam.example/a', 'date': '1 day ago'},
+        {'link': 'https://dev.to/t/mongodb/post', 'date': 'Jan 30, 2026'},
+        {'link': 'https://www.mongodb.com/docs/manual/', 'date': '2 years ago'},
+        {'link': 'https://www.mongodb.com/docs/atlas/', 'date': '3 days ago'},
+    ]
+    ranked = ranker.rank(results, now=NOW)
+    assert [result['link'] for result in ranked][0] == 'https://www.mongodb.com/docs/atlas/'
+    assert ranked[-1]['link'] == 'https://spam.example/a'
+    assert len(ranker.rank(results, limit=2, now=NOW)) == 2
+
+
+def test_parse_result_date():
+    assert parse_result_date('3 days ago', NOW) == datetime(2026, 1, 28)
+    assert parse_result_date('Jan 5, 2025', NOW) == datetime(2025, 1, 5)
+    assert parse_result_date('2025-06-01', NOW) == datetime(2025, 6, 1)
+    assert parse_result_date('sometime', NOW) is None
+    assert parse_result_date('', NOW) is None
@@ -0,0 +1,101 @@
+import threading
+import time
+
+import pytest
+
+from crew.scheduler import DagScheduler
+
+
+@pytest.fixture(params=[False, True], ids=['parallel', 'sequential'])
+def scheduler(request):
+    return DagScheduler(max_workers=4, sequential=request.param)
+
+
+def test_steps_run_after_their_dependencies(scheduler):
+    order = []
+    lock = threading.Lock()
+
+    def step(name):
+        def run(results):
+            with lock:
+                order.append(name)
+            return name
+        return run
+
+    scheduler.add('write', step('write'), deps=['plan', 'research'])
+    scheduler.add('research', step('research'), deps=['plan'])
+    scheduler.add('plan', step('plan'))
+    results = scheduler.run()
+    assert results == {'plan': 'plan', 'research': 'research', 'write': 'write'}
+    assert order == ['plan', 'research', 'write']
+
+
+def test_running_steps_can_add_steps(scheduler):
+    def plan(results):
+        for idx in range(3):
+            scheduler.add(f"section:{idx}", lambda results, idx=idx: idx * 10, deps=['plan'], group='section')
+        scheduler.add('join', lambda results: sum(results[f"section:{idx}"] for idx in range(3)),
+                      deps=[f"section:{idx}" for idx in range(3)])
+        return 'outline'
+
+    scheduler.add('plan', plan)
+    assert scheduler.run()['join'] == 30
+    assert scheduler.report()['groups']['section']['steps'] == 3
+
+
+def test_first_failure_is_raised_and_dependents_never_run(scheduler):
+    ran = []
+
+    def fail(results):
+        raise ValueError('research failed')
+
+    scheduler.add('plan', lambda results: 'outline')
+    scheduler.add('research', fail, deps=['plan'])
+    scheduler.add('write', lambda results: ran.append('write'), deps=['research'])
+    with pytest.raises(ValueError, match='research failed'):
+        scheduler.run()
+    assert ran == []
+    assert [entry['status'] for entry in scheduler.trace if entry['step'] == 'research'] == ['error']
+
+
+def test_failure_stops_new_steps_but_lets_running_ones_finish():
+    scheduler = DagScheduler(max_workers=2)
+    finished = []
+
+    def slow(results):
+        time.sleep(0.2)
+        finished.append('slow')
+
+    def fail(results):
+        raise RuntimeError('boom')
+
+    scheduler.add('slow', slow)
+    scheduler.add('fail', fail)
+    scheduler.add('after', lambda results: finished.append('after'), deps=['slow'])
+    with pytest.raises(RuntimeError, match='boom'):
+        scheduler.run()
+    assert finished == ['slow']
+
+
+def test_unmet_dependencies_are_reported(scheduler):
+    scheduler.add('write', lambda results: None, deps=['missing'])
+    with pytest.raises(RuntimeError, match='write'):
+        scheduler.run()
+
+
+def test_duplicate_steps_are_rejected():
+    scheduler = DagScheduler()
+    scheduler.add('plan', lambda results: None)
+    with pytest.raises(ValueError):
+        scheduler.add('plan', lambda results: None)
+
+
+def test_report_measures_overlap_between_groups():
+    scheduler = DagScheduler(max_workers=2)
+    scheduler.add('research', lambda results: time.sleep(0.2), group='research')
+    scheduler.add('write', lambda results: time.sleep(0.2), group='write')
+    scheduler.run()
+    report = scheduler.report()
+    assert report['overlaps']['research/write'] > 0.1
+    assert report['parallelism'] > 1.5
+    assert len(scheduler.format_trace().splitlines()) == 2
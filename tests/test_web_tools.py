@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+
+from tools.dedup import reset_dedup_tracker
+from tools.web_tools import WebSearchTools
+
+URL = 'https://www.mongodb.com/docs/manual/core/timeseries-collections/'
+
+
+@pytest.fixture(autouse=True)
+def tracker():
+    yield reset_dedup_tracker()
+    reset_dedup_tracker()
+
+
+def scrape_concurrently(urls):
+    results = [None] * len(urls)
+
+    def scrape(idx, url):
+        try:
+            results[idx] = WebSearchTools.scrape_once(url)
+        except Exception as e:
+            results[idx] = e
+
+    threads = [threading.Thread(target=scrape, args=(idx, url)) for idx, url in enumerate(urls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_scrapes_of_one_page_fetch_once_and_both_get_the_text(monkeypatch, tracker):
+    calls = []
+
+    def fetch_page(url):
+        calls.append(url)
+        time.sleep(0.2)
+        return f"Source: {url}\n\nTime series collections"
+
+    monkeypatch.setattr(WebSearchTools, 'fetch_page', staticmethod(fetch_page))
+    results = scrape_concurrently([URL, URL + '?utm_source=newsletter'])
+
+    assert calls == [URL] or calls == [URL + '?utm_source=newsletter']
+    assert results[0] == results[1] == f"Source: {calls[0]}\n\nTime series collections"
+    assert tracker.stats()['fetches_avoided'] == 1
+
+
+def test_waiting_scrape_fetches_the_page_itself_when_the_first_fetch_fails(monkeypatch):
+    calls = []
+
+    def fetch_page(url):
+        calls.append(url)
+        time.sleep(0.2)
+        if len(calls) == 1:
+            raise ConnectionError('reset by peer')
+        return 'Time series collections'
+
+    monkeypatch.setattr(WebSearchTools, 'fetch_page', staticmethod(fetch_page))
+    results = scrape_concurrently([URL, URL])
+
+    assert len(calls) == 2
+    assert [result for result in results if isinstance(result, str)] == ['Time series collections']
+    assert any(isinstance(result, ConnectionError) for result in results)
+
+
+def test_scrape_once_returns_the_text_of_a_page_scraped_earlier_in_the_run(monkeypatch):
+    monkeypatch.setattr(WebSearchTools, 'fetch_page', staticmethod(lambda url: 'Time series collections'))
+    assert WebSearchTools.scrape_once(URL) == 'Time series collections'
+    monkeypatch.setattr(WebSearchTools, 'fetch_page', staticmethod(lambda url: pytest.fail('fetched twice')))
+    assert WebSearchTools.scrape_once('http://mongodb.com/docs/manual/core/timeseries-collections') == \
+        'Time series collections'
@@ -3,5 +3,20 @@ Web search and scraping tools for content gathering
 """
 
 from .web_tools import WebSearchTools
+from .search_cache import SearchCache, get_search_cache
+from .scrape_cache import ScrapeCache, get_scrape_cache
+from .http_client import HttpClient, PayloadRejected, get_http_client
+from .knowledge_base import KnowledgeBase, get_knowledge_base
 
-__all__ = ['WebSearchTools']
\ No newline at end of file
+__all__ = [
+    'WebSearchTools',
+    'SearchCache',
+    'get_search_cache',
+    'ScrapeCache',
+    'get_scrape_cache',
+    'HttpClient',
+    'PayloadRejected',
+    'get_http_client',
+    'KnowledgeBase',
+    'get_knowledge_base'
+]
\ No newline at end of file
@@ -0,0 +1,203 @@
+import re
+import threading
+from hashlib import blake2b
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+from config.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+# Query parameters that only track where a click came from. Names such as
+# ``ref`` or ``source`` are left alone, since some sites use them for content
+# (e.g. a branch on GitHub).
+TRACKING_PARAM_PREFIXES = ('utm_',)
+TRACKING_PARAMS = frozenset(('ref_src', 'gclid', 'fbclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid',
+                             '_hsenc', '_hsmi', 'igshid', 'trk', 'sc_channel', 'cmp'))
+HOST_PREFIXES = ('www.', 'm.', 'amp.')
+INDEX_PAGES = ('/index.html', '/index.htm', '/index.php')
+
+SIMHASH_BITS = 64
+# Fingerprints this many bits apart or closer are treated as the same content
+NEAR_DUPLICATE_DISTANCE = 3
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def is_tracking_param(key: str) -> bool:
+    key = key.lower()
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PARAM_PREFIXES)
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL so trivially different links to the same page compare equal.
+
+    Drops the scheme, ``www.``/``m.``/``amp.`` host prefixes, default ports,
+    fragments, tracking parameters, index pages and trailing slashes, and
+    sorts the remaining query parameters.
+    """
+    parsed = urlparse(url.strip())
+    host = parsed.hostname or ''
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+
+    path = parsed.path
+    for index_page in INDEX_PAGES:
+        if path.endswith(index_page):
+            path = path[:-len(index_page)]
+    if path.endswith('/amp'):
+        path = path[:-len('/amp')]
+    path = path.rstrip('/') or '/'
+
+    params = sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not is_tracking_param(key)
+    )
+    query = urlencode(params)
+    return f"{host}{path}" + (f"?{query}" if query else '')
+
+
+def simhash(text: str, bits: int = SIMHASH_BITS) -> int:
+    """SimHash fingerprint of the word 3-shingles of ``text``"""
+    words = WORD_PATTERN.findall(text.lower())
+    shingles = [' '.join(words[i:i + 3]) for i in range(max(1, len(words) - 2))]
+    weights = [0] * bits
+    for shingle in shingles:
+        value = int.from_bytes(blake2b(shingle.encode('utf-8'), digest_size=bits // 8).digest(), 'big')
+        for bit in range(bits):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class _PageClaim:
+    """A page claimed for fetching; ``text`` is set and ``done`` signalled once it was fetched"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.text = None
+        self.done = threading.Event()
+
+
+class DuplicateTracker:
+    """Run-scoped record of the search results and pages seen so far.
+
+    Search results are deduplicated by canonical URL and by a SimHash of their
+    title and snippet, which catches syndicated copies and mirrors. Pages are
+    claimed by canonical URL before they are fetched and keep their text, so a
+    second request for the same page (or a result that was dropped as a mirror
+    of it) is served that text instead of being sent again; scraped pages whose
+    content is a near duplicate of an earlier page are counted.
+    """
+
+    def __init__(self, distance: int = NEAR_DUPLICATE_DISTANCE):
+        self.distance = distance
+        self.results_dropped = 0
+        self.fetches_avoided = 0
+        self.pages_duplicate = 0
+        self._aliases = {}
+        self._pages = {}
+        self._fingerprints = []
+        self._lock = threading.Lock()
+
+    def _find_near(self, fingerprint: int, fingerprints: list) -> Optional[str]:
+        for other, url in fingerprints:
+            if hamming_distance(fingerprint, other) <= self.distance:
+                return url
+        return None
+
+    def filter_results(self, results: List[dict]) -> List[dict]:
+        """Drop results that repeat an earlier result of the same search"""
+        unique = []
+        seen_urls = {}
+        fingerprints = []
+        for result in results:
+            link = result.get('link', '')
+            key = canonical_url(link)
+            original = seen_urls.get(key)
+            if original is None:
+                fingerprint = simhash(f"{result.get('title', '')} {result.get('snippet', '')}")
+                original = self._find_near(fingerprint, fingerprints)
+            if original is not None:
+                logger.debug("Dropping duplicate search result %s of %s", link, original)
+                with self._lock:
+                    self.results_dropped += 1
+                    # Scraping the dropped copy later is served by the kept one
+                    self._aliases.setdefault(key, original)
+                continue
+            seen_urls[key] = link
+            fingerprints.append((fingerprint, link))
+            unique.append(result)
+        return unique
+
+    def claim_page(self, url: str) -> Optional[Tuple[str, str]]:
+        """Claim ``url`` for fetching; returns the URL and text of the page already covering it, if any.
+
+        A page another caller is still fetching is waited for; if that fetch
+        fails, the page is claimed for this caller instead.
+        """
+        key = canonical_url(url)
+        while True:
+            with self._lock:
+                claim = self._pages.get(key)
+                if claim is None and key in self._aliases:
+                    claim = self._pages.get(canonical_url(self._aliases[key]))
+                if claim is None:
+                    self._pages[key] = _PageClaim(url)
+                    return None
+            claim.done.wait()
+            if claim.text is not None:
+                with self._lock:
+                    self.fetches_avoided += 1
+                return claim.url, claim.text
+
+    def release_page(self, url: str) -> None:
+        """Forget a claim whose fetch failed so the page can be tried again"""
+        with self._lock:
+            claim = self._pages.pop(canonical_url(url), None)
+        if claim is not None:
+            claim.done.set()
+
+    def add_page(self, url: str, text: str) -> Optional[str]:
+        """Record the text of a fetched page; returns the earlier page it duplicates, if any"""
+        fingerprint = simhash(text)
+        with self._lock:
+            claim = self._pages.get(canonical_url(url))
+            if claim is None:
+                claim = self._pages[canonical_url(url)] = _PageClaim(url)
+            claim.text = text
+            claim.done.set()
+            original = self._find_near(fingerprint, self._fingerprints)
+            if original is not None:
+                self.pages_duplicate += 1
+                return original
+            self._fingerprints.append((fingerprint, url))
+            return None
+
+    def stats(self) -> dict:
+        return {
+            'results_dropped': self.results_dropped,
+            'fetches_avoided': self.fetches_avoided,
+            'pages_duplicate': self.pages_duplicate,
+        }
+
+
+_tracker = DuplicateTracker()
+_tracker_lock = threading.Lock()
+
+
+def get_dedup_tracker() -> DuplicateTracker:
+    return _tracker
+
+
+def reset_dedup_tracker() -> DuplicateTracker:
+    """Start a fresh tracker, e.g. at the start of a run"""
+    global _tracker
+    with _tracker_lock:
+        _tracker = DuplicateTracker()
+        return _tracker
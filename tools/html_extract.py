@@ -0,0 +1,121 @@
+"""
+Main-content text extraction for scraped HTML pages
+"""
+
+from bs4 import BeautifulSoup
+from config.logging_config import setup_logging
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml is optional; fall back to BeautifulSoup's html.parser
+    lxml = None
+
+logger = setup_logging(__name__)
+
+MAX_CHARS = 8000
+MIN_FRAGMENT_CHARS = 20
+REMOVED_TAGS = ('script', 'style', 'nav', 'footer', 'header')
+
+# Main content candidates in priority order, as XPath expressions returning the
+# first match in document order
+CONTENT_XPATHS = (
+    ('article', '(//article)[1]'),
+    ('main', '(//main)[1]'),
+    ('.post-content', "(//*[contains(concat(' ', normalize-space(@class), ' '), ' post-content ')])[1]"),
+    ('.article-content', "(//*[contains(concat(' ', normalize-space(@class), ' '), ' article-content ')])[1]"),
+    ('#content', "(//*[@id='content'])[1]"),
+    ('.content', "(//*[contains(concat(' ', normalize-space(@class), ' '), ' content ')])[1]"),
+)
+
+
+def _collect_lines(strings, budget: int):
+    """Keep non-blank lines of long enough fragments until ``budget`` characters are gathered"""
+    lines = []
+    length = 0
+    for fragment in strings:
+        fragment = fragment.strip()
+        if not fragment or len(fragment) <= MIN_FRAGMENT_CHARS:
+            continue
+        for line in fragment.splitlines():
+            if line.strip():
+                lines.append(line)
+                length += len(line) + 1
+        if length >= budget:
+            break
+    return lines
+
+
+def extract_text_soup(html: str, url: str, max_chars: int = MAX_CHARS) -> str:
+    """Reference extractor: html.parser, full-tree cleanup and every selector evaluated"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    for element in soup.find_all(list(REMOVED_TAGS)):
+        element.decompose()
+
+    content_priorities = [
+        soup.find('article'),
+        soup.find('main'),
+        soup.find(class_='post-content'),
+        soup.find(class_='article-content'),
+        soup.find(id='content'),
+        soup.find(class_='content')
+    ]
+
+    main_content = None
+    for content in content_priorities:
+        if content:
+            main_content = content
+            break
+
+    if not main_content:
+        main_content = soup
+
+    text_parts = []
+    for element in main_content.stripped_strings:
+        text = element.strip()
+        if text and len(text) > MIN_FRAGMENT_CHARS:
+            text_parts.append(text)
+
+    text = '\n\n'.join(text_parts)
+    text = '\n'.join(line for line in text.splitlines() if line.strip())
+    text = f"Source: {url}\n\n{text}"
+    return text[:max_chars]
+
+
+def extract_text_lxml(html: str, url: str, max_chars: int = MAX_CHARS) -> str:
+    """Fast extractor: lxml parse, lazy selector evaluation and early termination"""
+    header = f"Source: {url}\n\n"
+    if not html or not html.strip():
+        return header[:max_chars]
+
+    try:
+        try:
+            root = lxml.html.document_fromstring(html)
+        except ValueError:
+            # Strings carrying an XML encoding declaration must be parsed as bytes
+            root = lxml.html.document_fromstring(html.encode('utf-8'))
+    except (ValueError, etree.ParserError) as e:
+        # e.g. a page consisting of comments only, which lxml considers empty
+        logger.debug("lxml could not parse %s (%s), using BeautifulSoup", url, str(e))
+        return extract_text_soup(html, url, max_chars)
+
+    etree.strip_elements(root, etree.Comment, *REMOVED_TAGS, with_tail=False)
+
+    main_content = root
+    for name, xpath in CONTENT_XPATHS:
+        matches = root.xpath(xpath)
+        if matches:
+            main_content = matches[0]
+            logger.debug("Found main content using selector: %s", name)
+            break
+
+    lines = _collect_lines(main_content.itertext(), max_chars - len(header))
+    return (header + '\n'.join(lines))[:max_chars]
+
+
+def extract_main_text(html: str, url: str, max_chars: int = MAX_CHARS) -> str:
+    """Extract the main readable text of a page, using lxml when it is installed"""
+    if lxml is not None:
+        return extract_text_lxml(html, url, max_chars)
+    return extract_text_soup(html, url, max_chars)
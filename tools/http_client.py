@@ -0,0 +1,158 @@
+import os
+import random
+import threading
+import time
+from typing import Iterable, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from config.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class PayloadRejected(Exception):
+    """Raised when a streamed response is not of an accepted content type"""
+
+
+class HttpClient:
+    """Pooled HTTP client shared by the web tools.
+
+    A single ``requests.Session`` keeps connections alive between calls, the
+    adapter caps the number of pooled connections per host, every request gets
+    connect/read timeouts, and 429/5xx responses or connection errors are
+    retried with jittered exponential backoff.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 4,
+                 connect_timeout: float = 5.0, read_timeout: float = 20.0,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 8.0):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        # pool_block makes pool_maxsize a hard per-host connection limit
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+            max_retries=0
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        logger.debug("HTTP client ready (per-host pool=%d, timeout=%s, retries=%d)",
+                     pool_maxsize, self.timeout, max_retries)
+
+    @classmethod
+    def from_env(cls) -> 'HttpClient':
+        """Build a client configured through ``HTTP_*`` environment variables"""
+        return cls(
+            pool_maxsize=int(os.getenv('HTTP_POOL_MAXSIZE', 4)),
+            connect_timeout=float(os.getenv('HTTP_CONNECT_TIMEOUT', 5)),
+            read_timeout=float(os.getenv('HTTP_READ_TIMEOUT', 20)),
+            max_retries=int(os.getenv('HTTP_MAX_RETRIES', 3)),
+        )
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Full-jitter exponential backoff, honouring a numeric Retry-After header"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning("%s %s failed (%s), retrying in %.2fs", method, url, str(e), delay)
+                time.sleep(delay)
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and not last_attempt:
+                delay = self._backoff(attempt, response)
+                logger.warning("%s %s returned %d, retrying in %.2fs",
+                               method, url, response.status_code, delay)
+                response.close()
+                time.sleep(delay)
+                continue
+
+            return response
+
+    def get_capped(self, url: str, max_bytes: int, allowed_types: Optional[Iterable[str]] = None,
+                   max_seconds: Optional[float] = None, chunk_size: int = 64 * 1024,
+                   **kwargs) -> Tuple[requests.Response, bytes, bool]:
+        """Stream a GET response body, reading at most ``max_bytes`` within ``max_seconds``.
+
+        The ``Content-Type`` of successful responses is checked against
+        ``allowed_types`` before any of the body is read, raising
+        PayloadRejected for anything else. Returns the response (its body
+        already consumed), the bytes read and whether the body was truncated.
+        Non-2xx responses are returned with an empty body.
+        """
+        response = self.request('GET', url, stream=True, **kwargs)
+        if not 200 <= response.status_code < 300:
+            response.close()
+            return response, b'', False
+
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if allowed_types is not None and content_type and content_type not in allowed_types:
+            response.close()
+            raise PayloadRejected(f"Unsupported content type {content_type} for {url}")
+
+        content_length = response.headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > max_bytes:
+            logger.debug("%s announces %s bytes, reading only the first %d",
+                         url, content_length, max_bytes)
+
+        started = time.monotonic()
+        chunks = []
+        received = 0
+        truncated = False
+        try:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                chunks.append(chunk)
+                received += len(chunk)
+                if received >= max_bytes:
+                    truncated = True
+                    break
+                if max_seconds is not None and time.monotonic() - started > max_seconds:
+                    logger.warning("Stopped reading %s after %.1fs", url, max_seconds)
+                    truncated = True
+                    break
+        finally:
+            response.close()
+
+        body = b''.join(chunks)[:max_bytes]
+        if truncated:
+            logger.info("Truncated %s to %d bytes", url, len(body))
+        return response, body, truncated
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide HTTP client, creating it on first use"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = HttpClient.from_env()
+        return _http_client
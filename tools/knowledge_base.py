@@ -0,0 +1,228 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from hashlib import sha256
+from typing import List, Optional
+from config.env import env_flag
+from config.logging_config import setup_logging
+from storage.search_index import SearchIndex
+
+logger = setup_logging(__name__)
+
+DEFAULT_KB_PATH = os.path.join('data', 'knowledge', 'knowledge_base.sqlite')
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+CHUNK_CHARS = 1200
+
+
+def chunk_text(text: str, max_chars: int = CHUNK_CHARS) -> List[str]:
+    """Split text into chunks of whole lines of at most ``max_chars`` characters.
+
+    Lines longer than ``max_chars`` are split on their own.
+    """
+    chunks = []
+    current = []
+    size = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        while len(line) > max_chars:
+            cut = line.rfind(' ', 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                chunks.append('\n'.join(current))
+                current, size = [], 0
+            chunks.append(line[:cut])
+            line = line[cut:].strip()
+        if size + len(line) > max_chars and current:
+            chunks.append('\n'.join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append('\n'.join(current))
+    return chunks
+
+
+class KnowledgeBase:
+    """Cleaned pages scraped in earlier runs, chunked and indexed for reuse.
+
+    Every successfully scraped page is stored with its fetch time and split
+    into chunks that are added to a BM25 SearchIndex, so recurring topics are
+    answered locally by the KnowledgeBase Lookup tool. Documents older than
+    ``max_age`` seconds are reported as stale and re-scraped instead of being
+    served in place of a fetch.
+    """
+
+    def __init__(self, path: str = DEFAULT_KB_PATH, max_age: int = DEFAULT_MAX_AGE, enabled: bool = True):
+        self.path = path
+        self.max_age = max_age
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self._lock = threading.Lock()
+
+        if self.enabled:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS documents (
+                        url TEXT PRIMARY KEY,
+                        content_hash TEXT NOT NULL,
+                        text TEXT NOT NULL,
+                        chunks INTEGER NOT NULL,
+                        fetched_at REAL NOT NULL
+                    )"""
+                )
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS chunks (
+                        chunk_id TEXT PRIMARY KEY,
+                        url TEXT NOT NULL,
+                        position INTEGER NOT NULL,
+                        text TEXT NOT NULL
+                    )"""
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_url ON chunks (url)")
+            # The term index shares the database file
+            self.index = SearchIndex(self.path)
+            logger.debug("Knowledge base ready at %s", self.path)
+
+    @classmethod
+    def from_env(cls) -> 'KnowledgeBase':
+        """Build a knowledge base configured through ``KNOWLEDGE_BASE_*`` environment variables"""
+        return cls(
+            path=os.getenv('KNOWLEDGE_BASE_PATH', DEFAULT_KB_PATH),
+            max_age=int(os.getenv('KNOWLEDGE_BASE_MAX_AGE', DEFAULT_MAX_AGE)),
+            enabled=env_flag('KNOWLEDGE_BASE_ENABLED', True),
+        )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def is_stale(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at > self.max_age
+
+    def add(self, url: str, text: str) -> None:
+        """Store the cleaned text of a scraped page, re-chunking only when it changed"""
+        if not self.enabled or not text:
+            return
+        digest = sha256(text.encode('utf-8')).hexdigest()
+        with self._connect() as conn:
+            row = conn.execute("SELECT content_hash FROM documents WHERE url = ?", (url,)).fetchone()
+            if row and row['content_hash'] == digest:
+                conn.execute("UPDATE documents SET fetched_at = ? WHERE url = ?", (time.time(), url))
+                return
+
+        # The page header repeats the URL, which is stored separately
+        body = '\n'.join(line for line in text.splitlines() if not line.startswith('Source: '))
+        chunks = chunk_text(body)
+        with self._lock:
+            with self._connect() as conn:
+                old_ids = [r['chunk_id'] for r in conn.execute("SELECT chunk_id FROM chunks WHERE url = ?", (url,))]
+                conn.execute("DELETE FROM chunks WHERE url = ?", (url,))
+                conn.executemany(
+                    "INSERT INTO chunks (chunk_id, url, position, text) VALUES (?, ?, ?, ?)",
+                    [(f"{url}#{position}", url, position, chunk) for position, chunk in enumerate(chunks)]
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO documents (url, content_hash, text, chunks, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (url, digest, text, len(chunks), time.time())
+                )
+                # The page and all of its chunks are indexed in the same transaction
+                self.index.add_many(
+                    [(f"{url}#{position}", {'text': chunk}) for position, chunk in enumerate(chunks)],
+                    remove=old_ids, conn=conn
+                )
+        logger.debug("Knowledge base stored %s in %d chunks", url, len(chunks))
+
+    def get_fresh(self, url: str) -> Optional[str]:
+        """Return the stored text of ``url`` if it was fetched within ``max_age``"""
+        if not self.enabled:
+            return None
+        with self._connect() as conn:
+            row = conn.execute("SELECT text, fetched_at FROM documents WHERE url = ?", (url,)).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            elif self.is_stale(row['fetched_at']):
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+        if row is None or self.is_stale(row['fetched_at']):
+            return None
+        return row['text']
+
+    def lookup(self, query: str, limit: int = 5) -> List[dict]:
+        """Return the best matching chunks with their source URL and freshness"""
+        if not self.enabled:
+            return []
+        ranked = self.index.search(query, limit=limit)
+        if not ranked:
+            with self._lock:
+                self.misses += 1
+            return []
+
+        chunk_ids = [chunk_id for chunk_id, _ in ranked]
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT c.chunk_id, c.url, c.text, d.fetched_at FROM chunks c "
+                f"JOIN documents d ON d.url = c.url "
+                f"WHERE c.chunk_id IN ({', '.join('?' * len(chunk_ids))})",
+                chunk_ids
+            ).fetchall()
+        by_id = {row['chunk_id']: row for row in rows}
+
+        results = []
+        for chunk_id, score in ranked:
+            row = by_id.get(chunk_id)
+            if row is None:
+                continue
+            results.append({
+                'url': row['url'],
+                'text': row['text'],
+                'score': round(score, 3),
+                'fetched_at': row['fetched_at'],
+                'stale': self.is_stale(row['fetched_at']),
+            })
+        with self._lock:
+            if not results:
+                # Chunks still indexed but no longer stored
+                self.misses += 1
+            elif any(not result['stale'] for result in results):
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+        return results
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale_hits': self.stale_hits,
+        }
+
+
+_knowledge_base = None
+_knowledge_base_lock = threading.Lock()
+
+
+def get_knowledge_base() -> KnowledgeBase:
+    """Return the process-wide knowledge base, creating it on first use"""
+    global _knowledge_base
+    with _knowledge_base_lock:
+        if _knowledge_base is None:
+            _knowledge_base = KnowledgeBase.from_env()
+        return _knowledge_base
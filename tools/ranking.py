@@ -0,0 +1,130 @@
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+from config.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+WEIGHT_KEY = None  # Trie key holding the weight of the prefix ending at a node
+
+
+def parse_result_date(value: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Parse the ``date`` of a search result, e.g. ``3 days ago`` or ``Jan 5, 2025``"""
+    if not value:
+        return None
+    now = now or datetime.now()
+    value = value.strip()
+
+    relative = re.match(r'(\d+)\s+(minute|hour|day|week|month|year)s?\s+ago', value, re.I)
+    if relative:
+        amount, unit = int(relative.group(1)), relative.group(2).lower()
+        days = {'minute': 1 / 1440, 'hour': 1 / 24, 'day': 1, 'week': 7,
+                'month': 30, 'year': 365}[unit]
+        return now - timedelta(days=amount * days)
+
+    for fmt in ('%b %d, %Y', '%d %b %Y', '%B %d, %Y', '%d %B %Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _split_source(source: str) -> Tuple[str, List[str]]:
+    """Split ``host/path/prefix`` (with or without scheme) into host and path segments"""
+    parsed = urlparse(source if '://' in source else f"//{source}")
+    host = (parsed.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return host, [segment for segment in parsed.path.lower().split('/') if segment]
+
+
+class SourceRanker:
+    """Scores search results by source tier, recency and search position.
+
+    Sources are ``host/path-prefix`` strings grouped in weighted tiers and
+    compiled into one path-segment trie per host, so a result URL is parsed
+    once and matched with a dict lookup per host suffix and path segment
+    instead of a substring scan over every source. The longest matching
+    prefix wins. A result scores
+
+        tier weight + recency_weight * 0.5 ** (age_days / half_life_days)
+                    + position_weight * (1 - position / results)
+
+    with no recency bonus for undated results.
+    """
+
+    def __init__(self, tiers: Sequence[Tuple[float, Sequence[str]]], recency_weight: float = 0.5,
+                 half_life_days: float = 90.0, position_weight: float = 0.2):
+        self.recency_weight = recency_weight
+        self.half_life_days = half_life_days
+        self.position_weight = position_weight
+        self._hosts: Dict[str, dict] = {}
+        # Later tiers override earlier ones for the same prefix
+        for weight, sources in tiers:
+            for source in sources:
+                host, segments = _split_source(source)
+                if not host:
+                    continue
+                node = self._hosts.setdefault(host, {})
+                for segment in segments:
+                    node = node.setdefault(segment, {})
+                node[WEIGHT_KEY] = weight
+
+    @classmethod
+    def from_env(cls, priority_sources: Sequence[str], tech_sources: Sequence[str]) -> 'SourceRanker':
+        """Build the default tiers plus ``PREFERRED_SOURCES``/``DEMOTED_SOURCES`` from the environment"""
+        def env_list(name: str) -> List[str]:
+            return [item.strip() for item in os.getenv(name, '').split(',') if item.strip()]
+
+        return cls(
+            tiers=[
+                (0.6, tech_sources),
+                (1.0, priority_sources),
+                (1.2, env_list('PREFERRED_SOURCES')),
+                (-1.0, env_list('DEMOTED_SOURCES')),
+            ],
+            recency_weight=float(os.getenv('RANKING_RECENCY_WEIGHT', 0.5)),
+            half_life_days=float(os.getenv('RANKING_HALF_LIFE_DAYS', 90)),
+        )
+
+    def source_weight(self, url: str) -> float:
+        """Weight of the longest configured prefix matching ``url``, 0 if none"""
+        host, segments = _split_source(url)
+        labels = host.split('.')
+        # Try the host and its parent domains, e.g. docs.mongodb.com then mongodb.com
+        for start in range(max(1, len(labels) - 1)):
+            node = self._hosts.get('.'.join(labels[start:]))
+            if node is None:
+                continue
+            weight = node.get(WEIGHT_KEY)
+            for segment in segments:
+                node = node.get(segment)
+                if node is None:
+                    break
+                weight = node.get(WEIGHT_KEY, weight)
+            if weight is not None:
+                return weight
+        return 0.0
+
+    def recency(self, date: str, now: Optional[datetime] = None) -> float:
+        published = parse_result_date(date, now)
+        if published is None:
+            return 0.0
+        age_days = max(0.0, ((now or datetime.now()) - published).total_seconds() / 86400)
+        return 0.5 ** (age_days / self.half_life_days)
+
+    def rank(self, results: List[dict], limit: Optional[int] = None,
+             now: Optional[datetime] = None) -> List[dict]:
+        """Return ``results`` (dicts with ``link`` and ``date``) best first, each with a ``score``"""
+        now = now or datetime.now()
+        scored = []
+        for position, result in enumerate(results):
+            score = (self.source_weight(result.get('link', ''))
+                     + self.recency_weight * self.recency(result.get('date', ''), now)
+                     + self.position_weight * (1 - position / len(results)))
+            scored.append({**result, 'score': round(score, 4)})
+        scored.sort(key=lambda result: result['score'], reverse=True)
+        return scored[:limit] if limit is not None else scored
@@ -0,0 +1,190 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from hashlib import sha256
+from typing import Optional
+from config.env import env_flag
+from config.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join('data', 'cache', 'scrape_cache.sqlite')
+
+
+class ScrapeCache:
+    """URL-keyed cache of scraped pages with HTTP revalidation.
+
+    Raw response bodies are stored once per content hash and every URL keeps
+    its cleaned text alongside the ``ETag``/``Last-Modified`` validators, so a
+    ``304 Not Modified`` (or an unchanged body) skips the HTML parsing pass.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.unchanged = 0
+        self.bytes_saved = 0
+        self.parse_seconds_saved = 0.0
+        self._lock = threading.Lock()
+
+        if self.enabled:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS pages (
+                        url TEXT PRIMARY KEY,
+                        etag TEXT,
+                        last_modified TEXT,
+                        content_hash TEXT NOT NULL,
+                        text TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        parse_seconds REAL NOT NULL,
+                        fetched_at REAL NOT NULL
+                    )"""
+                )
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS bodies (
+                        content_hash TEXT PRIMARY KEY,
+                        body BLOB NOT NULL
+                    )"""
+                )
+            logger.debug("Scrape cache ready at %s", self.path)
+
+    @classmethod
+    def from_env(cls) -> 'ScrapeCache':
+        """Build a cache configured through ``SCRAPE_CACHE_*`` environment variables"""
+        return cls(
+            path=os.getenv('SCRAPE_CACHE_PATH', DEFAULT_CACHE_PATH),
+            enabled=env_flag('SCRAPE_CACHE_ENABLED', True),
+        )
+
+    @staticmethod
+    def content_hash(body: bytes) -> str:
+        return sha256(body).hexdigest()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def lookup(self, url: str) -> Optional[dict]:
+        """Return the cached entry for ``url`` (without the raw body) or None"""
+        if not self.enabled:
+            return None
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT url, etag, last_modified, content_hash, text, size, parse_seconds, fetched_at "
+                "FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_body(self, content_hash: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT body FROM bodies WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+        return bytes(row['body']) if row else None
+
+    @staticmethod
+    def conditional_headers(entry: Optional[dict]) -> dict:
+        """Build ``If-None-Match``/``If-Modified-Since`` headers for a cached entry"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record_not_modified(self, entry: dict) -> None:
+        """Account for a 304 response that reused ``entry`` without downloading or parsing"""
+        with self._lock:
+            self.hits += 1
+            self.revalidated += 1
+            self.bytes_saved += entry['size']
+            self.parse_seconds_saved += entry['parse_seconds']
+        logger.debug("Scrape cache revalidated %s (304)", entry['url'])
+
+    def record_unchanged(self, entry: dict) -> None:
+        """Account for a full download whose body hash matched the cached copy"""
+        with self._lock:
+            self.hits += 1
+            self.unchanged += 1
+            self.parse_seconds_saved += entry['parse_seconds']
+        logger.debug("Scrape cache body unchanged for %s, skipping parse", entry['url'])
+
+    def store(self, url: str, body: bytes, text: str, parse_seconds: float,
+              etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Store the raw body and cleaned text for ``url``"""
+        with self._lock:
+            self.misses += 1
+        if not self.enabled:
+            return
+
+        digest = self.content_hash(body)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO bodies (content_hash, body) VALUES (?, ?)",
+                (digest, body)
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(url, etag, last_modified, content_hash, text, size, parse_seconds, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, digest, text, len(body), parse_seconds, time.time())
+            )
+            # Drop bodies no page refers to any more
+            conn.execute(
+                "DELETE FROM bodies WHERE content_hash NOT IN (SELECT content_hash FROM pages)"
+            )
+        logger.debug("Scrape cache stored %s (%d bytes, parsed in %.3fs)",
+                     url, len(body), parse_seconds)
+
+    def touch(self, url: str, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> None:
+        """Refresh validators and fetch time of an entry that was confirmed current"""
+        if not self.enabled:
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE pages SET etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified), fetched_at = ? WHERE url = ?",
+                (etag, last_modified, time.time(), url)
+            )
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidated': self.revalidated,
+            'unchanged': self.unchanged,
+            'bytes_saved': self.bytes_saved,
+            'parse_seconds_saved': round(self.parse_seconds_saved, 4),
+        }
+
+
+_scrape_cache = None
+_scrape_cache_lock = threading.Lock()
+
+
+def get_scrape_cache() -> ScrapeCache:
+    """Return the process-wide scrape cache, creating it on first use"""
+    global _scrape_cache
+    with _scrape_cache_lock:
+        if _scrape_cache is None:
+            _scrape_cache = ScrapeCache.from_env()
+        return _scrape_cache
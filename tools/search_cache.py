@@ -0,0 +1,181 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from hashlib import sha256
+from typing import Optional
+from config.env import env_flag
+from config.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join('data', 'cache', 'search_cache.sqlite')
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 2000
+
+
+class SearchCache:
+    """Disk-backed cache of raw search API responses.
+
+    Entries are keyed on the normalized query, expire after ``ttl`` seconds and
+    are evicted least-recently-used once more than ``max_entries`` are stored.
+    In offline mode expired entries are still served and misses never reach
+    the network, which allows previously recorded runs to be replayed.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, enabled: bool = True,
+                 offline: bool = False):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        if self.enabled:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS search_cache (
+                        key TEXT PRIMARY KEY,
+                        query TEXT NOT NULL,
+                        response TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        last_access REAL NOT NULL
+                    )"""
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_search_cache_access "
+                    "ON search_cache (last_access)"
+                )
+            logger.debug("Search cache ready at %s (ttl=%ss, max_entries=%d, offline=%s)",
+                         self.path, self.ttl, self.max_entries, self.offline)
+
+    @classmethod
+    def from_env(cls) -> 'SearchCache':
+        """Build a cache configured through ``SEARCH_CACHE_*`` environment variables"""
+        return cls(
+            path=os.getenv('SEARCH_CACHE_PATH', DEFAULT_CACHE_PATH),
+            ttl=float(os.getenv('SEARCH_CACHE_TTL', DEFAULT_TTL_SECONDS)),
+            max_entries=int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)),
+            enabled=env_flag('SEARCH_CACHE_ENABLED', True),
+            # Replaying recorded LLM calls needs the tool outputs they were recorded with
+            offline=env_flag('SEARCH_OFFLINE', False) or os.getenv('LLM_CACHE_MODE', '').lower() == 'replay',
+        )
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Collapse case, whitespace and stray punctuation so near-identical queries share a key"""
+        tokens = []
+        for token in query.casefold().split():
+            token = token.strip('.,;!?"\'()[]{}')
+            if token:
+                tokens.append(token)
+        return re.sub(r'\s+', ' ', ' '.join(tokens))
+
+    @classmethod
+    def make_key(cls, query: str) -> str:
+        return sha256(cls.normalize_query(query).encode('utf-8')).hexdigest()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, query: str) -> Optional[dict]:
+        """Return the cached response for ``query`` or None on a miss"""
+        if not self.enabled:
+            return None
+
+        key = self.make_key(query)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT response, created_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                logger.debug("Search cache miss for query: %s", query)
+                return None
+
+            response, created_at = row
+            if not self.offline and now - created_at > self.ttl:
+                self.expired += 1
+                self.misses += 1
+                conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                logger.debug("Search cache entry expired for query: %s", query)
+                return None
+
+            conn.execute("UPDATE search_cache SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            logger.debug("Search cache hit for query: %s", query)
+            return json.loads(response)
+
+    def set(self, query: str, response: dict) -> None:
+        """Store ``response`` for ``query`` and evict the least recently used overflow"""
+        if not self.enabled:
+            return
+
+        key = self.make_key(query)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, query, response, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, self.normalize_query(query), json.dumps(response), now, now)
+            )
+            (count,) = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM search_cache WHERE key IN ("
+                    "SELECT key FROM search_cache ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+                logger.debug("Evicted %d search cache entries", overflow)
+
+    def clear(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM search_cache")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'expired': self.expired,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'offline': self.offline,
+        }
+
+
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Return the process-wide search cache, creating it on first use"""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SearchCache.from_env()
+        return _search_cache
@@ -0,0 +1,112 @@
+import re
+import zlib
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from config.logging_config import setup_logging
+from tools.knowledge_base import chunk_text
+
+logger = setup_logging(__name__)
+
+DEFAULT_DIM = 1024
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+
+class HashingEmbedder:
+    """CPU-only text embeddings from hashed unigram and bigram features.
+
+    Every feature is hashed (crc32, stable across processes) into one of
+    ``dim`` signed buckets with a sublinear term weight, and vectors are L2
+    normalised so a dot product is the cosine similarity. No model download
+    is needed; any object with the same ``embed`` method can be used instead.
+    """
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = {}
+            for feature in self._features(text):
+                counts[feature] = counts.get(feature, 0) + 1
+            for feature, count in counts.items():
+                digest = zlib.crc32(feature.encode('utf-8'))
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                vectors[row, digest % self.dim] += sign * (1.0 + np.log(count))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class VectorIndex:
+    """Brute-force cosine similarity search over normalised vectors.
+
+    With ``quantize`` the vectors are stored as int8 with one scale per row,
+    a quarter of the float32 memory, at a small cost in score precision.
+    """
+
+    def __init__(self, dim: int = DEFAULT_DIM, quantize: bool = False):
+        self.dim = dim
+        self.quantize = quantize
+        self.ids = []
+        self._vectors = np.zeros((0, dim), dtype=np.int8 if quantize else np.float32)
+        self._scales = np.zeros(0, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.quantize:
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            quantized = np.round(vectors / scales[:, None]).astype(np.int8)
+            self._vectors = np.vstack([self._vectors, quantized])
+            self._scales = np.concatenate([self._scales, scales.astype(np.float32)])
+        else:
+            self._vectors = np.vstack([self._vectors, vectors])
+        self.ids.extend(ids)
+
+    def search(self, queries: np.ndarray, k: int = 4) -> List[List[Tuple[str, float]]]:
+        """Return the ``k`` best (id, score) pairs for every query vector"""
+        if not self.ids:
+            return [[] for _ in range(len(queries))]
+        queries = np.asarray(queries, dtype=np.float32)
+        if self.quantize:
+            scores = (queries @ self._vectors.T.astype(np.float32)) * self._scales
+        else:
+            scores = queries @ self._vectors.T
+
+        k = min(k, len(self.ids))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in enumerate(top):
+            ordered = candidates[np.argsort(-scores[row, candidates])]
+            results.append([(self.ids[i], float(scores[row, i])) for i in ordered])
+        return results
+
+
+def retrieve_for_sections(sections: List[dict], research: str, k: int = 4, chunk_chars: int = 600,
+                          quantize: bool = False, embedder: Optional[HashingEmbedder] = None) -> List[dict]:
+    """Pick the ``k`` research chunks most similar to each outline section.
+
+    Returns one dict per section with its ``title`` and ``chunks``, the
+    most similar chunk first.
+    """
+    embedder = embedder or HashingEmbedder()
+    chunks = chunk_text(research, chunk_chars)
+    index = VectorIndex(embedder.dim, quantize=quantize)
+    index.add([str(i) for i in range(len(chunks))], embedder.embed(chunks))
+
+    queries = embedder.embed([f"{section['title']}\n{section['text']}" for section in sections])
+    matches = index.search(queries, k)
+    evidence = []
+    for section, hits in zip(sections, matches):
+        evidence.append({'title': section['title'],
+                         'chunks': [chunks[int(chunk_id)] for chunk_id, score in hits if score > 0]})
+    logger.debug("Retrieved evidence for %d sections from %d research chunks", len(sections), len(chunks))
+    return evidence
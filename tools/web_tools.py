@@ -1,16 +1,37 @@
 from langchain.tools import Tool
 import json
-import requests
-from bs4 import BeautifulSoup
 from typing import Optional, List
+from urllib.parse import urlparse
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
+from crewai.tools import BaseTool
+from crewai.tools.base_tool import Tool as CrewTool
 from dotenv import load_dotenv
 from config.logging_config import setup_logging
+from config.metrics import timed_tool
+from tools.dedup import canonical_url, get_dedup_tracker
+from tools.html_extract import extract_main_text
+from tools.http_client import get_http_client
+from tools.knowledge_base import get_knowledge_base
+from tools.ranking import SourceRanker, parse_result_date
+from tools.search_cache import get_search_cache
+from tools.scrape_cache import ScrapeCache, get_scrape_cache
 
 load_dotenv()
 logger = setup_logging(__name__)
 
+
+def agent_tool(name: str, func, description: str) -> BaseTool:
+    """crewai tool calling ``func``, with its argument schema inferred from the signature.
+
+    Newer crewai versions reject langchain tools, so they are converted here.
+    """
+    return CrewTool.from_langchain(Tool(name=name, func=func, description=description))
+
+
 class WebSearchTools:
     # Priority MongoDB news and documentation sources
     PRIORITY_SOURCES = [
@@ -32,59 +53,87 @@ class WebSearchTools:
         'stackoverflow.blog'
     ]
 
+    _source_ranker = None
+    _source_ranker_lock = threading.Lock()
+
+    @staticmethod
+    def source_ranker() -> SourceRanker:
+        """Return the ranker built from the source tiers, compiling it on first use"""
+        with WebSearchTools._source_ranker_lock:
+            if WebSearchTools._source_ranker is None:
+                WebSearchTools._source_ranker = SourceRanker.from_env(
+                    WebSearchTools.PRIORITY_SOURCES, WebSearchTools.TECH_SOURCES
+                )
+            return WebSearchTools._source_ranker
+
+    @staticmethod
+    @timed_tool('search')
+    def serper_search(query: str, time_range: Optional[str] = None) -> dict:
+        """Perform a search using Serper.dev API, served from the search cache when possible.
+
+        ``time_range`` is passed through as Google's ``tbs`` filter, e.g. ``qdr:m``
+        for results from the past month.
+        """
+        cache = get_search_cache()
+        cache_key = f"{query} tbs:{time_range}" if time_range else query
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if cache.offline:
+            logger.warning("Offline mode: no cached results for query: %s", query)
+            return {}
+
+        url = os.getenv('SERPER_API_URL', "https://google.serper.dev/search")
+        params = {"q": query}
+        if time_range:
+            params["tbs"] = time_range
+        payload = json.dumps(params)
+        headers = {
+            'X-API-KEY': os.getenv('SERPER_API_KEY'),
+            'Content-Type': 'application/json'
+        }
+        response = get_http_client().post(url, headers=headers, data=payload)
+        results = response.json()
+        if response.ok and 'organic' in results:
+            cache.set(cache_key, results)
+        return results
+
+    # Scraping limits: anything else is rejected before the body is downloaded
+    HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+    SCRAPE_MAX_BYTES = int(os.getenv('SCRAPE_MAX_BYTES', 2 * 1024 * 1024))
+    SCRAPE_MAX_SECONDS = float(os.getenv('SCRAPE_MAX_SECONDS', 20))
+
     @staticmethod
-    def search_web() -> Tool:
+    def search_web() -> BaseTool:
         logger.info("Initializing web search tool")
         try:
-            def serper_search(query: str) -> dict:
-                """Perform a search using Serper.dev API"""
-                url = "https://google.serper.dev/search"
-                payload = json.dumps({"q": query})
-                headers = {
-                    'X-API-KEY': os.getenv('SERPER_API_KEY'),
-                    'Content-Type': 'application/json'
-                }
-                response = requests.post(url, headers=headers, data=payload)
-                return response.json()
-
             def enhanced_search(query: str) -> str:
                 """Enhanced search with source prioritization"""
                 logger.info("Performing enhanced search for query: %s", query)
                 try:
                     # Perform the search
-                    search_results = serper_search(query)
+                    search_results = WebSearchTools.serper_search(query)
                     
                     if not search_results or 'organic' not in search_results:
                         logger.warning("No results found for query: %s", query)
                         return "No relevant results found."
 
-                    # Process and prioritize results
-                    prioritized_results = []
-                    other_results = []
-
-                    for result in search_results.get('organic', []):
-                        result_data = {
+                    # Drop mirrors and tracking variants, then rank by source tier and recency
+                    results = [
+                        {
                             'title': result.get('title', ''),
                             'link': result.get('link', ''),
                             'snippet': result.get('snippet', ''),
                             'date': result.get('date', '')
                         }
+                        for result in get_dedup_tracker().filter_results(search_results.get('organic', []))
+                    ]
+                    top_results = WebSearchTools.source_ranker().rank(results, limit=5)
 
-                        # Check if result is from priority sources
-                        is_priority = any(source in result.get('link', '').lower() 
-                                        for source in WebSearchTools.PRIORITY_SOURCES)
-                        
-                        if is_priority:
-                            prioritized_results.append(result_data)
-                        else:
-                            other_results.append(result_data)
-
-                    # Combine results with priority ones first
-                    all_results = prioritized_results + other_results
-                    
                     # Format results as a string
                     formatted_results = []
-                    for idx, result in enumerate(all_results[:5], 1):
+                    for idx, result in enumerate(top_results, 1):
                         formatted_result = (
                             f"{idx}. {result['title']}\n"
                             f"   URL: {result['link']}\n"
@@ -100,7 +149,7 @@ class WebSearchTools:
                     logger.error("Error in enhanced search: %s", str(e))
                     return f"Error performing search: {str(e)}"
 
-            return Tool(
+            return agent_tool(
                 name="Web Search",
                 func=enhanced_search,
                 description="Search the web for MongoDB related information and news"
@@ -111,74 +160,121 @@ class WebSearchTools:
             raise
 
     @staticmethod
-    def scrape_web() -> Tool:
+    @timed_tool('extract')
+    def clean_html(html: str, url: str) -> str:
+        """Extract the main readable text from an HTML page with source attribution"""
+        logger.debug("Extracting and formatting text content")
+        return extract_main_text(html, url)  # First 8000 characters
+
+    @staticmethod
+    @timed_tool('scrape')
+    def fetch_page(url: str) -> str:
+        """Download and clean a webpage, revalidating cached copies when possible.
+
+        Pages scraped within the knowledge base's freshness window are served
+        from it without any request; every fetched page is added to it.
+        Raises on network or HTTP errors; use the ScrapeWeb tool for an
+        agent-facing variant that reports errors as text.
+        """
+        knowledge = get_knowledge_base()
+        text = knowledge.get_fresh(url)
+        if text is not None:
+            logger.info("Using knowledge base copy of %s", url)
+            return text
+
+        text = WebSearchTools.download_page(url)
+        knowledge.add(url, text)
+        return text
+
+    @staticmethod
+    def download_page(url: str) -> str:
+        """Fetch and clean ``url`` through the scrape cache"""
+        cache = get_scrape_cache()
+        cached = cache.lookup(url)
+        if get_search_cache().offline:
+            if cached is None:
+                raise RuntimeError(f"Offline mode: {url} was never scraped")
+            logger.info("Offline mode: using cached copy of %s", url)
+            return cached['text']
+
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        headers.update(ScrapeCache.conditional_headers(cached))
+        logger.debug("Making HTTP request")
+        response, body, _ = get_http_client().get_capped(
+            url,
+            max_bytes=WebSearchTools.SCRAPE_MAX_BYTES,
+            allowed_types=WebSearchTools.HTML_CONTENT_TYPES,
+            max_seconds=WebSearchTools.SCRAPE_MAX_SECONDS,
+            headers=headers
+        )
+
+        if response.status_code == 304 and cached:
+            logger.info("Content not modified, using cached copy of %s", url)
+            cache.record_not_modified(cached)
+            cache.touch(url, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            return cached['text']
+
+        response.raise_for_status()
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+
+        if cached and ScrapeCache.content_hash(body) == cached['content_hash']:
+            logger.info("Content unchanged, using cached extraction of %s", url)
+            cache.record_unchanged(cached)
+            cache.touch(url, etag, last_modified)
+            return cached['text']
+
+        started = time.perf_counter()
+        html = body.decode(response.encoding or 'utf-8', errors='replace')
+        text = WebSearchTools.clean_html(html, url)
+        parse_seconds = time.perf_counter() - started
+        cache.store(url, body, text, parse_seconds, etag, last_modified)
+        return text
+
+    @staticmethod
+    def scrape_once(url: str) -> str:
+        """Fetch a page unless it, or a copy of it, was already scraped in this run.
+
+        Pages scraped before are served from the run's duplicate tracker, and a
+        page another thread is fetching is waited for, so every caller gets the
+        page text even when the earlier one ran in another crew or agent.
+        """
+        tracker = get_dedup_tracker()
+        scraped = tracker.claim_page(url)
+        if scraped is not None:
+            original, text = scraped
+            logger.info("Reusing %s, already scraped in this run as %s", url, original)
+            return text
+
+        try:
+            text = WebSearchTools.fetch_page(url)
+        except BaseException:
+            tracker.release_page(url)
+            raise
+
+        original = tracker.add_page(url, text)
+        if original is not None:
+            logger.info("Content of %s duplicates %s", url, original)
+        return text
+
+    @staticmethod
+    def scrape_web() -> BaseTool:
         def scrape_site(url: str) -> Optional[str]:
             """Scrape text content from a webpage with enhanced cleaning"""
             logger.info("Scraping content from URL: %s", url)
 
             try:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-                logger.debug("Making HTTP request")
-                response = requests.get(url, headers=headers, timeout=10)
-                response.raise_for_status()
-
-                logger.debug("Parsing HTML content")
-                soup = BeautifulSoup(response.text, 'html.parser')
-
-                # Remove unwanted elements
-                logger.debug("Removing unwanted elements")
-                for element in soup.find_all(['script', 'style', 'nav', 'footer', 'header']):
-                    element.decompose()
-
-                # Focus on main content areas
-                logger.debug("Identifying main content area")
-                main_content = None
-                content_priorities = [
-                    soup.find('article'),
-                    soup.find('main'),
-                    soup.find(class_='post-content'),
-                    soup.find(class_='article-content'),
-                    soup.find(id='content'),
-                    soup.find(class_='content')
-                ]
-
-                for content in content_priorities:
-                    if content:
-                        main_content = content
-                        logger.debug("Found main content using selector: %s", content.name)
-                        break
-
-                if not main_content:
-                    logger.debug("No specific content area found, using entire body")
-                    main_content = soup
-
-                # Extract text with better formatting
-                logger.debug("Extracting and formatting text content")
-                text_parts = []
-                for element in main_content.stripped_strings:
-                    text = element.strip()
-                    if text and len(text) > 20:  # Skip very short fragments
-                        text_parts.append(text)
-
-                # Join with proper spacing
-                text = '\n\n'.join(text_parts)
-
-                # Clean up extra whitespace
-                text = '\n'.join(line for line in text.splitlines() if line.strip())
-
-                # Add source attribution
-                text = f"Source: {url}\n\n{text}"
-
+                text = WebSearchTools.scrape_once(url)
                 logger.info("Successfully scraped and processed content")
-                return text[:8000]  # Return first 8000 characters
+                return text
 
             except Exception as e:
                 logger.error("Error scraping %s: %s", url, str(e))
                 return f"Error scraping {url}: {str(e)}"
 
-        return Tool(
+        return agent_tool(
             name="ScrapeWeb",
             func=scrape_site,
             description="""
@@ -188,46 +284,238 @@ class WebSearchTools:
         )
 
     @staticmethod
-    def get_latest_mongodb_news() -> List[str]:
-        """Gather latest MongoDB news from priority sources"""
-        logger.info("Gathering latest MongoDB news")
+    def knowledge_base_lookup() -> BaseTool:
+        @timed_tool('knowledge')
+        def lookup(query: str) -> str:
+            """Answer a research query from pages scraped in earlier runs"""
+            logger.info("Looking up knowledge base for query: %s", query)
+            try:
+                results = get_knowledge_base().lookup(query)
+            except Exception as e:
+                logger.error("Error in knowledge base lookup: %s", str(e))
+                return f"Error looking up knowledge base: {str(e)}"
+
+            if not results:
+                return "No stored research found for this query. Use Web Search instead."
+
+            sections = []
+            for idx, result in enumerate(results, 1):
+                age_days = (time.time() - result['fetched_at']) / 86400
+                freshness = (f"STALE, fetched {age_days:.0f} days ago; re-scrape the URL to refresh"
+                             if result['stale'] else f"fetched {age_days:.1f} days ago")
+                sections.append(f"=== [{idx}] {result['url']} ({freshness}) ===\n{result['text']}")
+            return "\n\n".join(sections)
+
+        return agent_tool(
+            name="KnowledgeBase Lookup",
+            func=lookup,
+            description="""
+            Search documentation and articles scraped in earlier research runs, without any web request.
+            Input should be a search query. Returns the most relevant passages with their source URL
+            and freshness; use it before Web Search and re-scrape URLs marked STALE.
+            """
+        )
+
+    @staticmethod
+    def parse_url_list(urls: str) -> List[str]:
+        """Parse a JSON array or a comma/whitespace separated string of URLs, dropping duplicates"""
+        urls = urls.strip()
+        if urls.startswith('['):
+            candidates = json.loads(urls)
+        else:
+            candidates = urls.replace(',', ' ').split()
+        parsed = []
+        for url in candidates:
+            url = str(url).strip().strip('\'"')
+            if url and url not in parsed:
+                parsed.append(url)
+        return parsed
+
+    @staticmethod
+    @timed_tool('scrape_batch')
+    def scrape_many(urls: List[str], max_workers: int = 6, per_domain: int = 2,
+                    deadline: float = 45.0) -> List[dict]:
+        """Scrape ``urls`` concurrently within an overall ``deadline`` in seconds.
+
+        At most ``per_domain`` requests run against one host at a time. Every URL
+        gets a result dict with ``url``, ``status`` (``ok``, ``error`` or
+        ``timeout``), ``content`` and ``seconds``; pages that finished before the
+        deadline are kept even when others time out.
+        """
+        logger.info("Batch scraping %d URLs (workers=%d, per_domain=%d, deadline=%.0fs)",
+                    len(urls), max_workers, per_domain, deadline)
+        started = time.monotonic()
+        expires_at = started + deadline
+        domain_limits = {}
+        domain_lock = threading.Lock()
+
+        def domain_slot(url: str) -> threading.Semaphore:
+            domain = urlparse(url).netloc.lower()
+            with domain_lock:
+                if domain not in domain_limits:
+                    domain_limits[domain] = threading.Semaphore(per_domain)
+                return domain_limits[domain]
+
+        def scrape_one(url: str) -> dict:
+            slot = domain_slot(url)
+            if not slot.acquire(timeout=max(0.0, expires_at - time.monotonic())):
+                return {'url': url, 'status': 'timeout', 'content': '', 'seconds': 0.0}
+            try:
+                fetch_started = time.monotonic()
+                try:
+                    content = WebSearchTools.scrape_once(url)
+                    status = 'ok'
+                except Exception as e:
+                    logger.warning("Batch scrape failed for %s: %s", url, str(e))
+                    content = str(e)
+                    status = 'error'
+                return {
+                    'url': url,
+                    'status': status,
+                    'content': content,
+                    'seconds': round(time.monotonic() - fetch_started, 3)
+                }
+            finally:
+                slot.release()
 
+        results = {}
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls))),
+                                      thread_name_prefix='scrape')
         try:
-            search = SerpAPIWrapper(
+            futures = {executor.submit(scrape_one, url): url for url in urls}
+            done, not_done = wait(futures, timeout=deadline)
+            for future in done:
+                results[futures[future]] = future.result()
+            for future in not_done:
+                url = futures[future]
+                logger.warning("Batch scrape deadline reached before %s finished", url)
+                results[url] = {'url': url, 'status': 'timeout', 'content': '',
+                                'seconds': round(time.monotonic() - started, 3)}
+        finally:
+            # Do not wait for stragglers past the deadline
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        ordered = [results[url] for url in urls]
+        logger.info("Batch scrape finished in %.2fs: %d ok, %d failed or timed out",
+                    time.monotonic() - started,
+                    sum(1 for r in ordered if r['status'] == 'ok'),
+                    sum(1 for r in ordered if r['status'] != 'ok'))
+        return ordered
 
-            )
-            logger.debug("Serper API initialized for news gathering")
+    @staticmethod
+    def scrape_web_batch() -> BaseTool:
+        def scrape_sites(urls: str) -> str:
+            """Scrape several webpages concurrently and combine them with per-URL status"""
+            try:
+                url_list = WebSearchTools.parse_url_list(urls)
+            except ValueError as e:
+                logger.error("Invalid URL list for batch scrape: %s", str(e))
+                return f"Error parsing URL list: {str(e)}"
+
+            if not url_list:
+                return "No URLs provided."
+
+            results = WebSearchTools.scrape_many(url_list)
+            sections = []
+            for idx, result in enumerate(results, 1):
+                header = f"=== [{idx}] {result['url']} (status: {result['status']}) ==="
+                if result['status'] == 'ok':
+                    sections.append(f"{header}\n{result['content']}")
+                elif result['status'] == 'error':
+                    sections.append(f"{header}\nError scraping {result['url']}: {result['content']}")
+                else:
+                    sections.append(f"{header}\nTimed out before the page could be fetched.")
+            return "\n\n".join(sections)
+
+        return agent_tool(
+            name="ScrapeWebBatch",
+            func=scrape_sites,
+            description="""
+            Scrape several webpages at once; much faster than calling ScrapeWeb repeatedly.
+            Input should be a comma-separated list (or JSON array) of valid URLs. Returns the
+            cleaned content of every page with its source URL and fetch status.
+            """
+        )
+
+    @staticmethod
+    def cache_stats() -> dict:
+        """Return hit/miss and savings counters of the caches, knowledge base and duplicate tracker"""
+        return {
+            'search': get_search_cache().stats(),
+            'scrape': get_scrape_cache().stats(),
+            'knowledge': get_knowledge_base().stats(),
+            'dedup': get_dedup_tracker().stats(),
+        }
 
-            # Calculate date for recent content
-            one_month_ago = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-            logger.debug("Searching for content after: %s", one_month_ago)
+    @staticmethod
+    @timed_tool('news')
+    def get_latest_mongodb_news(max_items: int = 5, per_source: int = 3,
+                                budget: float = 15.0, days: int = 30) -> List[str]:
+        """Gather latest MongoDB news from priority sources.
+
+        One ``site:`` search per priority source is issued concurrently; whatever
+        has arrived when ``budget`` seconds elapse is deduplicated by canonical
+        URL, filtered to the last ``days`` days and ranked newest first.
+        """
+        logger.info("Gathering latest MongoDB news")
+        started = time.monotonic()
+        cutoff = datetime.now() - timedelta(days=days)
+        logger.debug("Searching for content after: %s", cutoff.strftime('%Y-%m-%d'))
 
-            news_items = []
+        def search_source(source: str) -> List[dict]:
+            logger.debug("Searching news from source: %s", source)
+            results = WebSearchTools.serper_search(f"MongoDB site:{source}", time_range='qdr:m')
+            return results.get('organic', [])[:per_source]
 
-            # Search each priority source for recent content
-            for source in WebSearchTools.PRIORITY_SOURCES:
-                try:
-                    query = f"after:{one_month_ago} site:{source}"
-                    logger.debug("Searching news from source: %s", source)
-                    results = search.run(query)
-                    if isinstance(results, dict) and 'organic' in results:
-                        organic_results = results['organic']
-                        formatted_results = "\n".join([
-                            f"Title: {result.get('title', '')}\n"
-                            f"Link: {result.get('link', '')}\n"
-                            f"Snippet: {result.get('snippet', '')}\n"
-                            for result in organic_results[:2]
-                        ])
-                        if formatted_results:
-                            news_items.append(formatted_results)
-                            logger.debug("Found news from %s", source)
-                except Exception as e:
-                    logger.warning("Failed to get news from %s: %s", source, str(e))
-                    continue
+        executor = ThreadPoolExecutor(max_workers=len(WebSearchTools.PRIORITY_SOURCES),
+                                      thread_name_prefix='news')
+        try:
+            futures = {executor.submit(search_source, source): source
+                       for source in WebSearchTools.PRIORITY_SOURCES}
+            done, not_done = wait(futures, timeout=budget)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for future in not_done:
+            logger.warning("News search for %s did not finish within %.0fs", futures[future], budget)
+
+        news = {}
+        for future in done:
+            source = futures[future]
+            try:
+                organic_results = future.result()
+            except Exception as e:
+                logger.warning("Failed to get news from %s: %s", source, str(e))
+                continue
 
-            logger.info("Found %d news items", len(news_items))
-            return news_items[:5]  # Return top 5 recent news items
+            for result in organic_results:
+                link = result.get('link', '')
+                if not link:
+                    continue
+                published = parse_result_date(result.get('date', ''))
+                if published and published < cutoff:
+                    continue
+                key = canonical_url(link)
+                if key in news and (news[key]['published'] or not published):
+                    continue
+                news[key] = {
+                    'title': result.get('title', ''),
+                    'link': link,
+                    'snippet': result.get('snippet', ''),
+                    'date': result.get('date', ''),
+                    'published': published
+                }
 
-        except Exception as e:
-            logger.error("Error gathering MongoDB news: %s", str(e))
-            return []
\ No newline at end of file
+        # Newest first; undated results go last
+        ranked = sorted(news.values(), key=lambda item: item['published'] or datetime.min, reverse=True)
+        news_items = []
+        for item in ranked[:max_items]:
+            formatted = f"Title: {item['title']}\nLink: {item['link']}\n"
+            if item['date']:
+                formatted += f"Date: {item['date']}\n"
+            formatted += f"Snippet: {item['snippet']}\n"
+            news_items.append(formatted)
+
+        logger.info("Found %d news items from %d sources in %.2fs",
+                    len(news_items), len(done), time.monotonic() - started)
+        return news_items